@@ -0,0 +1,68 @@
+# bid_snapper_backend/benchmarks/bench_bid_table.py
+#
+# Micro-benchmark: jawaban bidding dari tabel lookup (src.bid_table) dibandingkan
+# dengan evaluasi aturan langsung dan evaluasi aturan + memo (kosong dan sudah terisi).
+#
+#   python -m benchmarks.bench_bid_table [--hands 2000] [--repeat 5]
+
+import argparse
+import timeit
+from benchmarks.deals import random_hands
+from src.biding_strategies import BIDING_STRATEGIES
+from src.bid_table import BID_TABLE_PATH, install_tables
+from src.rule_engine import analyze_hand
+
+
+def run(n_hands=2000, repeat=5):
+    installed = install_tables(BIDING_STRATEGIES)
+    if len(installed) != len(BIDING_STRATEGIES):
+        raise SystemExit(f"Bid tables missing or stale in {BID_TABLE_PATH}; run python -m src.bid_table build")
+
+    strategies = list(BIDING_STRATEGIES.values())
+    keys = [analyze_hand(hand) for hand in random_hands(n_hands)]
+    n_calls = len(keys) * len(strategies)
+
+    # Pastikan ketiga jalur menghasilkan kode bid yang sama
+    for strategy in strategies:
+        for total_hcp, shdc in keys:
+            assert strategy.bid_code(total_hcp, shdc) == strategy.evaluate(total_hcp, shdc)
+
+    def rules():
+        return [strategy.evaluate(total_hcp, shdc) for strategy in strategies for total_hcp, shdc in keys]
+
+    def memo():
+        return [strategy.bid_code(total_hcp, shdc) for strategy in strategies for total_hcp, shdc in keys]
+
+    def table():
+        return [strategy.bid_code(total_hcp, shdc) for strategy in strategies for total_hcp, shdc in keys]
+
+    results = {}
+    results['rules'] = min(timeit.repeat(rules, number=1, repeat=repeat))
+
+    # Memo kosong: setiap bentuk baru masih harus dievaluasi (kondisi awal proses)
+    cold = []
+    for _ in range(repeat):
+        for strategy in strategies:
+            strategy.attach_table(None)
+            strategy._memo.clear()
+        cold.append(timeit.timeit(memo, number=1))
+    results['memo_cold'] = min(cold)
+    results['memo_warm'] = min(timeit.repeat(memo, number=1, repeat=repeat))
+
+    install_tables(BIDING_STRATEGIES)
+    results['table'] = min(timeit.repeat(table, number=1, repeat=repeat))
+
+    for name, seconds in results.items():
+        print(f"{name:>8}: {seconds / n_calls * 1e6:.3f} us/lookup")
+    print(f" speedup: {results['rules'] / results['table']:.1f}x vs rules, "
+          f"{results['memo_cold'] / results['table']:.1f}x vs cold memo, "
+          f"{results['memo_warm'] / results['table']:.1f}x vs warm memo")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark bid lookup tables vs rule evaluation")
+    parser.add_argument('--hands', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(args.hands, args.repeat)
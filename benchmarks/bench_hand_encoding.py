@@ -0,0 +1,110 @@
+# bid_snapper_backend/benchmarks/bench_hand_encoding.py
+#
+# Micro-benchmark: metrik tangan dari bitmask (utils.hand_encoding) dibandingkan
+# dengan scan per metrik seperti implementasi BridgeHandAnalyzer sebelumnya.
+#
+#   python -m benchmarks.bench_hand_encoding [--deals 2000] [--repeat 5]
+
+import argparse
+import timeit
+from benchmarks.deals import random_deals
+from utils.hand_encoding import (
+    encode_hand, distribution, hand_hcp, hand_controls, hand_quick_tricks, suit_honor_weight,
+)
+
+SUITS = ['S', 'H', 'D', 'C']
+HCP_MAP = {'A': 4, 'K': 3, 'Q': 2, 'J': 1}
+HONOR_WEIGHTS = {
+    frozenset(['A', 'K', 'Q']): 3.0,
+    frozenset(['A', 'K']): 2.0,
+    frozenset(['A', 'Q']): 1.5,
+    frozenset(['A']): 1.0,
+    frozenset(['K', 'Q']): 1.0,
+    frozenset(['K']): 0.5,
+    frozenset(['Q']): 0.25,
+    frozenset([]): 0.0,
+}
+
+
+# ======= Scan per metrik (implementasi lama) =======
+def scan_hcp(hand):
+    return sum(HCP_MAP.get(card[0], 0) for card in hand)
+
+
+def scan_distribution(hand):
+    return [sum(1 for card in hand if card.endswith(suit)) for suit in SUITS]
+
+
+def scan_honor_weight(hand, suit):
+    honors = frozenset(card[0] for card in hand if card.endswith(suit) and card[0] in ['A', 'K', 'Q', 'J'])
+    for combo, weight in HONOR_WEIGHTS.items():
+        if combo.issubset(honors):
+            return weight
+    return 0.0
+
+
+def scan_controls(hand):
+    aces = sum(1 for card in hand if card[0] == 'A')
+    kings = sum(1 for card in hand if card[0] == 'K')
+    return aces * 2 + kings, aces
+
+
+def scan_quick_tricks(hand):
+    total = 0
+    for suit in SUITS:
+        honors = [card[0] for card in hand if card.endswith(suit) and card[0] in ['A', 'K', 'Q']]
+        if 'A' in honors and 'K' in honors:
+            total += 2.0
+        elif 'A' in honors:
+            total += 1.0
+        elif 'K' in honors and 'Q' in honors:
+            total += 1.0
+        elif 'K' in honors:
+            total += 0.5
+    return total
+
+
+def scan_metrics(hand):
+    return (
+        scan_hcp(hand),
+        scan_distribution(hand),
+        [scan_honor_weight(hand, suit) for suit in SUITS],
+        scan_controls(hand),
+        scan_quick_tricks(hand),
+    )
+
+
+# ======= Bitmask (sekali parse) =======
+def bitmask_metrics(hand):
+    masks = encode_hand(hand)
+    return (
+        hand_hcp(masks),
+        distribution(masks),
+        [suit_honor_weight(mask) for mask in masks],
+        hand_controls(masks),
+        hand_quick_tricks(masks),
+    )
+
+
+def run(n_deals=2000, repeat=5):
+    hands = [hand for deal in random_deals(n_deals) for hand in deal]
+
+    # Pastikan kedua implementasi menghasilkan metrik yang sama
+    for hand in hands:
+        assert scan_metrics(hand) == bitmask_metrics(hand), hand
+
+    results = {}
+    for name, fn in (('scan', scan_metrics), ('bitmask', bitmask_metrics)):
+        best = min(timeit.repeat(lambda: [fn(hand) for hand in hands], number=1, repeat=repeat))
+        results[name] = best / len(hands) * 1e6
+        print(f"{name:>8}: {results[name]:.2f} us/hand")
+    print(f" speedup: {results['scan'] / results['bitmask']:.2f}x")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark bitmask hand metrics vs per-metric scans")
+    parser.add_argument('--deals', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(args.deals, args.repeat)
@@ -0,0 +1,73 @@
+# bid_snapper_backend/benchmarks/bench_suit_tables.py
+#
+# Micro-benchmark: metrik tangan lewat tabel lookup 8192 entri per suit
+# (utils.hand_encoding.SUIT_*_TABLE) dibandingkan dengan loop bit-op per suit.
+#
+#   python -m benchmarks.bench_suit_tables [--deals 2000] [--repeat 5]
+
+import argparse
+import timeit
+from benchmarks.deals import random_deals
+from utils.hand_encoding import (
+    SUIT_MASKS, SUIT_LENGTH_TABLE, SUIT_HCP_TABLE, SUIT_HONOR_WEIGHT_TABLE,
+    SUIT_QUICK_TRICKS_TABLE, SUIT_CONTROLS_TABLE, SUIT_ACES_TABLE,
+    encode_hand, distribution, hand_hcp, hand_controls, hand_quick_tricks,
+    suit_length, suit_hcp, suit_honor_weight, suit_quick_tricks, suit_controls,
+)
+
+
+# ======= Loop bit-op per suit (implementasi sebelumnya) =======
+def loop_metrics(masks):
+    return (
+        sum(suit_hcp(mask) for mask in masks),
+        [suit_length(mask) for mask in masks],
+        [suit_honor_weight(mask) for mask in masks],
+        (sum(suit_controls(mask) for mask in masks), sum((mask >> 12) & 1 for mask in masks)),
+        sum(suit_quick_tricks(mask) for mask in masks),
+    )
+
+
+# ======= Tabel lookup =======
+def table_metrics(masks):
+    return (
+        hand_hcp(masks),
+        distribution(masks),
+        [SUIT_HONOR_WEIGHT_TABLE[mask] for mask in masks],
+        hand_controls(masks),
+        hand_quick_tricks(masks),
+    )
+
+
+def check_tables():
+    """Pastikan setiap entri tabel sama dengan fungsi suit_* untuk seluruh 8192 mask."""
+    for mask in SUIT_MASKS:
+        assert SUIT_LENGTH_TABLE[mask] == suit_length(mask), mask
+        assert SUIT_HCP_TABLE[mask] == suit_hcp(mask), mask
+        assert SUIT_HONOR_WEIGHT_TABLE[mask] == suit_honor_weight(mask), mask
+        assert SUIT_QUICK_TRICKS_TABLE[mask] == suit_quick_tricks(mask), mask
+        assert SUIT_CONTROLS_TABLE[mask] == suit_controls(mask), mask
+        assert SUIT_ACES_TABLE[mask] == (mask >> 12) & 1, mask
+
+
+def run(n_deals=2000, repeat=5):
+    check_tables()
+    encoded = [encode_hand(hand) for deal in random_deals(n_deals) for hand in deal]
+
+    for masks in encoded:
+        assert loop_metrics(masks) == table_metrics(masks), masks
+
+    results = {}
+    for name, fn in (('loop', loop_metrics), ('table', table_metrics)):
+        best = min(timeit.repeat(lambda: [fn(masks) for masks in encoded], number=1, repeat=repeat))
+        results[name] = best / len(encoded) * 1e6
+        print(f"{name:>8}: {results[name]:.2f} us/hand")
+    print(f" speedup: {results['loop'] / results['table']:.2f}x")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark per-suit lookup tables vs bit-op loops")
+    parser.add_argument('--deals', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(args.deals, args.repeat)
@@ -0,0 +1,112 @@
+# bid_snapper_backend/benchmarks/check_optimizer_equivalence.py
+#
+# Cek kesetaraan mode optimizer: 'exhaustive' (35 kontrak, Pareto front eksak) dan
+# 'nsga2' harus menghasilkan Pareto front yang sama (sebagai himpunan kontrak) dan kontrak
+# pilihan yang sama, atau yang objektifnya identik jika ada tie. Dijalankan pada
+# data/processed/X_test dan (opsional) deal sintetis dari benchmarks.deals. Exit code 1
+# jika ada baris yang berbeda; jalankan setiap kali optimizer, pipeline fitur, atau model
+# berubah.
+#
+#   python -m benchmarks.check_optimizer_equivalence [--deals 0] [--seed 42]
+
+import os
+import sys
+import logging
+import argparse
+import numpy as np
+from models.registry import registry
+from models.nsga2_optimizer import (
+    OPTIMIZER_METHODS, BridgeContractProblem, optimize_contract, solve_exhaustive, solve_nsga2,
+)
+from utils.processed_io import load_features_frame
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROCESSED_DIR = os.path.join(BASE_DIR, 'data/processed')
+
+
+def test_set_inputs(artifacts, processed_dir=PROCESSED_DIR):
+    """Fitur mentah (urutan selected_features) dan probabilitas RF untuk setiap baris X_test."""
+    X_test = load_features_frame(processed_dir, 'X_test').to_numpy()
+    raw = artifacts.pipeline.inverse_transform(X_test)
+    return raw, artifacts.flat_suit.predict_proba(X_test), artifacts.flat_category.predict_proba(X_test)
+
+
+def deal_inputs(artifacts, n_deals, seed=42):
+    """Fitur mentah dan probabilitas RF untuk n deal sintetis yang reproducible."""
+    from benchmarks.deals import random_deals
+    from features.extractor import BridgeHandAnalyzer
+    analyzer = BridgeHandAnalyzer()
+    pipeline = artifacts.pipeline
+    raw = np.array([pipeline.raw_vector(analyzer.extract_comprehensive_features(hand1, hand2))
+                    for hand1, hand2 in random_deals(n_deals, seed=seed)])
+    scaled = pipeline.transform(raw)
+    return raw, artifacts.flat_suit.predict_proba(scaled), artifacts.flat_category.predict_proba(scaled)
+
+
+def same_front(X_a, X_b):
+    """Dua Pareto front berisi himpunan kontrak yang sama, tanpa melihat urutan."""
+    return {tuple(x) for x in np.asarray(X_a).tolist()} == {tuple(x) for x in np.asarray(X_b).tolist()}
+
+
+def same_pick(problem, contract_a, contract_b):
+    """Kontrak sama, atau berbeda tetapi objektifnya identik (tie yang urutan front-nya menentukan)."""
+    if contract_a == contract_b:
+        return True
+    out = {}
+    problem._evaluate(np.array([contract_a, contract_b]), out)
+    return np.array_equal(out['F'][0], out['F'][1])
+
+
+def check_optimizer_equivalence(artifacts, raw, suit_proba, category_proba):
+    """
+    Bandingkan Pareto front dan kontrak pilihan mode 'exhaustive' dan 'nsga2' per baris.
+
+    Returns:
+        list: Baris yang berbeda, berisi (index, kontrak exhaustive, kontrak nsga2, front sama?).
+    """
+    mismatches = []
+    for i, hand_features in enumerate(raw):
+        problem = BridgeContractProblem(
+            artifacts.flat_suit, artifacts.flat_category, hand_features, artifacts.scaler,
+            artifacts.selected_features, suit_proba=suit_proba[i], category_proba=category_proba[i]
+        )
+        fronts_equal = same_front(solve_exhaustive(problem)[0], solve_nsga2(problem)[0])
+        picks = {}
+        for method in OPTIMIZER_METHODS:
+            best_contract, _ = optimize_contract(
+                artifacts.flat_suit, artifacts.flat_category, hand_features,
+                artifacts.scaler, artifacts.selected_features, method=method,
+                suit_proba=suit_proba[i], category_proba=category_proba[i]
+            )
+            picks[method] = (int(best_contract[0]), int(best_contract[1]))
+        logger.info(f"Row {i}: exhaustive={picks['exhaustive']}, nsga2={picks['nsga2']}, same front={fronts_equal}")
+        if not same_pick(problem, picks['exhaustive'], picks['nsga2']) or not fronts_equal:
+            mismatches.append((i, picks['exhaustive'], picks['nsga2'], fronts_equal))
+    return mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that the exhaustive and NSGA-II optimizers agree")
+    parser.add_argument('--deals', type=int, default=0, help='Also check this many synthetic deals')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    # Log INFO per baris dari optimizer terlalu ramai untuk cek ini
+    logging.disable(logging.INFO)
+    artifacts = registry.get()
+
+    failed = False
+    datasets = [('X_test', test_set_inputs(artifacts))]
+    if args.deals:
+        datasets.append((f'{args.deals} synthetic deals', deal_inputs(artifacts, args.deals, args.seed)))
+    for label, (raw, suit_proba, category_proba) in datasets:
+        mismatches = check_optimizer_equivalence(artifacts, raw, suit_proba, category_proba)
+        if mismatches:
+            failed = True
+            print(f"{label}: optimizer modes disagree on {len(mismatches)} of {len(raw)} rows: {mismatches}")
+        else:
+            print(f"{label}: exhaustive and NSGA-II agree on the Pareto front and contract for all {len(raw)} rows")
+    sys.exit(1 if failed else 0)
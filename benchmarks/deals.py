@@ -0,0 +1,23 @@
+# bid_snapper_backend/benchmarks/deals.py
+
+import random
+
+RANKS = ['A', 'K', 'Q', 'J', 'T', '9', '8', '7', '6', '5', '4', '3', '2']
+SUITS = ['S', 'H', 'D', 'C']
+DECK = [rank + suit for suit in SUITS for rank in RANKS]
+
+
+def random_deals(n, seed=42):
+    """Buat n deal acak yang reproducible: list pasangan (hand1, hand2) berisi 13 kartu berbeda."""
+    rng = random.Random(seed)
+    deals = []
+    for _ in range(n):
+        cards = rng.sample(DECK, 26)
+        deals.append((cards[:13], cards[13:]))
+    return deals
+
+
+def random_hands(n, seed=42):
+    """Buat n tangan acak (13 kartu) yang reproducible."""
+    rng = random.Random(seed)
+    return [rng.sample(DECK, 13) for _ in range(n)]
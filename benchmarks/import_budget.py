@@ -0,0 +1,84 @@
+# bid_snapper_backend/benchmarks/import_budget.py
+#
+# Cek waktu import (cold start) main:app: jalankan `python -X importtime -c "import main"`
+# di proses baru beberapa kali, laporkan modul dengan waktu kumulatif terbesar, dan gagal
+# (exit code 1) jika waktu import melebihi budget atau library berat yang tidak dibutuhkan
+# serving (plotting, pandas, pymoo, YOLO) ikut terimpor.
+#
+#   python -m benchmarks.import_budget [--budget 1.0] [--repeat 3] [--top 15] [--module main]
+
+import os
+import sys
+import argparse
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Budget default waktu import main (detik)
+DEFAULT_BUDGET = 1.0
+
+# Library yang hanya dipakai training, plotting, NSGA-II, atau deteksi YOLO; semuanya
+# harus diimpor saat pertama dipakai, bukan saat worker start
+FORBIDDEN_MODULES = ('matplotlib', 'seaborn', 'pandas', 'pymoo', 'scipy', 'ultralytics', 'torch', 'cv2')
+
+
+def importtime_report(module='main'):
+    """
+    Jalankan import module di proses baru dengan -X importtime.
+
+    Returns:
+        list: (nama modul, self us, kumulatif us, kedalaman) per modul, urutan selesai import.
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = BASE_DIR + os.pathsep + env.get('PYTHONPATH', '')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-W', 'ignore', '-c', f'import {module}'],
+                            cwd=BASE_DIR, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def check_budget(module='main', budget=DEFAULT_BUDGET, repeat=3, top=15):
+    """Ambil run tercepat dari repeat kali; kembalikan daftar pelanggaran (kosong jika lolos)."""
+    runs = [importtime_report(module) for _ in range(repeat)]
+    totals = [next(cumulative for name, _, cumulative, _ in rows if name == module) for rows in runs]
+    best = min(range(repeat), key=lambda i: totals[i])
+    rows = runs[best]
+
+    print(f"import {module}: {totals[best] / 1e6:.3f}s (best of {repeat}: "
+          f"{', '.join(f'{total / 1e6:.3f}s' for total in totals)}), budget {budget:.3f}s")
+    print(f"{'cumulative':>12} {'self':>10}  module")
+    for name, self_us, cumulative_us, depth in sorted(rows, key=lambda row: -row[2])[:top]:
+        print(f"{cumulative_us / 1e3:>10.1f}ms {self_us / 1e3:>8.1f}ms  {'  ' * depth}{name}")
+
+    violations = []
+    if totals[best] / 1e6 > budget:
+        violations.append(f"import {module} took {totals[best] / 1e6:.3f}s, budget {budget:.3f}s")
+    imported = {name.split('.')[0] for name, _, _, _ in rows}
+    for forbidden in FORBIDDEN_MODULES:
+        if forbidden in imported:
+            violations.append(f"{forbidden} is imported by {module}")
+    return violations
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the cold import time of the serving app")
+    parser.add_argument('--module', default='main')
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET, help='Seconds')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    violations = check_budget(args.module, args.budget, args.repeat, args.top)
+    if violations:
+        for violation in violations:
+            print(f"FAIL: {violation}")
+        sys.exit(1)
+    print("OK")
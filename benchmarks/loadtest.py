@@ -0,0 +1,269 @@
+# bid_snapper_backend/benchmarks/loadtest.py
+#
+# Load test end-to-end: jalankan main:app dengan uvicorn secara lokal, lalu kirim
+# request /analisis, /recommend, /upload/ dan /upload_hand/ secara bersamaan dengan
+# campuran yang bisa diatur. Tangan dibuat dari benchmarks.deals dan gambar contoh
+# dibuat sintetis (atau diambil dari --images). Secara default detektor YOLO diganti
+# StubCardDetector (BRIDGE_DETECTOR=stub) sehingga harness berjalan offline.
+#
+#   python -m benchmarks.loadtest [--concurrency 16] [--duration 30] [--workers 1]
+#       [--mix analisis=4,recommend=4,upload=1,upload_hand=1] [--detector stub]
+#       [--stub-delay 0.05] [--images running-yolo/images/in_biding] [--url http://host:port]
+#       [--output report.json]
+#
+# Laporan: throughput, latensi p50/p95/p99, dan error rate per endpoint.
+
+import os
+import sys
+import json
+import time
+import random
+import socket
+import asyncio
+import argparse
+import subprocess
+import numpy as np
+import httpx
+from benchmarks.deals import random_deals, random_hands
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MIX = 'analisis=4,recommend=4,upload=1,upload_hand=1'
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+# ======= Data =======
+def sample_images(n=8, seed=42, size=(480, 640)):
+    """Gambar JPEG sintetis (noise acak) yang bisa di-decode cv2; berbeda satu sama lain."""
+    import cv2
+    rng = np.random.default_rng(seed)
+    images = []
+    for _ in range(n):
+        img = rng.integers(0, 256, size=size + (3,), dtype=np.uint8)
+        ok, encoded = cv2.imencode('.jpg', img)
+        if not ok:
+            raise RuntimeError("cv2.imencode failed")
+        images.append(encoded.tobytes())
+    return images
+
+
+def load_images(directory):
+    paths = sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                   if name.lower().endswith(IMAGE_EXTENSIONS))
+    if not paths:
+        raise SystemExit(f"No images found in {directory}")
+    images = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            images.append(f.read())
+    return images
+
+
+def parse_mix(text):
+    mix = {}
+    for item in text.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in REQUEST_BUILDERS:
+            raise SystemExit(f"Unknown endpoint '{name}' in --mix, expected one of {sorted(REQUEST_BUILDERS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class RequestFactory:
+    """Membuat request acak per jenis endpoint dari tangan, deal, dan gambar yang sudah disiapkan."""
+
+    def __init__(self, hands, deals, images, strategies, seed=42):
+        self.hands = hands
+        self.deals = deals
+        self.images = images
+        self.strategies = strategies
+        self.rng = random.Random(seed)
+
+    def analisis(self):
+        return 'POST', '/analisis', {'json': {
+            'cards': self.rng.choice(self.hands), 'strategy': self.rng.choice(self.strategies)}}
+
+    def recommend(self):
+        hand1, hand2 = self.rng.choice(self.deals)
+        return 'POST', '/recommend', {'json': {'hand1': hand1, 'hand2': hand2}}
+
+    def upload(self):
+        return 'POST', '/upload/', {'files': {'file': ('hand.jpg', self.rng.choice(self.images), 'image/jpeg')}}
+
+    def upload_hand(self):
+        return 'POST', '/upload_hand/', {
+            'files': {'file': ('hand.jpg', self.rng.choice(self.images), 'image/jpeg')},
+            'data': {'hand_number': self.rng.choice(['1', '2'])},
+        }
+
+
+REQUEST_BUILDERS = {
+    'analisis': RequestFactory.analisis,
+    'recommend': RequestFactory.recommend,
+    'upload': RequestFactory.upload,
+    'upload_hand': RequestFactory.upload_hand,
+}
+
+
+# ======= Server =======
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port, workers=1, detector='stub', stub_delay=0.0):
+    """Jalankan uvicorn main:app sebagai subprocess; output server dibuang agar tidak mengganggu laporan."""
+    env = dict(os.environ)
+    env['BRIDGE_DETECTOR'] = detector
+    env['BRIDGE_STUB_DETECTOR_DELAY'] = str(stub_delay)
+    env['PYTHONPATH'] = BASE_DIR + os.pathsep + env.get('PYTHONPATH', '')
+    command = [sys.executable, '-m', 'uvicorn', 'main:app', '--host', '127.0.0.1', '--port', str(port),
+               '--workers', str(workers), '--log-level', 'warning', '--no-access-log']
+    return subprocess.Popen(command, cwd=BASE_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_ready(url, process=None, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise SystemExit(f"Server exited with code {process.returncode} during startup")
+        try:
+            if httpx.get(f"{url}/models/status", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"Server at {url} not ready after {timeout:.0f}s")
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+# ======= Load =======
+async def run_load(url, factory, mix, concurrency, duration, max_requests=None, timeout=30.0):
+    """
+    concurrency klien mengirim request berurutan (closed loop) selama duration detik
+    atau sampai max_requests request.
+
+    Returns:
+        dict: endpoint -> list (latensi detik, status atau None jika gagal koneksi).
+    """
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    samples = {name: [] for name in names}
+    deadline = time.monotonic() + duration
+    sent = 0
+
+    async with httpx.AsyncClient(base_url=url, timeout=timeout,
+                                 limits=httpx.Limits(max_connections=concurrency)) as client:
+        async def worker():
+            nonlocal sent
+            while time.monotonic() < deadline and (max_requests is None or sent < max_requests):
+                sent += 1
+                name = factory.rng.choices(names, weights)[0]
+                method, path, kwargs = REQUEST_BUILDERS[name](factory)
+                start = time.perf_counter()
+                try:
+                    response = await client.request(method, path, **kwargs)
+                    status = response.status_code
+                except httpx.HTTPError:
+                    status = None
+                samples[name].append((time.perf_counter() - start, status))
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples
+
+
+def summarize(samples, elapsed):
+    """Throughput, persentil latensi (ms), dan error rate per endpoint serta total."""
+    report = {}
+    everything = []
+    for name, items in samples.items():
+        everything.extend(items)
+        report[name] = summarize_items(items, elapsed)
+    report['total'] = summarize_items(everything, elapsed)
+    return report
+
+
+def summarize_items(items, elapsed):
+    if not items:
+        return {'requests': 0}
+    latencies = np.array([latency for latency, _ in items]) * 1000
+    statuses = [status for _, status in items]
+    errors = sum(1 for status in statuses if status is None or status >= 400)
+    by_status = {}
+    for status in statuses:
+        key = str(status) if status is not None else 'connection_error'
+        by_status[key] = by_status.get(key, 0) + 1
+    return {
+        'requests': len(items),
+        'throughput_rps': len(items) / elapsed,
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p95_ms': float(np.percentile(latencies, 95)),
+        'p99_ms': float(np.percentile(latencies, 99)),
+        'max_ms': float(latencies.max()),
+        'error_rate': errors / len(items),
+        'status': by_status,
+    }
+
+
+def print_report(report, elapsed, concurrency):
+    print(f"duration {elapsed:.1f}s, concurrency {concurrency}")
+    print(f"{'endpoint':<12} {'reqs':>7} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}  status")
+    for name, row in report.items():
+        if not row['requests']:
+            continue
+        print(f"{name:<12} {row['requests']:>7} {row['throughput_rps']:>8.1f} {row['p50_ms']:>9.1f} "
+              f"{row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['error_rate']:>6.1%}  {row['status']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test main:app on a local uvicorn instance")
+    parser.add_argument('--url', help='Target an already running server instead of starting one')
+    parser.add_argument('--workers', type=int, default=1, help='uvicorn worker processes')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=30.0, help='Seconds of load')
+    parser.add_argument('--requests', type=int, default=None, help='Stop after this many requests')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='Endpoint weights, e.g. analisis=4,recommend=4,upload=1')
+    parser.add_argument('--detector', choices=['stub', 'yolo'], default='stub')
+    parser.add_argument('--stub-delay', type=float, default=0.0, help='Simulated inference seconds for the stub detector')
+    parser.add_argument('--images', help='Directory of sample images (default: synthetic JPEGs)')
+    parser.add_argument('--deals', type=int, default=500, help='Distinct generated deals/hands')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Write the report as JSON')
+    args = parser.parse_args()
+
+    from src.biding_strategies import BIDING_STRATEGIES
+    mix = parse_mix(args.mix)
+    images = load_images(args.images) if args.images else sample_images(seed=args.seed)
+    factory = RequestFactory(random_hands(args.deals, args.seed), random_deals(args.deals, args.seed),
+                             images, list(BIDING_STRATEGIES), seed=args.seed)
+
+    process = None
+    url = args.url
+    if url is None:
+        port = free_port()
+        url = f"http://127.0.0.1:{port}"
+        process = start_server(port, args.workers, args.detector, args.stub_delay)
+    try:
+        wait_ready(url, process)
+        start = time.perf_counter()
+        samples = asyncio.run(run_load(url, factory, mix, args.concurrency, args.duration, args.requests))
+        elapsed = time.perf_counter() - start
+    finally:
+        if process is not None:
+            stop_server(process)
+
+    report = summarize(samples, elapsed)
+    print_report(report, elapsed, args.concurrency)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'url': url, 'config': vars(args), 'elapsed': elapsed, 'endpoints': report}, f, indent=2)
@@ -0,0 +1,282 @@
+# bid_snapper_backend/benchmarks/suite.py
+#
+# Suite micro-benchmark untuk jalur panas serving, memakai deal sintetis yang
+# reproducible (benchmarks.deals). Setiap run disimpan sebagai satu file JSON di
+# HISTORY_DIR, sehingga dua run (misal sebelum dan sesudah optimasi) bisa dibandingkan.
+#
+#   python -m benchmarks.suite run [--deals 200] [--hands 2000] [--repeat 5] [--only predict]
+#   python -m benchmarks.suite compare [BASE.json HEAD.json] [--threshold 0.10]
+#   python -m benchmarks.suite list
+#
+# compare tanpa argumen membandingkan dua run terakhir; exit code 1 jika ada regresi.
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import statistics
+import subprocess
+from datetime import datetime
+from benchmarks.deals import random_deals, random_hands
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY_DIR = os.path.join(BASE_DIR, 'benchmarks/history')
+
+# Batas default regresi: per-call lebih lambat dari 10% dianggap regresi
+DEFAULT_THRESHOLD = 0.10
+
+
+# ======= Kasus benchmark =======
+def case_extract_features(deals, hands):
+    from features.extractor import BridgeHandAnalyzer
+    analyzer = BridgeHandAnalyzer()
+
+    def run():
+        for hand1, hand2 in deals:
+            analyzer.extract_comprehensive_features(hand1, hand2)
+    return run, len(deals)
+
+
+def case_hcp_and_distribution(deals, hands):
+    from utils.bridge_analyzer import BridgeHandAnalyzer
+    analyzer = BridgeHandAnalyzer()
+
+    def run():
+        for hand in hands:
+            analyzer.calculate_hcp_and_distribution(hand)
+    return run, len(hands)
+
+
+def make_strategy_case(name):
+    def case(deals, hands):
+        from src.biding_strategies import BIDING_STRATEGIES
+        strategy = BIDING_STRATEGIES[name]
+
+        def run():
+            for hand in hands:
+                strategy(hand)
+        return run, len(hands)
+    return case
+
+
+def case_predict_contract(deals, hands):
+    from predict import predict_contract
+    from models.registry import registry
+    artifacts = registry.get()
+
+    def run():
+        for hand1, hand2 in deals:
+            predict_contract(hand1, hand2, artifacts)
+    return run, len(deals)
+
+
+def _optimizer_inputs(deals):
+    """Fitur mentah dan probabilitas RF per deal, agar hanya optimizer yang diukur."""
+    import numpy as np
+    from features.extractor import BridgeHandAnalyzer
+    from models.registry import registry
+    artifacts = registry.get()
+    pipeline = artifacts.pipeline
+    analyzer = BridgeHandAnalyzer()
+    raw = np.array([pipeline.raw_vector(analyzer.extract_comprehensive_features(hand1, hand2))
+                    for hand1, hand2 in deals])
+    scaled = pipeline.transform(raw)
+    suit_proba = artifacts.flat_suit.predict_proba(scaled)
+    category_proba = artifacts.flat_category.predict_proba(scaled)
+    return artifacts, raw, suit_proba, category_proba
+
+
+def make_optimizer_case(method, max_deals=None):
+    def case(deals, hands):
+        from models.nsga2_optimizer import optimize_contract
+        deals = deals[:max_deals] if max_deals else deals
+        artifacts, raw, suit_proba, category_proba = _optimizer_inputs(deals)
+
+        def run():
+            for i in range(len(deals)):
+                optimize_contract(artifacts.flat_suit, artifacts.flat_category, raw[i],
+                                  artifacts.scaler, artifacts.selected_features, method=method,
+                                  suit_proba=suit_proba[i], category_proba=category_proba[i])
+        return run, len(deals)
+    return case
+
+
+def benchmark_cases():
+    """Nama kasus -> fungsi case(deals, hands) yang mengembalikan (run, jumlah panggilan)."""
+    from src.biding_strategies import BIDING_STRATEGIES
+    cases = {
+        'extract_comprehensive_features': case_extract_features,
+        'calculate_hcp_and_distribution': case_hcp_and_distribution,
+    }
+    for name in BIDING_STRATEGIES:
+        cases[f'strategy.{name}'] = make_strategy_case(name)
+    cases['predict_contract'] = case_predict_contract
+    cases['optimize_contract.exhaustive'] = make_optimizer_case('exhaustive')
+    # NSGA-II ~100x lebih lambat dari exhaustive, jadi cukup beberapa deal
+    cases['optimize_contract.nsga2'] = make_optimizer_case('nsga2', max_deals=5)
+    return cases
+
+
+# ======= Run =======
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def time_case(run, calls, repeat):
+    """Jalankan run() sekali untuk pemanasan lalu repeat kali; waktu per panggilan dalam mikrodetik."""
+    run()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - start) / calls * 1e6)
+    return {
+        'calls': calls,
+        'repeat': repeat,
+        'min_us': min(samples),
+        'median_us': statistics.median(samples),
+        'max_us': max(samples),
+    }
+
+
+def run_suite(n_deals=200, n_hands=2000, repeat=5, seed=42, only=None):
+    """
+    Jalankan semua kasus (atau yang namanya mengandung salah satu string di only).
+
+    Kasus yang gagal disiapkan (misal model belum dilatih) dicatat dengan 'error'
+    tanpa menghentikan suite.
+    """
+    deals = random_deals(n_deals, seed=seed)
+    hands = random_hands(n_hands, seed=seed)
+    results = {}
+    for name, case in benchmark_cases().items():
+        if only and not any(pattern in name for pattern in only):
+            continue
+        try:
+            run, calls = case(deals, hands)
+            results[name] = time_case(run, calls, repeat)
+            print(f"{name:<40} {results[name]['min_us']:>12.2f} us/call")
+        except Exception as e:
+            results[name] = {'error': str(e)}
+            print(f"{name:<40} {'ERROR':>12} {e}")
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {'deals': n_deals, 'hands': n_hands, 'repeat': repeat, 'seed': seed},
+        'results': results,
+    }
+
+
+def save_run(record, history_dir=HISTORY_DIR):
+    os.makedirs(history_dir, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    path = os.path.join(history_dir, f"{stamp}-{record['commit'] or 'nogit'}.json")
+    with open(path, 'w') as f:
+        json.dump(record, f, indent=2)
+    return path
+
+
+def history_files(history_dir=HISTORY_DIR):
+    if not os.path.isdir(history_dir):
+        return []
+    return sorted(os.path.join(history_dir, name) for name in os.listdir(history_dir) if name.endswith('.json'))
+
+
+# ======= Compare =======
+def compare_runs(base, head, threshold=DEFAULT_THRESHOLD):
+    """
+    Bandingkan min_us per kasus antara dua run.
+
+    Returns:
+        list: (nama, base_us, head_us, rasio head/base, status) dengan status
+        'regression', 'improvement', 'ok', atau 'missing'.
+    """
+    rows = []
+    names = list(dict.fromkeys(list(base['results']) + list(head['results'])))
+    for name in names:
+        before = base['results'].get(name, {})
+        after = head['results'].get(name, {})
+        if 'min_us' not in before or 'min_us' not in after:
+            rows.append((name, before.get('min_us'), after.get('min_us'), None, 'missing'))
+            continue
+        ratio = after['min_us'] / before['min_us']
+        if ratio > 1 + threshold:
+            status = 'regression'
+        elif ratio < 1 / (1 + threshold):
+            status = 'improvement'
+        else:
+            status = 'ok'
+        rows.append((name, before['min_us'], after['min_us'], ratio, status))
+    return rows
+
+
+def print_comparison(rows, base_label, head_label):
+    print(f"base: {base_label}")
+    print(f"head: {head_label}")
+    print(f"{'case':<40} {'base us':>12} {'head us':>12} {'ratio':>8}  status")
+    for name, before, after, ratio, status in rows:
+        before = f"{before:.2f}" if before is not None else '-'
+        after = f"{after:.2f}" if after is not None else '-'
+        ratio = f"{ratio:.2f}x" if ratio is not None else '-'
+        print(f"{name:<40} {before:>12} {after:>12} {ratio:>8}  {status}")
+
+
+def load_run(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark suite for the serving hot paths")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Run the suite and store the result in the history')
+    run_parser.add_argument('--deals', type=int, default=200)
+    run_parser.add_argument('--hands', type=int, default=2000)
+    run_parser.add_argument('--repeat', type=int, default=5)
+    run_parser.add_argument('--seed', type=int, default=42)
+    run_parser.add_argument('--only', nargs='*', help='Only run cases whose name contains one of these strings')
+    run_parser.add_argument('--no-save', action='store_true')
+
+    compare_parser = subparsers.add_parser('compare', help='Compare two runs (default: the last two)')
+    compare_parser.add_argument('runs', nargs='*', help='BASE.json HEAD.json')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+
+    subparsers.add_parser('list', help='List stored runs')
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        # Log INFO dari predict/optimizer akan mendominasi waktu jika tidak dimatikan
+        logging.disable(logging.INFO)
+        record = run_suite(args.deals, args.hands, args.repeat, args.seed, args.only)
+        if not args.no_save:
+            print(f"Saved {save_run(record)}")
+    elif args.command == 'compare':
+        if len(args.runs) == 2:
+            base_path, head_path = args.runs
+        elif not args.runs:
+            files = history_files()
+            if len(files) < 2:
+                raise SystemExit(f"Need at least two runs in {HISTORY_DIR} to compare")
+            base_path, head_path = files[-2], files[-1]
+        else:
+            raise SystemExit("compare expects either no arguments or BASE.json HEAD.json")
+        rows = compare_runs(load_run(base_path), load_run(head_path), args.threshold)
+        print_comparison(rows, base_path, head_path)
+        regressions = [row[0] for row in rows if row[4] == 'regression']
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+    else:
+        for path in history_files():
+            record = load_run(path)
+            print(f"{os.path.basename(path)}  commit={record.get('commit')}  cases={len(record['results'])}")
@@ -10,4 +10,34 @@ PORT = 8000
 
 # device development (sesuaikan dengan config device anda)
 # HOST = ""
-# PORT =
\ No newline at end of file
+# PORT =
+# Jumlah deal maksimal per request /recommend/batch
+MAX_BATCH_DEALS = 1000
+
+# Model YOLO untuk deteksi kartu (dimuat sekali per worker)
+YOLO_WEIGHTS_PATH = "../yolo-weights/playingCards.pt"
+PRELOAD_DETECTOR = True
+
+# Detektor kartu: "yolo" atau "stub" (tanpa model, untuk load test offline; bisa juga
+# lewat env BRIDGE_DETECTOR). STUB_DETECTOR_DELAY meniru waktu inferensi dalam detik.
+DETECTOR = "yolo"
+STUB_DETECTOR_DELAY = 0.0
+
+# Pool worker untuk inferensi (/recommend) dan deteksi (/upload); request ditolak
+# dengan 503 jika pekerjaan berjalan + antrian melebihi WORKERS + QUEUE_DEPTH
+INFERENCE_WORKERS = 4
+INFERENCE_QUEUE_DEPTH = 16
+DETECTION_WORKERS = 1
+DETECTION_QUEUE_DEPTH = 8
+
+# Cache hasil /recommend per deal (0 untuk menonaktifkan); TTL dalam detik
+RECOMMEND_CACHE_SIZE = 4096
+RECOMMEND_CACHE_TTL = 600
+
+# Tracing per request (/debug/traces): fraksi request yang direkam (0 untuk mematikan)
+# dan jumlah trace paling lambat yang disimpan
+TRACE_SAMPLE_RATE = 0.01
+TRACE_KEEP_SLOWEST = 20
+# Endpoint /debug/traces dan header "X-Trace: 1" tidak diautentikasi; nyalakan hanya di
+# lingkungan terpercaya
+TRACE_DEBUG_ENABLED = False
@@ -0,0 +1,157 @@
+import os
+import json
+import time
+import argparse
+import logging
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from utils.dataset_stream import iter_board_chunks
+from utils.double_dummy import (
+    DDTableCache, SOLVERS, get_solver, board_to_seats, random_seats,
+    unpack_seats, seats_to_hands, optimal_contract,
+)
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_PATH = os.path.join(BASE_DIR, 'data/dd/dd_tables.bin')
+
+def iter_seat_chunks_from_boards(json_path, chunk_size, seed=42):
+    """
+    Baca board dataset per chunk dan ubah menjadi deal lengkap (array seat).
+
+    Kartu lawan untuk board tanpa 'deal' dibagi acak dengan seed per board,
+    sehingga board yang sama selalu menghasilkan deal yang sama.
+    """
+    n_boards = 0
+    for chunk in iter_board_chunks(json_path, chunk_size):
+        seats = []
+        for i, board in enumerate(chunk, start=n_boards):
+            try:
+                seats.append(board_to_seats(board, np.random.default_rng([seed, i])))
+            except (KeyError, ValueError) as e:
+                logger.error(f"Invalid board {i}: {e}")
+                raise
+        n_boards += len(chunk)
+        yield np.stack(seats)
+
+def iter_seat_chunks_random(n_deals, chunk_size, seed=42):
+    """Deal acak lengkap sebanyak n_deals, per chunk."""
+    for start in range(0, n_deals, chunk_size):
+        yield random_seats(min(chunk_size, n_deals - start), seed=seed, start=start)
+
+def _solve_batch(solver, seats):
+    return solver.solve_batch(seats)
+
+def generate_tables(seat_chunks, cache, solver, workers=None, batch_size=256):
+    """
+    Hitung tabel double-dummy untuk semua deal yang belum ada di cache.
+
+    Tiap chunk dibagi menjadi batch berukuran batch_size yang dikerjakan paralel di
+    process pool; hasil ditambahkan ke cache per chunk sehingga proses bisa dilanjutkan.
+
+    Args:
+        seat_chunks: Iterable array seat (n, 52).
+        cache (DDTableCache): Cache tujuan.
+        solver (DDSolver): Solver yang dipakai.
+        workers (int, optional): Jumlah process; 1 berarti dijalankan di process ini.
+        batch_size (int): Jumlah deal per pekerjaan solver.
+
+    Returns:
+        int: Jumlah deal yang baru dihitung.
+    """
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    solved = 0
+    skipped = 0
+    start = time.perf_counter()
+    try:
+        for seats in seat_chunks:
+            missing = cache.missing(seats)
+            skipped += int((~missing).sum())
+            seats = seats[missing]
+            if not len(seats):
+                continue
+            batches = [seats[i:i + batch_size] for i in range(0, len(seats), batch_size)]
+            if executor is not None:
+                results = list(executor.map(_solve_batch, [solver] * len(batches), batches))
+            else:
+                results = [_solve_batch(solver, batch) for batch in batches]
+            cache.append(seats, np.concatenate(results))
+            solved += len(seats)
+            elapsed = time.perf_counter() - start
+            logger.info(f"Solved {solved} deals ({solved / elapsed:.1f} deals/s), skipped {skipped} cached")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return solved
+
+def export_labels(cache, output_path, limit=None):
+    """
+    Tulis board JSONL dari cache: 'hand1' (N), 'hand2' (S), 'contract' (kontrak optimal
+    double-dummy N/S), dan 'dd_tricks' (tabel 5 x 4). Format ini langsung bisa dibaca
+    preprocess.py.
+
+    Returns:
+        int: Jumlah board yang ditulis.
+    """
+    records = cache.read()
+    if limit is not None:
+        records = records[:limit]
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    written = 0
+    with open(output_path, 'w') as f:
+        # Dibaca per blok agar cache besar tidak di-unpack sekaligus
+        for start in range(0, len(records), 10000):
+            block = records[start:start + 10000]
+            for seats, tricks in zip(unpack_seats(block['deal']), block['tricks']):
+                hands = seats_to_hands(seats)
+                board = {
+                    'hand1': hands[0],
+                    'hand2': hands[2],
+                    'contract': optimal_contract(tricks),
+                    'dd_tricks': tricks.tolist(),
+                }
+                f.write(json.dumps(board) + '\n')
+                written += 1
+    logger.info(f"Exported {written} boards to {output_path}")
+    return written
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate double-dummy trick tables and contract labels")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    solve = subparsers.add_parser('solve', help="Solve deals into the binary cache")
+    source = solve.add_mutually_exclusive_group(required=True)
+    source.add_argument('--boards', help="Dataset JSON/JSONL with hand1/hand2 (or PBN 'deal') per board")
+    source.add_argument('--deal', type=int, metavar='N', help="Deal N random full deals")
+    solve.add_argument('--seed', type=int, default=42)
+    solve.add_argument('--cache', default=DEFAULT_CACHE_PATH)
+    solve.add_argument('--solver', choices=sorted(SOLVERS), default='endplay')
+    solve.add_argument('--workers', type=int, default=None, help="Process pool size (default: all cores)")
+    solve.add_argument('--batch-size', type=int, default=256)
+    solve.add_argument('--chunk-size', type=int, default=50000)
+
+    export = subparsers.add_parser('export', help="Write JSONL boards with double-dummy optimal contracts")
+    export.add_argument('--cache', default=DEFAULT_CACHE_PATH)
+    export.add_argument('--output', required=True)
+    export.add_argument('--limit', type=int, default=None)
+
+    args = parser.parse_args()
+    try:
+        if args.command == 'solve':
+            os.makedirs(os.path.dirname(os.path.abspath(args.cache)), exist_ok=True)
+            cache = DDTableCache(args.cache)
+            if args.boards:
+                chunks = iter_seat_chunks_from_boards(args.boards, args.chunk_size, seed=args.seed)
+            else:
+                chunks = iter_seat_chunks_random(args.deal, args.chunk_size, seed=args.seed)
+            solved = generate_tables(chunks, cache, get_solver(args.solver), args.workers, args.batch_size)
+            logger.info(f"Done: {solved} new tables, {len(cache)} deals in {args.cache}")
+        else:
+            export_labels(DDTableCache(args.cache), args.output, args.limit)
+    except Exception as e:
+        logger.error(f"Double-dummy label generation failed: {e}")
+        raise
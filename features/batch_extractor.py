@@ -0,0 +1,135 @@
+import numpy as np
+from typing import Dict, List, Sequence, Tuple
+from utils.hand_encoding import (
+    RANK_BITS, SUIT_INDEX, SUIT_LENGTH_TABLE, SUIT_HCP_TABLE, SUIT_HONOR_WEIGHT_TABLE,
+    SUIT_QUICK_TRICKS_TABLE, SUIT_CONTROLS_TABLE, SUIT_ACES_TABLE,
+)
+
+# Urutan kolom sama dengan dict hasil BridgeHandAnalyzer.extract_comprehensive_features
+FEATURE_NAMES = [
+    'total_hcp', 'hcp_hand1', 'hcp_hand2', 'hcp_difference',
+    'dist_spades', 'dist_hearts', 'dist_diamonds', 'dist_clubs',
+    'longest_suit', 'shortest_suit', 'suit_range', 'suits_8plus', 'suits_9plus',
+    'balance_score1', 'balance_score2', 'avg_balance_score',
+    'total_controls', 'total_aces', 'total_quick_tricks',
+    'honor_s', 'honor_h', 'honor_d', 'honor_c', 'total_honor_power',
+]
+
+# Bobot bit per posisi rank (bit 0 = kartu 2, bit 12 = As) dan tabel lookup per
+# bitmask suit (8192 entri) dari utils.hand_encoding dalam bentuk array NumPy
+RANK_WEIGHTS = 1 << np.arange(13, dtype=np.int64)
+LENGTH_TABLE = np.array(SUIT_LENGTH_TABLE, dtype=np.int64)
+HCP_TABLE = np.array(SUIT_HCP_TABLE, dtype=np.int64)
+HONOR_WEIGHT_TABLE = np.array(SUIT_HONOR_WEIGHT_TABLE)
+QUICK_TRICK_TABLE = np.array(SUIT_QUICK_TRICKS_TABLE)
+CONTROLS_TABLE = np.array(SUIT_CONTROLS_TABLE, dtype=np.int64)
+ACES_TABLE = np.array(SUIT_ACES_TABLE, dtype=np.int64)
+
+# Lookup kartu -> index 0..51 (suit * 13 + posisi rank, urutan suit S, H, D, C)
+CARD_INDEX = {rank + suit: SUIT_INDEX[suit] * 13 + bit for rank, bit in RANK_BITS.items() for suit in SUIT_INDEX}
+
+
+def card_index(card: str) -> int:
+    """Index kartu 0..51 dari CARD_INDEX."""
+    try:
+        return CARD_INDEX[card]
+    except KeyError:
+        raise ValueError(f"Kartu tidak dikenali: {card}")
+
+
+def encode_deals(deals: Sequence[Tuple[List[str], List[str]]]) -> np.ndarray:
+    """
+    Encode daftar pasangan (hand1, hand2) menjadi array boolean (n, 2, 52).
+
+    Raises:
+        ValueError: Jika ada kartu yang tidak dikenali.
+    """
+    encoded = np.zeros((len(deals), 2, 52), dtype=bool)
+    for i, (hand1, hand2) in enumerate(deals):
+        encoded[i, 0, [card_index(card) for card in hand1]] = True
+        encoded[i, 1, [card_index(card) for card in hand2]] = True
+    return encoded
+
+
+def balance_scores(lengths: np.ndarray) -> np.ndarray:
+    """Versi vektor dari BridgeHandAnalyzer.classify_distribution (hanya skor numerik)."""
+    s = -np.sort(-lengths, axis=-1)
+
+    def shape_is(*pattern):
+        return np.all(s == np.array(pattern), axis=-1)
+
+    conditions = [
+        shape_is(4, 3, 3, 3),
+        shape_is(4, 4, 3, 2),
+        shape_is(5, 3, 3, 2),
+        shape_is(5, 4, 2, 2),
+        s[..., 0] == 6,
+        s[..., 0] >= 7,
+        np.any(s == 1, axis=-1),
+        np.any(s == 0, axis=-1),
+    ]
+    choices = [0.0, 0.25, 0.25, 0.5, 0.75, 1.0, 0.8, 1.0]
+    return np.select(conditions, choices, default=0.6)
+
+
+def extract_features_batch(encoded: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Hitung semua fitur extract_comprehensive_features untuk banyak deal sekaligus
+    dengan reduksi NumPy.
+
+    Args:
+        encoded: Array boolean (n, 2, 52) dari encode_deals.
+
+    Returns:
+        Dict nama fitur -> array (n,), dengan urutan kolom FEATURE_NAMES.
+    """
+    cards = encoded.reshape(len(encoded), 2, 4, 13)
+    # Bitmask 13-bit per (deal, tangan, suit); semua metrik suit diambil dari tabel lookup
+    masks = cards @ RANK_WEIGHTS                                       # (n, 2, 4)
+
+    lengths = LENGTH_TABLE[masks]                                      # (n, 2, 4)
+    hcp = HCP_TABLE[masks].sum(axis=-1)                                # (n, 2)
+    dist_combined = lengths.sum(axis=1)                                # (n, 4)
+
+    honor_weight = HONOR_WEIGHT_TABLE[masks].sum(axis=1)               # (n, 4)
+    quick_tricks = QUICK_TRICK_TABLE[masks].sum(axis=-1)               # (n, 2)
+
+    controls = CONTROLS_TABLE[masks].sum(axis=(-1, -2))
+    aces = ACES_TABLE[masks].sum(axis=(-1, -2))
+
+    balance = balance_scores(lengths)                                  # (n, 2)
+    longest_suit = dist_combined.max(axis=1)
+    shortest_suit = dist_combined.min(axis=1)
+
+    # Jumlahkan per suit berurutan agar sama dengan akumulasi di BridgeHandAnalyzer
+    total_honor_power = np.zeros(len(encoded))
+    for suit in range(4):
+        total_honor_power = total_honor_power + honor_weight[:, suit]
+
+    features = {
+        'total_hcp': hcp[:, 0] + hcp[:, 1],
+        'hcp_hand1': hcp[:, 0],
+        'hcp_hand2': hcp[:, 1],
+        'hcp_difference': np.abs(hcp[:, 0] - hcp[:, 1]),
+        'dist_spades': dist_combined[:, 0],
+        'dist_hearts': dist_combined[:, 1],
+        'dist_diamonds': dist_combined[:, 2],
+        'dist_clubs': dist_combined[:, 3],
+        'longest_suit': longest_suit,
+        'shortest_suit': shortest_suit,
+        'suit_range': longest_suit - shortest_suit,
+        'suits_8plus': (dist_combined >= 8).sum(axis=1),
+        'suits_9plus': (dist_combined >= 9).sum(axis=1),
+        'balance_score1': balance[:, 0],
+        'balance_score2': balance[:, 1],
+        'avg_balance_score': (balance[:, 0] + balance[:, 1]) / 2,
+        'total_controls': controls,
+        'total_aces': aces,
+        'total_quick_tricks': quick_tricks[:, 0] + quick_tricks[:, 1],
+        'honor_s': honor_weight[:, 0],
+        'honor_h': honor_weight[:, 1],
+        'honor_d': honor_weight[:, 2],
+        'honor_c': honor_weight[:, 3],
+        'total_honor_power': total_honor_power,
+    }
+    return features
@@ -1,11 +1,8 @@
-import sys
-import pandas as pd
-import os
-import numpy as np
-from itertools import product
-import matplotlib.pyplot as plt
-import seaborn as sns
 from typing import List, Tuple, Dict, Union
+from utils.hand_encoding import (
+    SUITS, SUIT_INDEX, SUIT_LENGTH_TABLE, SUIT_HONOR_WEIGHT_TABLE, encode_hand, distribution,
+    hand_hcp, hand_controls, hand_quick_tricks,
+)
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -13,33 +10,25 @@ class BridgeHandAnalyzer:
     """
     A comprehensive bridge hand analyzer for calculating HCP, distributions,
     honor power, and other bridge-related metrics.
+
+    Each hand is parsed once into per-suit rank bitmasks (utils.hand_encoding)
+    and every metric is a lookup into the 8192-entry per-suit tables.
     """
     
     def __init__(self):
-        self.hcp_map = {'A': 4, 'K': 3, 'Q': 2, 'J': 1}
-        self.suits = ['S', 'H', 'D', 'C']
-        self.honor_weights = {
-            frozenset(['A', 'K', 'Q']): 3.0,  # AKQ
-            frozenset(['A', 'K']): 2.0,       # AK
-            frozenset(['A', 'Q']): 1.5,       # AQ  
-            frozenset(['A']): 1.0,            # A
-            frozenset(['K', 'Q']): 1.0,       # KQ
-            frozenset(['K']): 0.5,            # K alone
-            frozenset(['Q']): 0.25,           # Q alone
-            frozenset([]): 0.0                # No honors
-        }
+        self.suits = list(SUITS)
     
     def calculate_hcp(self, hand: List[str]) -> int:
         """Calculate High Card Points (HCP) from a hand."""
-        return sum(self.hcp_map.get(card[0], 0) for card in hand)
+        return hand_hcp(encode_hand(hand))
     
     def count_suit_length(self, hand: List[str], suit: str) -> int:
         """Count number of cards in a specific suit."""
-        return sum(1 for card in hand if card.endswith(suit))
+        return SUIT_LENGTH_TABLE[encode_hand(hand)[SUIT_INDEX[suit]]]
     
     def get_distribution(self, hand: List[str]) -> List[int]:
         """Return distribution of cards per suit: [S, H, D, C]."""
-        return [self.count_suit_length(hand, suit) for suit in self.suits]
+        return distribution(encode_hand(hand))
     
     def classify_distribution(self, distribution: List[int]) -> Tuple[str, float]:
         """
@@ -72,27 +61,18 @@ class BridgeHandAnalyzer:
     
     def calculate_honor_weight_per_suit(self, hand: List[str], suit: str) -> float:
         """Calculate honor weight for a specific suit."""
-        suit_cards = [card for card in hand if card.endswith(suit)]
-        honors = frozenset(card[0] for card in suit_cards if card[0] in ['A', 'K', 'Q', 'J'])
-        
-        for honor_combo, weight in self.honor_weights.items():
-            if honor_combo.issubset(honors):
-                return weight
-        
-        return 0.0
+        return SUIT_HONOR_WEIGHT_TABLE[encode_hand(hand)[SUIT_INDEX[suit]]]
     
     def calculate_partnership_honor_power(self, hand1: List[str], hand2: List[str]) -> Dict[str, float]:
         """Calculate comprehensive honor power metrics for partnership."""
-        combined_hand = hand1 + hand2
-        
+        return self._honor_power(encode_hand(hand1), encode_hand(hand2))
+    
+    def _honor_power(self, masks1: List[int], masks2: List[int]) -> Dict[str, float]:
         suit_honors = {}
         total_honor_power = 0
         
-        for suit in self.suits:
-            h1_weight = self.calculate_honor_weight_per_suit(hand1, suit)
-            h2_weight = self.calculate_honor_weight_per_suit(hand2, suit)
-            combined_weight = h1_weight + h2_weight
-            
+        for suit, mask1, mask2 in zip(self.suits, masks1, masks2):
+            combined_weight = SUIT_HONOR_WEIGHT_TABLE[mask1] + SUIT_HONOR_WEIGHT_TABLE[mask2]
             suit_honors[f'honor_{suit.lower()}'] = combined_weight
             total_honor_power += combined_weight
         
@@ -104,51 +84,34 @@ class BridgeHandAnalyzer:
         Calculate controls (Aces and Kings).
         Returns: (total_controls, aces_count)
         """
-        aces = sum(1 for card in hand if card[0] == 'A')
-        kings = sum(1 for card in hand if card[0] == 'K')
-        total_controls = aces * 2 + kings
-        return total_controls, aces
+        return hand_controls(encode_hand(hand))
     
     def calculate_quick_tricks(self, hand: List[str]) -> float:
         """Calculate quick tricks for each suit and total."""
-        quick_tricks = 0
-        
-        for suit in self.suits:
-            suit_cards = [card for card in hand if card.endswith(suit)]
-            honors = [card[0] for card in suit_cards if card[0] in ['A', 'K', 'Q']]
-            
-            if 'A' in honors and 'K' in honors:
-                quick_tricks += 2.0
-            elif 'A' in honors:
-                quick_tricks += 1.0
-            elif 'K' in honors and 'Q' in honors:
-                quick_tricks += 1.0
-            elif 'K' in honors:
-                quick_tricks += 0.5
-        
-        return quick_tricks
+        return hand_quick_tricks(encode_hand(hand))
     
     def extract_comprehensive_features(self, hand1: List[str], hand2: List[str]) -> Dict:
         """Extract comprehensive features from partnership hands."""
-        combined_hand = hand1 + hand2
+        masks1 = encode_hand(hand1)
+        masks2 = encode_hand(hand2)
         
-        total_hcp = self.calculate_hcp(combined_hand)
-        hcp_hand1 = self.calculate_hcp(hand1)
-        hcp_hand2 = self.calculate_hcp(hand2)
+        hcp_hand1 = hand_hcp(masks1)
+        hcp_hand2 = hand_hcp(masks2)
+        total_hcp = hcp_hand1 + hcp_hand2
         
-        dist_combined = self.get_distribution(combined_hand)
-        dist_hand1 = self.get_distribution(hand1)
-        dist_hand2 = self.get_distribution(hand2)
+        dist_hand1 = distribution(masks1)
+        dist_hand2 = distribution(masks2)
+        dist_combined = [a + b for a, b in zip(dist_hand1, dist_hand2)]
         
         balance_cat1, balance_score1 = self.classify_distribution(dist_hand1)
         balance_cat2, balance_score2 = self.classify_distribution(dist_hand2)
         
-        honor_metrics = self.calculate_partnership_honor_power(hand1, hand2)
+        honor_metrics = self._honor_power(masks1, masks2)
         
-        controls1, aces1 = self.calculate_controls(hand1)
-        controls2, aces2 = self.calculate_controls(hand2)
-        qt1 = self.calculate_quick_tricks(hand1)
-        qt2 = self.calculate_quick_tricks(hand2)
+        controls1, aces1 = hand_controls(masks1)
+        controls2, aces2 = hand_controls(masks2)
+        qt1 = hand_quick_tricks(masks1)
+        qt2 = hand_quick_tricks(masks2)
         
         hcp_difference = abs(hcp_hand1 - hcp_hand2)
         longest_suit = max(dist_combined)
@@ -1,17 +1,21 @@
 # main.py
 
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, validator
-from src.biding_strategies import BIDING_STRATEGIES
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, ValidationError, validator
+from src.biding_strategies import BIDING_STRATEGIES, evaluate_strategies
 import uvicorn
-from typing import List
-import re
+from typing import Any, List, Union
 import os
-import subprocess
-from pathlib import Path
-import json
-from predict import predict_contract
+import re
+import uuid
+from predict import predict_contract, predict_contracts_batch
+from models.registry import registry
+from utils.result_cache import DealCache, deal_key
+from utils.worker_pool import BoundedWorkerPool, PoolFullError
+from utils.metrics import metrics, RequestTimingMiddleware, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from utils.tracing import tracer, span, TracingMiddleware
+from utils.card_detector import create_detector, DEFAULT_WEIGHTS_PATH, BIDING_RANK_ORDER, KONTRAK_RANK_ORDER
 
 import config
 
@@ -20,10 +24,102 @@ app = FastAPI(
     description="Sistem rekomendasi biding dan kontrak bridge berbasis ML + NSGA-II + Validasi Aturan Bridge"
 )
 
+# Histogram durasi request per endpoint; rincian per tahap dicatat di predict.py dan card_detector.py
+app.add_middleware(RequestTimingMiddleware)
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    # Histogram latensi per endpoint dan per tahap dalam format teks Prometheus
+    return Response(content=metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+# Tracing per request dengan sampling; N trace paling lambat disimpan untuk /debug/traces.
+# /debug/traces dan header "X-Trace: 1" (paksa rekam) tidak diautentikasi, jadi keduanya
+# hanya aktif jika TRACE_DEBUG_ENABLED dinyalakan di config (default mati).
+tracer.configure(
+    sample_rate=getattr(config, "TRACE_SAMPLE_RATE", 0.01),
+    keep_slowest=getattr(config, "TRACE_KEEP_SLOWEST", 20),
+)
+TRACE_DEBUG_ENABLED = getattr(config, "TRACE_DEBUG_ENABLED", False)
+app.add_middleware(TracingMiddleware, allow_force=TRACE_DEBUG_ENABLED)
+
+async def debug_traces(limit: int = 20):
+    # Trace paling lambat beserta span-nya, dari yang paling lambat
+    return {
+        "tracer": tracer.stats(),
+        "traces": [trace.to_dict() for trace in tracer.slowest()[:limit]],
+    }
+
+async def debug_traces_chrome(trace_id: int = None):
+    # Ekspor JSON Chrome trace (buka di chrome://tracing atau ui.perfetto.dev)
+    if trace_id is None:
+        return tracer.chrome_trace()
+    trace = tracer.get(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail=f"Trace {trace_id} tidak ditemukan.")
+    return tracer.chrome_trace([trace])
+
+if TRACE_DEBUG_ENABLED:
+    app.get("/debug/traces")(debug_traces)
+    app.get("/debug/traces/chrome")(debug_traces_chrome)
+
+# Pool worker untuk pekerjaan CPU-bound agar event loop tidak terblokir
+inference_pool = BoundedWorkerPool(
+    "inference",
+    max_workers=getattr(config, "INFERENCE_WORKERS", 4),
+    max_queue=getattr(config, "INFERENCE_QUEUE_DEPTH", 16),
+)
+detection_pool = BoundedWorkerPool(
+    "detection",
+    max_workers=getattr(config, "DETECTION_WORKERS", 1),
+    max_queue=getattr(config, "DETECTION_QUEUE_DEPTH", 8),
+)
+
+def pool_full_exception(e):
+    # Backpressure: antrian penuh, klien diminta mencoba lagi
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+@app.on_event("shutdown")
+def shutdown_pools():
+    inference_pool.shutdown()
+    detection_pool.shutdown()
+    registry.stop_watcher()
+
+@app.get("/pool/status")
+async def pool_status():
+    # Status pool worker: antrian, penolakan, dan waktu tunggu antrian
+    return {
+        "inference": inference_pool.stats(),
+        "detection": detection_pool.stats(),
+    }
+
+@app.on_event("startup")
+def load_models():
+    # Muat model sekali saat startup agar request pertama tidak menanggung biaya load
+    try:
+        registry.load()
+    except Exception as e:
+        print(f"❌ Gagal memuat model: {str(e)}")
+    # Cek perubahan file model di thread latar, bukan di event loop saat request
+    registry.start_watcher()
+
+@app.get("/models/status")
+async def models_status():
+    # Status registry model: versi, waktu load, dan error terakhir
+    return registry.status()
+
 # ======= Biding =======
-class HandRequest(BaseModel):
+# Format kartu untuk /analisis: rank A K Q J T 9..2 (atau 10, seperti hasil deteksi YOLO) + suit S H D C
+CARD_PATTERN = re.compile(r'^(?:[AKQJT2-9]|10)[SHDC]$')
+
+class CardsRequest(BaseModel):
     cards: List[str]
-    strategy: str  # misal: "prec_opening", "sayc_respon_1c"
+    
+    @validator('cards')
+    def validate_card_format(cls, v):
+        invalid_cards = [card for card in v if not CARD_PATTERN.match(card)]
+        if invalid_cards:
+            raise ValueError(f"Format kartu tidak valid: {', '.join(invalid_cards)}")
+        return v
     
     @validator('cards')
     def validate_card_count(cls, v):
@@ -34,19 +130,36 @@ class HandRequest(BaseModel):
     
     @validator('cards')
     def validate_no_duplicate_cards(cls, v):
-        if len(v) != len(set(v)):
+        # '10S' dan 'TS' adalah kartu yang sama
+        normalized = [card.replace('10', 'T', 1) for card in v]
+        if len(normalized) != len(set(normalized)):
             # Mencari kartu yang duplikat
             seen = set()
             duplicates = []
-            for card in v:
-                if card in seen:
+            for card, key in zip(v, normalized):
+                if key in seen:
                     duplicates.append(card)
                 else:
-                    seen.add(card)
+                    seen.add(key)
             
             raise ValueError(f"Kartu duplikat ditemukan: {', '.join(duplicates)}")
         return v
-    
+
+class HandRequest(CardsRequest):
+    strategy: str  # misal: "prec_opening", "sayc_respon_1c"
+
+class MultiStrategyRequest(CardsRequest):
+    strategies: Union[List[str], str] = "all"  # daftar nama strategi, atau "all"
+
+    @validator('strategies')
+    def validate_strategies(cls, v):
+        if isinstance(v, str):
+            if v != "all":
+                raise ValueError("strategies harus berupa daftar nama strategi atau \"all\"")
+            return v
+        if not v:
+            raise ValueError("Daftar strategi tidak boleh kosong")
+        return v
 
 @app.post("/analisis")
 async def analyze_hand(request: HandRequest):
@@ -65,6 +178,23 @@ async def analyze_hand(request: HandRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/analisis/multi")
+async def analyze_hand_multi(request: MultiStrategyRequest):
+    # Satu tangan, banyak strategi: kartu divalidasi dan dianalisis (HCP + distribusi) sekali,
+    # lalu setiap strategi hanya melakukan lookup bid
+    names = list(BIDING_STRATEGIES) if request.strategies == "all" else list(dict.fromkeys(request.strategies))
+    unknown = [name for name in names if name not in BIDING_STRATEGIES]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Strategi tidak dikenali: {', '.join(unknown)}."
+        )
+
+    try:
+        return evaluate_strategies(request.cards, names)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # ======= Kontrak =======
 class BridgeHandRequest(BaseModel):
     hand1: list[str]
@@ -106,170 +236,215 @@ class BridgeHandRequest(BaseModel):
                 raise ValueError(f"Kartu duplikat antara hand1 dan hand2: {', '.join(sorted(duplicates))}")
         return v
 
+def format_contract_result(result):
+    # Format hasil predict_contract agar sama dengan output terminal
+    return {
+        "early_predicted_contract": result['early_contract'],
+        "early_confidence_score": round(result['early_confidence'], 1),
+        "predicted_contract": f"{result['level']}{result['suit']}",
+        "confidence_score": round(result['confidence'], 1),
+        "hand1_hcp": result['hand1_hcp'],
+        "hand2_hcp": result['hand2_hcp'],
+        "total_hcp": f"{result['total_hcp']} HCP, {result['hcp_strength']} strength",
+        "suit_dist": result['suit_dist']
+    }
+
+# Cache hasil rekomendasi per deal; dikosongkan otomatis saat versi model berubah, dan
+# hasil dari snapshot model lama (request yang selesai setelah reload) tidak disimpan
+recommend_cache = DealCache(
+    maxsize=getattr(config, "RECOMMEND_CACHE_SIZE", 4096),
+    ttl=getattr(config, "RECOMMEND_CACHE_TTL", 600.0),
+    current_version=lambda: registry.version,
+)
+
+@app.get("/cache/status")
+async def cache_status():
+    # Statistik cache rekomendasi: ukuran, hit/miss, eviction, dan versi model
+    return recommend_cache.stats()
+
 @app.post("/recommend")
 async def recommend_contract(request: BridgeHandRequest):
     try:
-        # Run predict_contract from predict.py
-        result = predict_contract(request.hand1, request.hand2)
+        artifacts = registry.get()
+        key = deal_key(request.hand1, request.hand2)
+        result = recommend_cache.get(key, artifacts.version)
+        if result is None:
+            # Run predict_contract from predict.py di pool inferensi
+            result = await inference_pool.run(predict_contract, request.hand1, request.hand2, artifacts)
+            recommend_cache.put(key, result, artifacts.version)
         
-        # Format the response to match the terminal output
-        response = {
-            "result": {
-                "early_predicted_contract": result['early_contract'],
-                "early_confidence_score": round(result['early_confidence'], 1),
-                "predicted_contract": f"{result['level']}{result['suit']}",
-                "confidence_score": round(result['confidence'], 1),
-                "hand1_hcp": result['hand1_hcp'],
-                "hand2_hcp": result['hand2_hcp'],
-                "total_hcp": f"{result['total_hcp']} HCP, {result['hcp_strength']} strength",
-                "suit_dist": result['suit_dist']
-            }
-        }
-        
-        return response
+        return {"result": format_contract_result(result)}
     
+    except PoolFullError as e:
+        raise pool_full_exception(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Jumlah deal maksimal per request batch
+MAX_BATCH_DEALS = getattr(config, "MAX_BATCH_DEALS", 1000)
+
+class BatchRecommendRequest(BaseModel):
+    # Tiap item divalidasi terpisah dengan BridgeHandRequest agar error per deal bisa dilaporkan;
+    # Any agar item yang bukan object (string, null) juga dilaporkan per posisi, bukan 422 satu batch
+    deals: List[Any]
+
+    @validator('deals')
+    def validate_batch_size(cls, v):
+        if not v:
+            raise ValueError("Daftar deals tidak boleh kosong")
+        if len(v) > MAX_BATCH_DEALS:
+            raise ValueError(f"Jumlah deals maksimal {MAX_BATCH_DEALS}, ditemukan {len(v)}")
+        return v
+
+@app.post("/recommend/batch")
+async def recommend_contract_batch(request: BatchRecommendRequest):
+    items = [None] * len(request.deals)
+    valid_indices = []
+    deals = []
+
+    # Validasi tiap deal; deal tidak valid dilaporkan tanpa menggagalkan batch
+    for i, deal in enumerate(request.deals):
+        if not isinstance(deal, dict):
+            items[i] = {"index": i, "error": "Deal harus berupa object dengan hand1 dan hand2"}
+            continue
+        try:
+            hand_request = BridgeHandRequest(**deal)
+        except (ValidationError, TypeError) as e:
+            items[i] = {"index": i, "error": str(e)}
+            continue
+        valid_indices.append(i)
+        deals.append((hand_request.hand1, hand_request.hand2))
+
+    try:
+        artifacts = registry.get()
+        keys = [deal_key(hand1, hand2) for hand1, hand2 in deals]
+        results = [recommend_cache.get(key, artifacts.version) for key in keys]
+
+        # Hanya deal yang belum ada di cache yang dikirim ke model
+        missing = [j for j, result in enumerate(results) if result is None]
+        if missing:
+            computed = await inference_pool.run(predict_contracts_batch, [deals[j] for j in missing], artifacts)
+            for j, result in zip(missing, computed):
+                results[j] = result
+                if 'error' not in result:
+                    recommend_cache.put(keys[j], result, artifacts.version)
+    except PoolFullError as e:
+        raise pool_full_exception(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    for i, result in zip(valid_indices, results):
+        if 'error' in result:
+            items[i] = {"index": i, "error": result['error']}
+        else:
+            items[i] = {"index": i, "result": format_contract_result(result)}
+
+    return {
+        "results": items,
+        "total": len(items),
+        "errors": sum(1 for item in items if "error" in item),
+    }
+
 # ======= Biding + Deteksi =======
-# Lokasi penyimpanan sementara gambar
-YOLO_INPUT_PATH = Path.cwd() / "running-yolo" / "images" / "in_biding" / "hand_image.jpg"
-# Lokasi biding.py
-SCRIPT_PATH = Path.cwd() / "running-yolo" / "biding.py"
+# Detektor YOLO dimuat sekali per worker dan dipanggil langsung tanpa subprocess.
+# DETECTOR = "stub" (atau env BRIDGE_DETECTOR=stub) memakai detektor palsu tanpa model,
+# misal untuk load test offline (benchmarks/loadtest.py)
+detector = create_detector(
+    os.environ.get("BRIDGE_DETECTOR") or getattr(config, "DETECTOR", "yolo"),
+    getattr(config, "YOLO_WEIGHTS_PATH", DEFAULT_WEIGHTS_PATH),
+    inference_delay=float(os.environ.get("BRIDGE_STUB_DETECTOR_DELAY") or getattr(config, "STUB_DETECTOR_DELAY", 0.0)),
+)
 
-print("Current Working Directory:", Path.cwd())
-print("YOLO Input Image Path:", YOLO_INPUT_PATH.resolve())
+@app.on_event("startup")
+def load_detector():
+    # Muat model YOLO saat startup agar upload pertama tidak menanggung cold start
+    if not getattr(config, "PRELOAD_DETECTOR", True):
+        return
+    try:
+        detector.load()
+    except Exception as e:
+        print(f"❌ Gagal memuat model YOLO: {str(e)}")
 
 @app.post("/upload/")
 async def upload_image(file: UploadFile = File(...)):
-    # Baca file dari request
-    contents = await file.read()
+    # Gambar diproses langsung dari memori; hasil hanya milik request ini
+    request_id = uuid.uuid4().hex
+    with span('upload_read'):
+        contents = await file.read()
+    if not contents:
+        return JSONResponse(status_code=400, content={"error": "File gambar kosong"})
 
-    # Pastikan folder images/ ada
-    YOLO_INPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    print(f"🔄 [{request_id}] Memulai proses deteksi...")
 
-    # Simpan file ke lokasi tetap
+    # Jalankan deteksi YOLO
     try:
-        with open(YOLO_INPUT_PATH, "wb") as f:
-            f.write(contents)
-        print(f"✅ Gambar berhasil disimpan di {YOLO_INPUT_PATH.resolve()}")
-    except Exception as e:
-        print(f"❌ Gagal menyimpan gambar: {str(e)}")
+        cards = await detection_pool.run(detector.detect_bytes, contents, BIDING_RANK_ORDER)
+        print(f"📋 [{request_id}] Kartu terdeteksi (diurutkan):", ', '.join(cards))
+    except PoolFullError as e:
+        print(f"❌ [{request_id}] {str(e)}")
         return JSONResponse(
-            status_code=500,
-            content={"error": f"Gagal menyimpan gambar: {str(e)}"}
+            status_code=503,
+            content={"error": str(e)},
+            headers={"Retry-After": "1"},
         )
-
-    print("🔄 Memulai proses deteksi...")
-
-    # Cek apakah script biding.py tersedia
-    if not SCRIPT_PATH.exists():
-        print(f"❌ File tidak ditemukan: {SCRIPT_PATH.resolve()}")
+    except ValueError as e:
+        print(f"❌ [{request_id}] {str(e)}")
         return JSONResponse(
-            status_code=500,
-            content={"error": f"File biding.py tidak ditemukan di {SCRIPT_PATH.resolve()}"}
-        )
-
-    # Jalankan biding.py
-    try:
-        result = subprocess.run(
-            ["python", str(SCRIPT_PATH)],
-            capture_output=True,
-            text=True,
-            check=True
+            status_code=400,
+            content={"error": f"Gagal membaca gambar: {str(e)}"}
         )
-        print("STDOUT:", result.stdout)
-        print("STDERR:", result.stderr)
-    except subprocess.CalledProcessError as e:
-        print("❌ Gagal menjalankan biding.py")
-        print("STDERR:", e.stderr)
+    except Exception as e:
+        print(f"❌ [{request_id}] Gagal menjalankan deteksi: {str(e)}")
         return JSONResponse(
             status_code=500,
             content={"error": "Gagal menjalankan deteksi YOLO"}
         )
 
-    # Baca hasil deteksi
-    output_json_path = Path.cwd() / "running-yolo" / "detected_cards.json"
-    if not output_json_path.exists():
-        return JSONResponse(status_code=500, content={"error": "File hasil deteksi tidak ditemukan"})
-
-    try:
-        with open(output_json_path, "r") as f:
-            detection_result = json.load(f)
-    except json.JSONDecodeError:
-        return JSONResponse(status_code=500, content={"error": "File JSON tidak valid"})
-
-    # Kembalikan hasil sebagai JSONResponse
     return {
         "message": "Deteksi selesai",
-        "cards": detection_result["detected_cards"]
+        "request_id": request_id,
+        "cards": cards
     }
 
 # ======= Kontrak + Deteksi =======
-# Folder penyimpanan sementara
-UPLOAD_FOLDER = Path.cwd() / "running-yolo" / "images" / "in_kontrak"
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-
-HAND1_PATH = UPLOAD_FOLDER / "hand1.jpg"
-HAND2_PATH = UPLOAD_FOLDER / "hand2.jpg"
-
-SCRIPT_PATH = Path.cwd() / "running-yolo" / "kontrak.py"
-
 @app.post("/upload_hand/")
 async def upload_hand(file: UploadFile = File(...), hand_number: str = Form('1')):
-    HAND_PATH = HAND1_PATH if hand_number == '1' else HAND2_PATH
-
-    try:
-        with open(HAND_PATH, "wb") as f:
-            f.write(await file.read())
-        print(f"✅ Gambar hand{hand_number} berhasil disimpan di {HAND_PATH}")
-    except Exception as e:
-        return JSONResponse(
-            status_code=500,
-            content={"error": f"Gagal menyimpan gambar: {str(e)}"},
-        )
+    # Gambar diproses langsung dari memori; hasil hanya milik request ini
+    request_id = uuid.uuid4().hex
+    with span('upload_read'):
+        contents = await file.read()
+    if not contents:
+        return JSONResponse(status_code=400, content={"error": "File gambar kosong"})
 
-    # Jalankan kontrak.py
-    print("🔄 Memulai proses deteksi...")
+    # Jalankan deteksi YOLO untuk hand yang diunggah
+    print(f"🔄 [{request_id}] Memulai proses deteksi hand{hand_number}...")
     try:
-        result = subprocess.run(
-            ["python", str(SCRIPT_PATH)],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        print("STDOUT:", result.stdout)
-        print("STDERR:", result.stderr)
-    except subprocess.CalledProcessError as e:
-        print("❌ Gagal menjalankan kontrak.py")
-        print("STDERR:", e.stderr)
+        cards = await detection_pool.run(detector.detect_bytes, contents, KONTRAK_RANK_ORDER)
+        print(f"✅ [{request_id}] Kartu terdeteksi (hand{hand_number}):", ', '.join(cards))
+    except PoolFullError as e:
+        print(f"❌ [{request_id}] {str(e)}")
         return JSONResponse(
-            status_code=500,
-            content={"error": "Gagal menjalankan deteksi YOLO"},
+            status_code=503,
+            content={"error": str(e)},
+            headers={"Retry-After": "1"},
         )
-
-    # Baca hasil deteksi
-    output_json_path = Path.cwd() / "running-yolo" / "detected_hands.json"
-    if not output_json_path.exists():
+    except ValueError as e:
+        print(f"❌ [{request_id}] {str(e)}")
         return JSONResponse(
-            status_code=500,
-            content={"error": "File hasil deteksi tidak ditemukan"},
+            status_code=400,
+            content={"error": f"Gagal membaca gambar: {str(e)}"},
         )
-
-    try:
-        with open(output_json_path, "r") as f:
-            detection_result = json.load(f)
-    except json.JSONDecodeError:
+    except Exception as e:
+        print(f"❌ [{request_id}] Gagal menjalankan deteksi: {str(e)}")
         return JSONResponse(
             status_code=500,
-            content={"error": "File JSON tidak valid"},
+            content={"error": "Gagal menjalankan deteksi YOLO"},
         )
 
-    cards_key = "hand1" if hand_number == "1" else "hand2"
-
     return {
         "message": "Deteksi selesai",
-        "cards": detection_result.get(cards_key, []),
+        "request_id": request_id,
+        "cards": cards,
     }
 
 if __name__ == "__main__":
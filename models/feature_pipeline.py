@@ -0,0 +1,70 @@
+import numpy as np
+
+
+class FeaturePipeline:
+    """
+    Normalisasi fitur yang digabung dengan urutan kolom model, dihitung sekali saat model dimuat.
+
+    Fitur mentah disusun dalam urutan selected_features (urutan yang dipakai aturan
+    optimizer), sedangkan StandardScaler dan Random Forest dilatih dengan urutan kolom
+    scaler.feature_names_in_. Permutasi, mean_, dan scale_ disimpan di sini sehingga
+    satu request cukup menghitung (raw[:, permutation] - mean) / scale sekali, dengan
+    hasil yang identik dengan scaler.transform pada DataFrame berkolom nama.
+    """
+
+    def __init__(self, selected_features, model_features, mean, scale):
+        self.selected_features = list(selected_features)
+        self.model_features = list(model_features)
+        missing = set(self.model_features) - set(self.selected_features)
+        if missing:
+            raise ValueError(f"Scaler features not in selected_features: {sorted(missing)}")
+        # Kolom ke-j input model = kolom permutation[j] dari vektor mentah
+        self.permutation = np.array([self.selected_features.index(f) for f in self.model_features], dtype=np.intp)
+        self.mean = np.asarray(mean, dtype=np.float64) if mean is not None else None
+        self.scale = np.asarray(scale, dtype=np.float64) if scale is not None else None
+        # Index fitur mentah yang dipakai langsung oleh aturan penalti optimizer
+        self.total_hcp_index = self.selected_features.index('total_hcp')
+        self.longest_suit_index = self.selected_features.index('longest_suit')
+
+    @classmethod
+    def from_scaler(cls, scaler, selected_features):
+        """Bangun pipeline dari StandardScaler yang sudah di-fit."""
+        model_features = getattr(scaler, 'feature_names_in_', None)
+        if model_features is None:
+            # Scaler tanpa nama kolom dilatih langsung dengan urutan selected_features
+            model_features = selected_features
+        mean = scaler.mean_ if scaler.with_mean else None
+        scale = scaler.scale_ if scaler.with_std else None
+        return cls(selected_features, list(model_features), mean, scale)
+
+    def raw_vector(self, hand_features):
+        """Vektor fitur mentah (urutan selected_features) dari dict hasil extract_comprehensive_features."""
+        return np.array([hand_features[f] for f in self.selected_features], dtype=np.float64)
+
+    def transform(self, raw):
+        """
+        Normalisasi fitur mentah ke input model.
+
+        Args:
+            raw: Array (n, len(selected_features)) atau (len(selected_features),) berurutan selected_features.
+
+        Returns:
+            np.ndarray: Fitur ternormalisasi dengan urutan kolom model_features.
+        """
+        scaled = np.asarray(raw, dtype=np.float64)[..., self.permutation]
+        if self.mean is not None:
+            scaled -= self.mean
+        if self.scale is not None:
+            scaled /= self.scale
+        return scaled
+
+    def inverse_transform(self, scaled):
+        """Kebalikan transform: input model (urutan model_features) ke fitur mentah urutan selected_features."""
+        model_raw = np.array(scaled, dtype=np.float64)
+        if self.scale is not None:
+            model_raw *= self.scale
+        if self.mean is not None:
+            model_raw += self.mean
+        raw = np.empty_like(model_raw)
+        raw[..., self.permutation] = model_raw
+        return raw
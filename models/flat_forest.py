@@ -0,0 +1,236 @@
+import os
+import sys
+import hashlib
+import logging
+import numpy as np
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+FLAT_SUFFIX = '.flat.npz'
+
+
+class FlatForest:
+    """
+    Random Forest yang diratakan menjadi array NumPy kontigu untuk inferensi cepat.
+
+    Semua node dari semua pohon digabung dalam satu array (feature, threshold,
+    left, right, value). Node daun menunjuk ke dirinya sendiri, sehingga traversal
+    cukup diulang max_depth kali untuk semua pohon dan semua baris sekaligus.
+
+    predict_proba meniru RandomForestClassifier.predict_proba langkah demi langkah
+    (input di-cast ke float32, probabilitas daun dijumlahkan per pohon secara
+    berurutan, lalu dibagi jumlah pohon) sehingga hasilnya identik bit-per-bit.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, classes, max_depth, n_features_in,
+                 source_digest=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.classes_ = classes
+        self.max_depth = int(max_depth)
+        self.n_features_in_ = int(n_features_in)
+        self.n_estimators = len(roots)
+        self.source_digest = source_digest
+
+    @classmethod
+    def from_sklearn(cls, forest, source_digest=None):
+        """
+        Ratakan RandomForestClassifier (single-output) yang sudah dilatih.
+
+        Raises:
+            ValueError: Jika model multi-output atau belum dilatih.
+        """
+        if not hasattr(forest, 'estimators_'):
+            raise ValueError("Forest has not been fitted")
+        if forest.n_outputs_ != 1:
+            raise ValueError("Only single-output forests are supported")
+
+        n_classes = len(forest.classes_)
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            nodes = np.arange(tree.node_count, dtype=np.intp)
+            is_leaf = tree.children_left == -1
+
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.intp))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+            lefts.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+            # Sama dengan DecisionTreeClassifier.predict_proba: nilai node apa adanya
+            values.append(tree.value[:, 0, :n_classes])
+            roots.append(offset)
+            offset += tree.node_count
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            value=np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+            roots=np.array(roots, dtype=np.intp),
+            classes=np.asarray(forest.classes_),
+            max_depth=max(estimator.tree_.max_depth for estimator in forest.estimators_),
+            n_features_in=forest.n_features_in_,
+            source_digest=source_digest,
+        )
+
+    def apply(self, X):
+        """Index node daun (global) per pohon dan baris, bentuk (n_estimators, n_samples)."""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected 2D input with {self.n_features_in_} features, got shape {X.shape}")
+        if not np.isfinite(X).all():
+            raise ValueError("Input contains NaN or infinity")
+
+        rows = np.arange(X.shape[0])
+        nodes = np.repeat(self.roots[:, None], X.shape[0], axis=1)
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict_proba(self, X):
+        """Probabilitas kelas, urutan kolom sesuai classes_."""
+        leaf_values = self.value[self.apply(X)]
+        proba = np.zeros(leaf_values.shape[1:], dtype=np.float64)
+        # Akumulasi berurutan per pohon, sama seperti ForestClassifier.predict_proba
+        for tree_proba in leaf_values:
+            proba += tree_proba
+        proba /= self.n_estimators
+        return proba
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def save(self, path):
+        """Simpan array forest ke file .npz."""
+        np.savez(
+            path,
+            feature=self.feature,
+            threshold=self.threshold,
+            left=self.left,
+            right=self.right,
+            value=self.value,
+            roots=self.roots,
+            classes=self.classes_,
+            max_depth=self.max_depth,
+            n_features_in=self.n_features_in_,
+            source_digest=self.source_digest or '',
+        )
+
+    @classmethod
+    def load(cls, path):
+        """Muat forest dari file .npz hasil save()."""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                feature=data['feature'],
+                threshold=data['threshold'],
+                left=data['left'],
+                right=data['right'],
+                value=data['value'],
+                roots=data['roots'],
+                classes=data['classes'],
+                max_depth=data['max_depth'],
+                n_features_in=data['n_features_in'],
+                source_digest=str(data['source_digest']) or None,
+            )
+
+
+def file_digest(path):
+    """sha256 isi file, dipakai untuk mencocokkan export dengan model .pkl sumbernya."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def flat_path(model_path):
+    """Lokasi export flat untuk model .pkl, misal rf_suit.pkl -> rf_suit.flat.npz."""
+    return os.path.splitext(model_path)[0] + FLAT_SUFFIX
+
+
+def export_forest(model_path, output_path=None):
+    """
+    Export model .pkl menjadi FlatForest .npz di sebelahnya.
+
+    Returns:
+        FlatForest: Forest hasil export.
+    """
+    import joblib
+
+    forest = joblib.load(model_path)
+    flat = FlatForest.from_sklearn(forest, source_digest=file_digest(model_path))
+    output_path = output_path or flat_path(model_path)
+    flat.save(output_path)
+    logger.info(f"Exported {model_path} ({flat.n_estimators} trees, {len(flat.feature)} nodes) to {output_path}")
+    return flat
+
+
+def load_flat_forest(model_path, forest):
+    """
+    Ambil FlatForest untuk model .pkl: pakai export .npz jika digest sumbernya cocok,
+    selain itu ratakan langsung dari forest yang sudah dimuat.
+    """
+    digest = file_digest(model_path)
+    path = flat_path(model_path)
+    if os.path.exists(path):
+        flat = FlatForest.load(path)
+        if flat.source_digest == digest:
+            return flat
+        logger.warning(f"{path} is stale for {model_path}, flattening in memory")
+    return FlatForest.from_sklearn(forest, source_digest=digest)
+
+
+def verify_flat_forest(forest, flat, X):
+    """
+    Bandingkan probabilitas sklearn dan FlatForest pada X.
+
+    Raises:
+        AssertionError: Jika ada satu nilai pun yang berbeda.
+    """
+    expected = forest.predict_proba(X)
+    actual = flat.predict_proba(X)
+    if not np.array_equal(expected, actual):
+        mismatched = int(np.sum(np.any(expected != actual, axis=1)))
+        raise AssertionError(f"FlatForest differs from sklearn on {mismatched} of {len(X)} rows")
+    assert np.array_equal(np.asarray(forest.classes_), flat.classes_)
+
+
+if __name__ == "__main__":
+    # Export kedua forest lalu verifikasi bit-per-bit terhadap X_test
+    #   python -m models.flat_forest
+    import time
+    import joblib
+    from models.registry import SAVED_DIR, PROCESSED_DIR
+    from utils.processed_io import load_features_frame
+
+    X_test = load_features_frame(PROCESSED_DIR, 'X_test')
+    for name in ('rf_suit', 'rf_category'):
+        model_path = os.path.join(SAVED_DIR, f'{name}.pkl')
+        forest = joblib.load(model_path)
+        flat = export_forest(model_path)
+        flat = FlatForest.load(flat_path(model_path))
+        try:
+            verify_flat_forest(forest, flat, X_test)
+        except AssertionError as e:
+            logger.error(f"{name}: {e}")
+            sys.exit(1)
+
+        row = X_test.iloc[[0]]
+        row_array = X_test.to_numpy()[:1]
+        n_calls = 200
+        start = time.perf_counter()
+        for _ in range(n_calls):
+            forest.predict_proba(row)
+        sklearn_us = (time.perf_counter() - start) / n_calls * 1e6
+        start = time.perf_counter()
+        for _ in range(n_calls):
+            flat.predict_proba(row_array)
+        flat_us = (time.perf_counter() - start) / n_calls * 1e6
+        print(f"{name}: identical on {len(X_test)} rows; single-row sklearn {sklearn_us:.0f} us, "
+              f"flat {flat_us:.0f} us ({sklearn_us / flat_us:.1f}x)")
@@ -1,95 +1,236 @@
-from pymoo.algorithms.moo.nsga2 import NSGA2
-from pymoo.core.problem import Problem
-from pymoo.optimize import minimize
+# pymoo hanya diimpor saat method='nsga2' dipakai (lihat solve_nsga2), agar serving
+# dengan optimizer exhaustive tidak menanggung biaya import-nya
+import time
+import functools
 import numpy as np
 import logging
 from utils.helpers import estimate_score_corrected, map_level_to_category
+from models.feature_pipeline import FeaturePipeline
+from utils.tracing import span, add_span, current_trace
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class BridgeContractProblem(Problem):
-    def __init__(self, rf_suit, rf_category, hand_features, scaler, selected_features):
-        super().__init__(n_var=2, n_obj=2, n_constr=0, xl=[0, 1], xu=[4, 7])
+class BridgeContractProblem:
+    # Ruang keputusan: suit 0..4 dan level 1..7, dua objektif (-score, risk)
+    n_var = 2
+    n_obj = 2
+    xl = [0, 1]
+    xu = [4, 7]
+
+    def __init__(self, rf_suit, rf_category, hand_features, scaler, selected_features, suit_proba=None, category_proba=None):
         self.rf_suit = rf_suit
         self.rf_category = rf_category
         self.scaler = scaler
         self.selected_features = selected_features
+        # Probabilitas yang sudah dihitung (misal dari prediksi batch) tidak perlu transform/predict ulang
+        precomputed = suit_proba is not None and category_proba is not None
         try:
-            self.hand_features = scaler.transform([hand_features])[0][[scaler.feature_names_in_.tolist().index(f) for f in selected_features]]
+            if precomputed:
+                self.hand_features = None
+            else:
+                # Normalisasi sekali dengan urutan kolom yang dipakai saat model dilatih
+                pipeline = FeaturePipeline.from_scaler(scaler, selected_features)
+                self.hand_features = pipeline.transform(np.asarray(hand_features, dtype=np.float64))
+            # Nilai mentah (sebelum normalisasi) untuk aturan penalti/bonus
+            self.total_hcp_raw = float(hand_features[selected_features.index('total_hcp')])
+            self.longest_suit = float(hand_features[selected_features.index('longest_suit')])
         except KeyError as e:
             logger.error(f"Feature not found in selected_features: {e}")
             raise
         except ValueError as e:
             logger.error(f"Invalid hand_features format: {e}")
             raise
+        # hand_features konstan untuk semua individu, jadi probabilitas RF cukup dihitung sekali
+        if precomputed:
+            self.suit_proba = np.asarray(suit_proba)
+            self.category_proba = np.asarray(category_proba)
+        else:
+            self.suit_proba = rf_suit.predict_proba(self.hand_features[np.newaxis])[0]
+            self.category_proba = rf_category.predict_proba(self.hand_features[np.newaxis])[0]
+        # Tabel skor dan kategori per (suit, level); kolom level 0 tidak dipakai
+        self.score_table = np.array([[estimate_score_corrected(suit, level) for level in range(8)] for suit in range(5)])
+        self.category_table = np.array([[map_level_to_category(level, suit) for level in range(8)] for suit in range(5)])
 
     def _evaluate(self, x, out, *args, **kwargs):
-        scores = []
-        risks = []
-        suit_names = {0: 'Spades', 1: 'Hearts', 2: 'Diamonds', 3: 'Clubs', 4: 'No Trump'}
-        
-        for contract in x:
-            try:
-                suit, level = int(contract[0]), int(contract[1])
-                score = estimate_score_corrected(suit, level)
-                suit_prob = self.rf_suit.predict_proba([self.hand_features])[0][suit]
-                category = map_level_to_category(level, suit)
-                category_prob = self.rf_category.predict_proba([self.hand_features])[0][category]
-                risk = 1 - (suit_prob * category_prob)
-                total_hcp_raw = self.scaler.inverse_transform([self.hand_features])[0][self.selected_features.index('total_hcp')]
-                longest_suit = self.hand_features[self.selected_features.index('longest_suit')]
-                # Penalti untuk slam dengan HCP rendah
-                if level >= 6 and total_hcp_raw < 30:
-                    risk += (30 - total_hcp_raw) * 0.01
-                # Penalti untuk suit contract dengan panjang suit pendek
-                if suit in [0, 1, 2, 3] and longest_suit < 8:
-                    risk += 0.1
-                # Bonus untuk suit sangat panjang
-                if suit in [0, 1, 2, 3] and longest_suit >= 10:
-                    risk = max(0, risk - 0.25)  # Kuat untuk 13 clubs
-                # Bonus untuk NT pada HCP sangat tinggi
-                if suit == 4 and total_hcp_raw >= 33 and level >= 6:
-                    risk = max(0, risk - 0.2)  # Dorong 7NT
-                # Fallback untuk probabilitas rendah
-                if category_prob < 0.2 and level >= 6 and total_hcp_raw >= 30:
-                    risk = max(0, risk - 0.15)  # Kurangi risiko untuk slam
-                scores.append(score)
-                risks.append(risk)
-            except IndexError as e:
-                logger.error(f"Invalid suit or category index: {e}")
-                raise
-            except KeyError as e:
-                logger.error(f"Feature not found: {e}")
-                raise
+        try:
+            contracts = np.asarray(x).astype(int)
+            suits, levels = contracts[:, 0], contracts[:, 1]
+            scores = self.score_table[suits, levels]
+            categories = self.category_table[suits, levels]
+            suit_prob = self.suit_proba[suits]
+            category_prob = self.category_proba[categories]
+        except IndexError as e:
+            logger.error(f"Invalid suit or category index: {e}")
+            raise
+
+        risks = 1 - (suit_prob * category_prob)
+        is_suit_contract = suits != 4
+        is_slam = levels >= 6
+        # Penalti untuk slam dengan HCP rendah
+        if self.total_hcp_raw < 30:
+            risks = np.where(is_slam, risks + (30 - self.total_hcp_raw) * 0.01, risks)
+        # Penalti untuk suit contract dengan panjang suit pendek
+        if self.longest_suit < 8:
+            risks = np.where(is_suit_contract, risks + 0.1, risks)
+        # Bonus untuk suit sangat panjang
+        if self.longest_suit >= 10:
+            risks = np.where(is_suit_contract, np.maximum(0, risks - 0.25), risks)  # Kuat untuk 13 clubs
+        # Bonus untuk NT pada HCP sangat tinggi
+        if self.total_hcp_raw >= 33:
+            risks = np.where(~is_suit_contract & is_slam, np.maximum(0, risks - 0.2), risks)  # Dorong 7NT
+        # Fallback untuk probabilitas rendah
+        if self.total_hcp_raw >= 30:
+            risks = np.where((category_prob < 0.2) & is_slam, np.maximum(0, risks - 0.15), risks)  # Kurangi risiko untuk slam
         
-        out["F"] = np.column_stack([-np.array(scores), np.array(risks)])
+        out["F"] = np.column_stack([-scores, risks])
+
+SUIT_NAMES = {0: 'Spades', 1: 'Hearts', 2: 'Diamonds', 3: 'Clubs', 4: 'No Trump'}
+# Kedua mode harus memilih kontrak yang sama; dicek oleh
+# python -m benchmarks.check_optimizer_equivalence (jalankan setelah mengubah optimizer/model)
+OPTIMIZER_METHODS = ('exhaustive', 'nsga2')
+
+def enumerate_contracts():
+    """Semua kontrak yang mungkin: 5 suit x 7 level = 35 baris (suit, level)."""
+    suits, levels = np.meshgrid(np.arange(5), np.arange(1, 8), indexing='ij')
+    return np.column_stack([suits.ravel(), levels.ravel()])
+
+def pareto_front_mask(F):
+    """
+    Tandai baris F yang tidak didominasi (semua objektif diminimalkan).
+    
+    Args:
+        F: Array (n, n_obj) nilai objektif
+    
+    Returns:
+        Array boolean (n,), True untuk anggota Pareto front
+    """
+    # dominates[j, i]: j tidak lebih buruk di semua objektif dan lebih baik di salah satunya
+    not_worse = np.all(F[:, None, :] <= F[None, :, :], axis=2)
+    better = np.any(F[:, None, :] < F[None, :, :], axis=2)
+    dominated = np.any(not_worse & better, axis=0)
+    return ~dominated
+
+def solve_exhaustive(problem):
+    """
+    Evaluasi seluruh 35 kontrak dalam satu panggilan _evaluate dan kembalikan
+    Pareto front yang sebenarnya.
+    
+    Returns:
+        X, F: Kontrak (suit, level) dan objektif (-score, risk) anggota Pareto front
+    """
+    X = enumerate_contracts()
+    out = {}
+    with span('optimizer.exhaustive_evaluate'):
+        problem._evaluate(X, out)
+    F = out["F"]
+    mask = pareto_front_mask(F)
+    return X[mask], F[mask]
+
+@functools.lru_cache(maxsize=None)
+def pymoo_problem_class():
+    """Subclass pymoo Problem yang membungkus BridgeContractProblem; dibuat saat pertama dipakai."""
+    from pymoo.core.problem import Problem
+
+    class PymooContractProblem(Problem):
+        def __init__(self, problem):
+            super().__init__(n_var=problem.n_var, n_obj=problem.n_obj, n_constr=0, xl=problem.xl, xu=problem.xu,
+                             vtype=int)
+            self.problem = problem
+
+        def _evaluate(self, x, out, *args, **kwargs):
+            self.problem._evaluate(x, out, *args, **kwargs)
+
+    return PymooContractProblem
+
+
+class GenerationSpans:
+    """Callback pymoo yang mencatat satu span tracing per batch generasi NSGA-II."""
+
+    def __init__(self, batch=10):
+        self.batch = batch
+        self.first_gen = 1
+        self.start = time.perf_counter()
+
+    def __call__(self, algorithm):
+        if algorithm.n_gen - self.first_gen + 1 >= self.batch:
+            self.flush(algorithm.n_gen)
+
+    def flush(self, last_gen):
+        if last_gen < self.first_gen:
+            return
+        end = time.perf_counter()
+        add_span('nsga2.generations', self.start, end, first_gen=self.first_gen, last_gen=last_gen)
+        self.first_gen = last_gen + 1
+        self.start = end
+
+
+def solve_nsga2(problem, pop_size=100, n_gen=50, seed=42):
+    """
+    Jalankan NSGA-II dan kembalikan (X, F) Pareto front hasil akhir.
+
+    Ruang keputusan diskret, jadi variabel diperlakukan sebagai integer: sampling integer,
+    crossover dan mutasi dibulatkan (RoundingRepair), dan individu duplikat dibuang. Dengan
+    variabel kontinu yang dipotong ke int, suit 4 (NT) dan level 7 hanya tercapai tepat di
+    batas atas sehingga front sering tidak lengkap.
+    """
+    from pymoo.algorithms.moo.nsga2 import NSGA2
+    from pymoo.operators.sampling.rnd import IntegerRandomSampling
+    from pymoo.operators.crossover.sbx import SBX
+    from pymoo.operators.mutation.pm import PM
+    from pymoo.operators.repair.rounding import RoundingRepair
+    from pymoo.optimize import minimize
+    algorithm = NSGA2(
+        pop_size=pop_size,
+        n_gen=n_gen,
+        sampling=IntegerRandomSampling(),
+        crossover=SBX(prob=1.0, eta=3.0, vtype=float, repair=RoundingRepair()),
+        mutation=PM(prob=1.0, eta=3.0, vtype=float, repair=RoundingRepair()),
+        eliminate_duplicates=True,
+    )
+    # Callback hanya dipasang jika request ini sedang di-trace
+    if current_trace() is None:
+        res = minimize(pymoo_problem_class()(problem), algorithm, ('n_gen', n_gen), seed=seed)
+    else:
+        callback = GenerationSpans()
+        res = minimize(pymoo_problem_class()(problem), algorithm, ('n_gen', n_gen), seed=seed, callback=callback)
+        callback.flush(n_gen)
+    return np.asarray(res.X).astype(int), res.F
 
-def optimize_contract(rf_suit, rf_category, hand_features, scaler, selected_features):
+def optimize_contract(rf_suit, rf_category, hand_features, scaler, selected_features, method='exhaustive',
+                      suit_proba=None, category_proba=None):
     """
-    Jalankan optimasi NSGA-II untuk menemukan kontrak optimal.
+    Jalankan optimasi multi-objektif untuk menemukan kontrak optimal.
     
     Args:
         rf_suit, rf_category: Model Random Forest yang dilatih
         hand_features: Fitur tangan (sebelum normalisasi)
         scaler: Objek StandardScaler
         selected_features: Daftar fitur yang digunakan
+        method: 'exhaustive' mengevaluasi seluruh 35 kontrak dan menghitung Pareto front
+            yang eksak; 'nsga2' menjalankan NSGA-II (pop_size=100, 50 generasi)
+        suit_proba, category_proba: Probabilitas RF yang sudah dihitung untuk tangan ini
+            (opsional); jika diberikan, model tidak dipanggil lagi
     
     Returns:
         best_contract: Kontrak optimal (suit, level)
         confidence: Skor kepercayaan untuk kontrak terpilih
     """
     try:
-        problem = BridgeContractProblem(rf_suit, rf_category, hand_features, scaler, selected_features)
-        algorithm = NSGA2(pop_size=100, n_gen=50)
-        res = minimize(problem, algorithm, ('n_gen', 50), seed=42)
+        if method not in OPTIMIZER_METHODS:
+            raise ValueError(f"Unknown optimizer method '{method}', expected one of {OPTIMIZER_METHODS}")
+        problem = BridgeContractProblem(rf_suit, rf_category, hand_features, scaler, selected_features,
+                                        suit_proba=suit_proba, category_proba=category_proba)
+        if method == 'nsga2':
+            pareto_X, pareto_F = solve_nsga2(problem)
+        else:
+            pareto_X, pareto_F = solve_exhaustive(problem)
         # Format Pareto front untuk logging
-        suit_names = {0: 'Spades', 1: 'Hearts', 2: 'Diamonds', 3: 'Clubs', 4: 'No Trump'}
-        pareto_contracts = [(int(x[0]), int(x[1])) for x in res.X]
-        pareto_formatted = [f"{level}{suit_names[suit]}" for suit, level in pareto_contracts]
-        pareto_scores = res.F[:, 0]
-        pareto_risks = res.F[:, 1]
+        pareto_contracts = [(int(x[0]), int(x[1])) for x in pareto_X]
+        pareto_formatted = [f"{level}{SUIT_NAMES[suit]}" for suit, level in pareto_contracts]
+        pareto_scores = pareto_F[:, 0]
+        pareto_risks = pareto_F[:, 1]
         # Filter Pareto front untuk risiko < 0.9
         valid_indices = [i for i, r in enumerate(pareto_risks) if r < 0.9]
         if not valid_indices:
@@ -97,27 +238,26 @@ def optimize_contract(rf_suit, rf_category, hand_features, scaler, selected_feat
         # Truncate Pareto front untuk display
         display_limit = 3
         pareto_display = pareto_formatted[:display_limit] + ['...'] if len(pareto_formatted) > display_limit else pareto_formatted
-        objectives_display = res.F[:display_limit].tolist() + ['...'] if len(res.F) > display_limit else res.F.tolist()
+        objectives_display = pareto_F[:display_limit].tolist() + ['...'] if len(pareto_F) > display_limit else pareto_F.tolist()
         logger.info(f"Pareto front contracts: {pareto_display}")
         logger.info(f"Pareto front objectives (score, risk): {objectives_display}")
         # Pilih kontrak dengan keseimbangan skor dan risiko
-        total_hcp_raw = scaler.inverse_transform([problem.hand_features])[0][selected_features.index('total_hcp')]
-        score_weight = 0.7 if total_hcp_raw >= 25 else 0.3  # Prioritaskan risiko untuk HCP rendah
+        score_weight = 0.7 if problem.total_hcp_raw >= 25 else 0.3  # Prioritaskan risiko untuk HCP rendah
         risk_weight = 1 - score_weight
         weights = np.array([score_weight, risk_weight])
-        normalized_scores = (res.F[valid_indices, 0] - res.F[valid_indices, 0].min()) / (res.F[valid_indices, 0].max() - res.F[valid_indices, 0].min() + 1e-10)
-        normalized_risks = (res.F[valid_indices, 1] - res.F[valid_indices, 1].min()) / (res.F[valid_indices, 1].max() - res.F[valid_indices, 1].min() + 1e-10)
+        normalized_scores = (pareto_F[valid_indices, 0] - pareto_F[valid_indices, 0].min()) / (pareto_F[valid_indices, 0].max() - pareto_F[valid_indices, 0].min() + 1e-10)
+        normalized_risks = (pareto_F[valid_indices, 1] - pareto_F[valid_indices, 1].min()) / (pareto_F[valid_indices, 1].max() - pareto_F[valid_indices, 1].min() + 1e-10)
         weighted_scores = weights[0] * normalized_scores + weights[1] * normalized_risks
         best_idx = valid_indices[np.argmin(weighted_scores)]
-        best_contract = res.X[best_idx]
+        best_contract = pareto_X[best_idx]
         # Hitung confidence untuk kontrak terpilih
         suit, level = int(best_contract[0]), int(best_contract[1])
-        suit_prob = rf_suit.predict_proba([problem.hand_features])[0][suit]
+        suit_prob = problem.suit_proba[suit]
         category = map_level_to_category(level, suit)
-        category_prob = rf_category.predict_proba([problem.hand_features])[0][category]
+        category_prob = problem.category_proba[category]
         confidence = suit_prob * category_prob * 100
         logger.info(f"Selected contract suit_prob: {suit_prob:.3f}, category_prob: {category_prob:.3f}, confidence: {confidence:.1f}%")
         return best_contract, confidence
     except Exception as e:
         logger.error(f"Optimization failed: {e}")
-        raise
\ No newline at end of file
+        raise
@@ -0,0 +1,247 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+import joblib
+from models.flat_forest import load_flat_forest, flat_path
+from models.feature_pipeline import FeaturePipeline
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAVED_DIR = os.path.join(BASE_DIR, 'models/saved')
+PROCESSED_DIR = os.path.join(BASE_DIR, 'data/processed')
+
+
+class ModelArtifacts:
+    """
+    Snapshot artefak model yang sudah dimuat. Objek ini tidak diubah setelah
+    dibuat, sehingga aman dibagi antar request; reload membuat snapshot baru.
+    """
+
+    def __init__(self, rf_suit, rf_category, scaler, selected_features, version, loaded_at, load_seconds,
+                 flat_suit=None, flat_category=None, pipeline=None):
+        self.rf_suit = rf_suit
+        self.rf_category = rf_category
+        # Versi FlatForest dari kedua model untuk inferensi; hasilnya identik dengan sklearn
+        self.flat_suit = flat_suit
+        self.flat_category = flat_category
+        # Permutasi kolom dan parameter scaler, dihitung sekali per load
+        self.pipeline = pipeline
+        self.scaler = scaler
+        self.selected_features = selected_features
+        self.version = version
+        self.loaded_at = loaded_at
+        self.load_seconds = load_seconds
+
+
+class ModelRegistry:
+    """
+    Registry model tingkat proses: memuat rf_suit, rf_category, scaler, dan
+    selected_features sekali, lalu membagikannya ke semua request.
+
+    Perubahan file di disk (termasuk export FlatForest .npz) dideteksi lewat (mtime, size)
+    oleh thread watcher (start_watcher) setiap check_interval detik. Jika berubah, artefak
+    dimuat ulang di thread tersebut ke snapshot baru dan ditukar secara atomik; get() hanya
+    mengembalikan snapshot aktif sehingga request tidak pernah menanggung biaya reload.
+    """
+
+    def __init__(self, saved_dir=SAVED_DIR, processed_dir=PROCESSED_DIR, check_interval=5.0):
+        self.paths = {
+            'rf_suit': os.path.join(saved_dir, 'rf_suit.pkl'),
+            'rf_category': os.path.join(saved_dir, 'rf_category.pkl'),
+            'scaler': os.path.join(processed_dir, 'scaler.pkl'),
+            'selected_features': os.path.join(processed_dir, 'selected_features.json'),
+        }
+        # Export .npz opsional: jika tidak ada, forest diratakan langsung saat load
+        self.flat_paths = {
+            'flat_suit': flat_path(self.paths['rf_suit']),
+            'flat_category': flat_path(self.paths['rf_category']),
+        }
+        self.check_interval = check_interval
+        self._artifacts = None
+        self._fingerprint = None
+        self._last_check = 0.0
+        self._last_error = None
+        self._reload_count = 0
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+
+    def _file_fingerprint(self):
+        """Ambil (mtime_ns, size) semua file artefak; None untuk export .npz yang tidak ada."""
+        required = tuple(
+            (os.stat(path).st_mtime_ns, os.stat(path).st_size)
+            for path in self.paths.values()
+        )
+        optional = tuple(
+            (os.stat(path).st_mtime_ns, os.stat(path).st_size) if os.path.exists(path) else None
+            for path in self.flat_paths.values()
+        )
+        return required + optional
+
+    def _load_artifacts(self):
+        """Muat semua artefak dari disk dan bangun snapshot baru."""
+        start = time.perf_counter()
+        digest = hashlib.sha256()
+        for path in self.paths.values():
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+
+        rf_suit = joblib.load(self.paths['rf_suit'])
+        rf_category = joblib.load(self.paths['rf_category'])
+        flat_suit = load_flat_forest(self.paths['rf_suit'], rf_suit)
+        flat_category = load_flat_forest(self.paths['rf_category'], rf_category)
+        scaler = joblib.load(self.paths['scaler'])
+        with open(self.paths['selected_features'], 'r') as f:
+            selected_features = json.load(f)
+        pipeline = FeaturePipeline.from_scaler(scaler, selected_features)
+
+        return ModelArtifacts(
+            rf_suit=rf_suit,
+            rf_category=rf_category,
+            flat_suit=flat_suit,
+            flat_category=flat_category,
+            scaler=scaler,
+            selected_features=selected_features,
+            pipeline=pipeline,
+            version=digest.hexdigest()[:12],
+            loaded_at=time.time(),
+            load_seconds=time.perf_counter() - start,
+        )
+
+    def load(self):
+        """
+        Muat (ulang) artefak dan tukar snapshot aktif.
+
+        Returns:
+            ModelArtifacts: Snapshot yang baru aktif.
+
+        Raises:
+            FileNotFoundError: Jika salah satu file artefak tidak ditemukan.
+        """
+        with self._lock:
+            return self._load_locked()
+
+    def _load_locked(self):
+        try:
+            fingerprint = self._file_fingerprint()
+            artifacts = self._load_artifacts()
+        except FileNotFoundError as e:
+            logger.error(f"Required file not found: {e}")
+            self._last_error = str(e)
+            raise
+        except Exception as e:
+            logger.error(f"Failed to load model artifacts: {e}")
+            self._last_error = str(e)
+            raise
+
+        if self._artifacts is not None:
+            self._reload_count += 1
+        self._artifacts = artifacts
+        self._fingerprint = fingerprint
+        self._last_check = time.monotonic()
+        self._last_error = None
+        logger.info(f"Loaded model artifacts version {artifacts.version} in {artifacts.load_seconds:.3f}s")
+        return artifacts
+
+    def reload_if_changed(self):
+        """
+        Muat ulang artefak jika file di disk berubah sejak load terakhir.
+
+        Jika reload gagal (misal file sedang ditulis), snapshot lama tetap dipakai.
+
+        Returns:
+            bool: True jika snapshot baru dimuat.
+        """
+        # Request lain yang datang saat reload berjalan tetap memakai snapshot lama
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self._last_check = time.monotonic()
+            try:
+                fingerprint = self._file_fingerprint()
+            except FileNotFoundError as e:
+                logger.warning(f"Model artifact missing, keeping version {self.version}: {e}")
+                self._last_error = str(e)
+                return False
+            if fingerprint == self._fingerprint:
+                return False
+
+            logger.info("Model artifacts changed on disk, reloading")
+            try:
+                self._load_locked()
+            except Exception:
+                return False
+            return True
+        finally:
+            self._lock.release()
+
+    def get(self):
+        """
+        Ambil snapshot artefak aktif, memuatnya saat pemanggilan pertama.
+
+        Tidak memeriksa perubahan file; itu tugas thread watcher (start_watcher).
+
+        Returns:
+            ModelArtifacts: Snapshot yang sedang aktif.
+        """
+        artifacts = self._artifacts
+        if artifacts is None:
+            with self._lock:
+                if self._artifacts is None:
+                    return self._load_locked()
+                return self._artifacts
+        return artifacts
+
+    def start_watcher(self):
+        """Jalankan thread daemon yang memanggil reload_if_changed setiap check_interval detik."""
+        if self.check_interval is None or (self._watcher is not None and self._watcher.is_alive()):
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, name='model-registry-watcher', daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self, timeout=5.0):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout)
+            self._watcher = None
+
+    def _watch(self):
+        while not self._stop.wait(self.check_interval):
+            if self._artifacts is None:
+                # Load awal gagal (misal model belum dilatih): coba lagi di thread ini
+                try:
+                    self.load()
+                except Exception:
+                    pass
+            else:
+                self.reload_if_changed()
+
+    @property
+    def version(self):
+        return self._artifacts.version if self._artifacts is not None else None
+
+    def status(self):
+        """Ringkasan status registry untuk endpoint monitoring."""
+        artifacts = self._artifacts
+        return {
+            'loaded': artifacts is not None,
+            'version': artifacts.version if artifacts else None,
+            'loaded_at': artifacts.loaded_at if artifacts else None,
+            'load_seconds': round(artifacts.load_seconds, 4) if artifacts else None,
+            'reload_count': self._reload_count,
+            'check_interval': self.check_interval,
+            'watching': self._watcher is not None and self._watcher.is_alive(),
+            'last_error': self._last_error,
+            'files': dict(self.paths, **self.flat_paths),
+        }
+
+
+# Registry bersama untuk seluruh proses
+registry = ModelRegistry()
@@ -1,33 +1,155 @@
+# bid_snapper_backend/models/train_model.py
+#
+# Latih Random Forest suit dan kategori dari data/processed lalu simpan ke models/saved.
+#
+#   python -m models.train_model [--n-jobs -1] [--warm-start] [--add-estimators 50]
+#   python models/train_model.py ...   # juga bisa, root repo ditambahkan ke sys.path
+
+import os
+import sys
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import precision_recall_fscore_support, confusion_matrix
-import os
+import time
+import json
 import joblib
 import logging
+import argparse
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+# Dijalankan langsung sebagai script (python models/train_model.py): sys.path[0] berisi
+# models/, sehingga paket utils dan models dari root repo perlu ditambahkan
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.processed_io import load_features_frame, load_labels
+from models.flat_forest import export_forest, file_digest
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def train_random_forest(X_train, X_test, y_suit_train, y_suit_test, y_category_train, y_category_test, saved_dir):
+# Hyperparameter Random Forest untuk kedua model
+RF_PARAMS = {'n_estimators': 100, 'random_state': 42, 'max_depth': 10}
+
+# Metadata training di sebelah model: digest scaler.pkl yang dipakai menskalakan data training
+TRAINING_META = 'training_meta.json'
+
+@contextmanager
+def stage_timer(stage, timings):
+    """Catat wall time satu tahap pelatihan ke dict timings dan log."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = time.perf_counter() - start
+        logger.info(f"Stage '{stage}' took {timings[stage]:.2f}s")
+
+def split_n_jobs(n_jobs, n_models=2):
+    """
+    Bagi n_jobs total ke beberapa model yang dilatih bersamaan.
+    
+    None berarti 1 core per model (perilaku default sklearn); nilai negatif mengikuti
+    konvensi joblib (-1 = semua core).
+    """
+    if n_jobs is None:
+        return None
+    cpu_count = os.cpu_count() or 1
+    total = cpu_count + 1 + n_jobs if n_jobs < 0 else n_jobs
+    return max(1, total // n_models)
+
+def grow_forest(model, X, y, add_estimators):
+    """
+    Tambah add_estimators pohon baru ke forest yang sudah dilatih (warm start).
+    
+    Pohon lama dipertahankan; pohon baru hanya dilatih pada X, y.
+    
+    Raises:
+        ValueError: Jika kelas pada y berbeda dengan kelas model.
+    """
+    if add_estimators <= 0:
+        raise ValueError("add_estimators must be positive")
+    if not np.array_equal(np.unique(y), model.classes_):
+        raise ValueError(f"Warm start needs the same classes {model.classes_.tolist()}, got {np.unique(y).tolist()}")
+    model.set_params(warm_start=True, n_estimators=model.n_estimators + add_estimators)
+    model.fit(X, y)
+    model.set_params(warm_start=False)
+    return model
+
+def save_training_meta(saved_dir, scaler_path):
+    """Catat digest scaler yang dipakai untuk data training model di saved_dir."""
+    with open(os.path.join(saved_dir, TRAINING_META), 'w') as f:
+        json.dump({'scaler_digest': file_digest(scaler_path)}, f)
+
+def check_warm_start_scaler(saved_dir, scaler_path):
+    """
+    Pastikan data untuk warm start diskalakan dengan scaler yang sama seperti pohon lama.
+    
+    Preprocessing ulang melatih ulang scaler.pkl; pohon baru yang dilatih pada skala
+    baru tidak cocok dengan threshold pohon lama, dan serving memakai satu scaler untuk
+    semua pohon. Karena itu warm start ditolak jika digest scaler berubah atau tidak tercatat.
+    
+    Raises:
+        ValueError: Jika digest scaler tidak tercatat atau berbeda.
+    """
+    meta_path = os.path.join(saved_dir, TRAINING_META)
+    if not os.path.exists(meta_path):
+        raise ValueError(f"Warm start needs {meta_path} to verify the scaler; train from scratch once first")
+    with open(meta_path, 'r') as f:
+        expected = json.load(f).get('scaler_digest')
+    actual = file_digest(scaler_path)
+    if actual != expected:
+        raise ValueError(f"Scaler {scaler_path} changed since the saved models were trained "
+                         f"(digest {actual[:12]} != {str(expected)[:12]}); "
+                         "restore the old scaler.pkl or train from scratch")
+
+def fit_models_concurrently(jobs):
+    """
+    Latih beberapa model bersamaan dalam thread terpisah.
+    
+    Pembangunan pohon sklearn melepas GIL, sehingga kedua forest benar-benar
+    berjalan paralel dan masing-masing tetap memakai n_jobs-nya sendiri.
+    
+    Args:
+        jobs (dict): Nama -> callable tanpa argumen yang mengembalikan model terlatih.
+    
+    Returns:
+        dict: Nama -> model terlatih.
+    """
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        futures = {name: executor.submit(fn) for name, fn in jobs.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+def train_random_forest(X_train, X_test, y_suit_train, y_suit_test, y_category_train, y_category_test, saved_dir,
+                        n_jobs=None, warm_start=False, add_estimators=50, scaler_path=None):
     """
-    Latih model Random Forest untuk suit dan kategori, lalu simpan model.
+    Latih model Random Forest untuk suit dan kategori secara bersamaan, lalu simpan model.
     
     Args:
         X_train, X_test: Data fitur yang telah dinormalisasi
         y_suit_train, y_suit_test: Target untuk suit
         y_category_train, y_category_test: Target untuk kategori
         saved_dir (str): Direktori untuk menyimpan model
+        n_jobs (int, optional): Total core untuk pelatihan, dibagi rata ke kedua model
+            (-1 = semua core). Default None: 1 core per model.
+        warm_start (bool): Jika True, muat model yang sudah ada di saved_dir dan tambahkan
+            add_estimators pohon baru yang dilatih pada X_train, tanpa melatih ulang dari awal.
+        add_estimators (int): Jumlah pohon baru per model saat warm_start.
+        scaler_path (str, optional): scaler.pkl yang menskalakan X_train/X_test. Digest-nya
+            dicatat bersama model, dan warm start ditolak jika scaler sudah berubah.
     
     Returns:
         rf_suit, rf_category: Model Random Forest yang dilatih
     
     Raises:
-        ValueError: Jika data masukan tidak valid
+        ValueError: Jika data masukan tidak valid, atau warm start dengan scaler yang berubah
+        FileNotFoundError: Jika warm_start dan model lama tidak ditemukan
         PermissionError: Jika tidak dapat menulis ke direktori
     """
     logger.info("Starting Random Forest training")
+    timings = {}
     
     # Validasi data masukan
     if X_train.empty or X_test.empty:
@@ -51,20 +173,44 @@ def train_random_forest(X_train, X_test, y_suit_train, y_suit_test, y_category_t
     logger.info(f"Unique suit classes in y_suit_train: {np.unique(y_suit_train)}")
     logger.info(f"Unique category classes in y_category_train: {np.unique(y_category_train)}")
     
-    # Model untuk suit
-    logger.info("Training Random Forest for suit...")
-    rf_suit = RandomForestClassifier(n_estimators=100, random_state=42, max_depth=10)
-    rf_suit.fit(X_train, y_suit_train)
+    model_jobs = split_n_jobs(n_jobs)
+    suit_path = os.path.join(saved_dir, 'rf_suit.pkl')
+    category_path = os.path.join(saved_dir, 'rf_category.pkl')
     
-    # Model untuk kategori
-    logger.info("Training Random Forest for category...")
-    rf_category = RandomForestClassifier(n_estimators=100, random_state=42, max_depth=10)
-    rf_category.fit(X_train, y_category_train)
+    if warm_start:
+        # Tambah pohon ke model yang sudah ada; scaler harus sama dengan saat pohon lama dilatih
+        if scaler_path is None:
+            raise ValueError("Warm start needs scaler_path to verify the scaler")
+        check_warm_start_scaler(saved_dir, scaler_path)
+        with stage_timer('load', timings):
+            rf_suit = joblib.load(suit_path)
+            rf_category = joblib.load(category_path)
+            rf_suit.set_params(n_jobs=model_jobs)
+            rf_category.set_params(n_jobs=model_jobs)
+        logger.info(f"Growing both forests by {add_estimators} trees "
+                    f"(suit: {rf_suit.n_estimators}, category: {rf_category.n_estimators})")
+        with stage_timer('fit', timings):
+            models = fit_models_concurrently({
+                'suit': lambda: grow_forest(rf_suit, X_train, y_suit_train, add_estimators),
+                'category': lambda: grow_forest(rf_category, X_train, y_category_train, add_estimators),
+            })
+    else:
+        # Model suit dan kategori dilatih bersamaan
+        logger.info(f"Training Random Forests for suit and category concurrently (n_jobs per model: {model_jobs})")
+        rf_suit = RandomForestClassifier(n_jobs=model_jobs, **RF_PARAMS)
+        rf_category = RandomForestClassifier(n_jobs=model_jobs, **RF_PARAMS)
+        with stage_timer('fit', timings):
+            models = fit_models_concurrently({
+                'suit': lambda: rf_suit.fit(X_train, y_suit_train),
+                'category': lambda: rf_category.fit(X_train, y_category_train),
+            })
+    rf_suit, rf_category = models['suit'], models['category']
     
     # Evaluasi
     logger.info("Evaluating models...")
-    suit_pred = rf_suit.predict(X_test)
-    category_pred = rf_category.predict(X_test)
+    with stage_timer('predict', timings):
+        suit_pred = rf_suit.predict(X_test)
+        category_pred = rf_category.predict(X_test)
     
     # Log unique predicted classes
     logger.info(f"Unique suit classes in suit_pred: {np.unique(suit_pred)}")
@@ -88,19 +234,35 @@ def train_random_forest(X_train, X_test, y_suit_train, y_suit_test, y_category_t
     cp_accuracy = np.mean((suit_pred == y_suit_test) & (category_pred == y_category_test))
     logger.info(f"SS Accuracy: {ss_accuracy:.3f}, SC Accuracy: {sc_accuracy:.3f}, CP Accuracy: {cp_accuracy:.3f}")
     
-    # Simpan model
+    # Simpan model; n_jobs direset agar model yang disimpan tidak membawa setting mesin training
     try:
         os.makedirs(saved_dir, exist_ok=True)
-        joblib.dump(rf_suit, os.path.join(saved_dir, 'rf_suit.pkl'))
-        joblib.dump(rf_category, os.path.join(saved_dir, 'rf_category.pkl'))
+        with stage_timer('save', timings):
+            for model in (rf_suit, rf_category):
+                model.set_params(n_jobs=None)
+            joblib.dump(rf_suit, suit_path)
+            joblib.dump(rf_category, category_path)
+            if scaler_path is not None:
+                save_training_meta(saved_dir, scaler_path)
+        # Export FlatForest .npz untuk inferensi cepat di registry
+        with stage_timer('export', timings):
+            export_forest(suit_path)
+            export_forest(category_path)
         logger.info(f"Models saved to {saved_dir}")
     except PermissionError:
         logger.error(f"Cannot write to directory {saved_dir}")
         raise
     
+    logger.info("Stage timings: " + ", ".join(f"{stage}={seconds:.2f}s" for stage, seconds in timings.items()))
     return rf_suit, rf_category
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the suit and category Random Forests")
+    parser.add_argument('--n-jobs', type=int, default=-1, help="Total cores for training, split across both models (-1 = all)")
+    parser.add_argument('--warm-start', action='store_true', help="Grow the saved models instead of training from scratch")
+    parser.add_argument('--add-estimators', type=int, default=50, help="Trees added per model with --warm-start")
+    args = parser.parse_args()
+    
     # Konfigurasi untuk pengujian langsung
     base_dir = os.path.dirname(os.path.abspath(__file__))
     processed_dir = os.path.join(base_dir, '../data/processed')
@@ -109,20 +271,26 @@ if __name__ == "__main__":
     try:
         # Baca data hasil preprocessing
         logger.info(f"Loading preprocessed data from {processed_dir}")
-        X_train = pd.read_csv(os.path.join(processed_dir, 'X_train.csv'))
-        X_test = pd.read_csv(os.path.join(processed_dir, 'X_test.csv'))
-        y_suit_train = np.load(os.path.join(processed_dir, 'y_suit_train.npy'))
-        y_suit_test = np.load(os.path.join(processed_dir, 'y_suit_test.npy'))
-        y_category_train = np.load(os.path.join(processed_dir, 'y_category_train.npy'))
-        y_category_test = np.load(os.path.join(processed_dir, 'y_category_test.npy'))
+        start = time.perf_counter()
+        # Fitur .npy di-memory-map tanpa salinan; fallback ke CSV untuk layout lama
+        X_train = load_features_frame(processed_dir, 'X_train')
+        X_test = load_features_frame(processed_dir, 'X_test')
+        labels = load_labels(processed_dir)
+        y_suit_train = labels['y_suit_train']
+        y_suit_test = labels['y_suit_test']
+        y_category_train = labels['y_category_train']
+        y_category_test = labels['y_category_test']
+        logger.info(f"Stage 'load_data' took {time.perf_counter() - start:.2f}s")
         
         # Jalankan pelatihan
         rf_suit, rf_category = train_random_forest(
-            X_train, X_test, y_suit_train, y_suit_test, y_category_train, y_category_test, saved_dir
+            X_train, X_test, y_suit_train, y_suit_test, y_category_train, y_category_test, saved_dir,
+            n_jobs=args.n_jobs, warm_start=args.warm_start, add_estimators=args.add_estimators,
+            scaler_path=os.path.join(processed_dir, 'scaler.pkl')
         )
     except FileNotFoundError as e:
         logger.error(f"Preprocessed data not found: {e}")
         raise
     except Exception as e:
         logger.error(f"Training failed: {e}")
-        raise
\ No newline at end of file
+        raise
@@ -1,16 +1,23 @@
-import pandas as pd
 import numpy as np
-import joblib
-import json
-import os
 import logging
 from features.extractor import BridgeHandAnalyzer
 from models.nsga2_optimizer import optimize_contract
+from models.registry import registry
+from utils.metrics import stage
+from utils.tracing import span
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Histogram latensi per tahap (lihat /metrics); batch dicatat per panggilan batch
+FEATURE_STAGE = stage('feature_extraction')
+TRANSFORM_STAGE = stage('transform')
+PREDICT_STAGE = stage('predict_proba')
+OPTIMIZER_STAGE = stage('optimizer')
+BATCH_TRANSFORM_STAGE = stage('batch_transform')
+BATCH_PREDICT_STAGE = stage('batch_predict_proba')
+
 def calculate_hcp(hand):
     """Calculate High Card Points (HCP) for a hand."""
     hcp = 0
@@ -47,13 +54,15 @@ def map_category_to_level(category):
     category_to_level = {0: 3, 1: 5, 2: 6, 3: 7}  # Partial game: 3, Game: 5, Small slam: 6, Grand slam: 7
     return category_to_level.get(category, 3)
 
-def predict_contract(hand1, hand2):
+def predict_contract(hand1, hand2, artifacts=None):
     """
     Prediksi kontrak optimal untuk dua tangan bridge menggunakan model yang sudah dilatih.
     
     Args:
         hand1 (list): Daftar 13 kartu untuk tangan pertama.
         hand2 (list): Daftar 13 kartu untuk tangan kedua.
+        artifacts (ModelArtifacts, optional): Snapshot model yang dipakai. Default-nya
+            snapshot aktif dari registry bersama, sehingga model tidak dimuat ulang per request.
     
     Returns:
         dict: Kontrak optimal dengan kunci 'suit', 'level', 'confidence', serta informasi HCP, distribusi suit, dan early prediction.
@@ -69,62 +78,141 @@ def predict_contract(hand1, hand2):
         logger.error("Each hand must contain exactly 13 cards")
         raise ValueError("Each hand must contain exactly 13 cards")
     
-    # Tentukan direktori
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    processed_dir = os.path.join(base_dir, 'data/processed')
-    saved_dir = os.path.join(base_dir, 'models/saved')
-    
-    # Muat model, scaler, dan selected_features
-    try:
-        rf_suit = joblib.load(os.path.join(saved_dir, 'rf_suit.pkl'))
-        rf_category = joblib.load(os.path.join(saved_dir, 'rf_category.pkl'))
-        scaler = joblib.load(os.path.join(processed_dir, 'scaler.pkl'))
-        with open(os.path.join(processed_dir, 'selected_features.json'), 'r') as f:
-            selected_features = json.load(f)
-        logger.info("Loaded models, scaler, and selected features")
-    except FileNotFoundError as e:
-        logger.error(f"Required file not found: {e}")
-        raise
+    # Ambil model dan pipeline fitur dari registry bersama
+    if artifacts is None:
+        artifacts = registry.get()
+    pipeline = artifacts.pipeline
     
-    # Ekstrak fitur
+    # Ekstrak fitur; vektor mentah dan ternormalisasi disimpan berdampingan
     try:
-        analyzer = BridgeHandAnalyzer()
-        hand_features = analyzer.extract_comprehensive_features(hand1, hand2)
-        selected_hand_features = [hand_features[f] for f in selected_features]
-        scaled_features = scaler.transform([selected_hand_features])[0]
+        with FEATURE_STAGE.time(), span('feature_extraction'):
+            with span('analyzer_init'):
+                analyzer = BridgeHandAnalyzer()
+            hand_features = analyzer.extract_comprehensive_features(hand1, hand2)
+            raw_features = pipeline.raw_vector(hand_features)
+        with TRANSFORM_STAGE.time(), span('transform'):
+            scaled_features = pipeline.transform(raw_features[np.newaxis])
         logger.info("Extracted features for the hand")
         
-        # Hitung HCP dan distribusi suit
-        hand1_hcp = calculate_hcp(hand1)
-        hand2_hcp = calculate_hcp(hand2)
-        total_hcp = hand1_hcp + hand2_hcp
-        hcp_strength = "moderate" if total_hcp < 25 else "strong"
-        suit_dist = get_suit_distribution(hand1, hand2)
-        
-        logger.info(f"hand1_hcp: {hand1_hcp}")
-        logger.info(f"hand2_hcp: {hand2_hcp}")
-        logger.info(f"total_hcp: {total_hcp} HCP, {hcp_strength} strength")
-        logger.info(f"suit_dist: {suit_dist}")
-        
-        # Early prediction dari Random Forest
-        suit_names = {0: 'Spades', 1: 'Hearts', 2: 'Diamonds', 3: 'Clubs', 4: 'No Trump'}
-        suit_abbr = {0: 'S', 1: 'H', 2: 'D', 3: 'C', 4: 'NT'}
-        early_suit = rf_suit.predict([scaled_features])[0]
-        early_category = rf_category.predict([scaled_features])[0]
-        early_level = map_category_to_level(early_category)
-        early_suit_prob = rf_suit.predict_proba([scaled_features])[0][early_suit]
-        early_category_prob = rf_category.predict_proba([scaled_features])[0][early_category]
-        early_confidence = early_suit_prob * early_category_prob * 100
-        early_contract = f"{early_level}{suit_names[early_suit]}"
-        early_contract_abbr = f"{early_level}{suit_abbr[early_suit]}"
-        logger.info(f"Early predicted contract: {early_contract}, confidence: {early_confidence:.1f}%")
+        # Probabilitas Random Forest, dipakai untuk early prediction dan optimizer
+        with PREDICT_STAGE.time():
+            with span('rf_suit.predict_proba'):
+                suit_proba = artifacts.flat_suit.predict_proba(scaled_features)[0]
+            with span('rf_category.predict_proba'):
+                category_proba = artifacts.flat_category.predict_proba(scaled_features)[0]
     except KeyError as e:
         logger.error(f"Feature extraction failed: {e}")
         raise
     
+    return _build_prediction(hand1, hand2, artifacts, raw_features, suit_proba, category_proba)
+
+def predict_contracts_batch(deals, artifacts=None):
+    """
+    Prediksi kontrak optimal untuk banyak pasangan tangan sekaligus.
+    
+    Fitur semua deal dinormalisasi dalam satu panggilan pipeline.transform dan tiap
+    Random Forest (versi FlatForest) hanya dipanggil sekali untuk seluruh batch.
+    
+    Args:
+        deals (list): Daftar pasangan (hand1, hand2), masing-masing 13 kartu.
+        artifacts (ModelArtifacts, optional): Snapshot model yang dipakai.
+    
+    Returns:
+        list: Satu entri per deal dengan urutan yang sama. Entri berisi dict hasil seperti
+        predict_contract, atau {'error': pesan} jika deal tersebut gagal diproses.
+    """
+    logger.info(f"Starting batch contract prediction for {len(deals)} deals")
+    
+    if artifacts is None:
+        artifacts = registry.get()
+    pipeline = artifacts.pipeline
+    
+    results = [None] * len(deals)
+    rows = []
+    valid_indices = []
+    
+    # Ekstrak fitur per deal; deal yang gagal dicatat tanpa menggagalkan batch
+    with span('analyzer_init'):
+        analyzer = BridgeHandAnalyzer()
+    with span('feature_extraction', deals=len(deals)):
+        for i, (hand1, hand2) in enumerate(deals):
+            try:
+                if len(hand1) != 13 or len(hand2) != 13:
+                    raise ValueError("Each hand must contain exactly 13 cards")
+                with FEATURE_STAGE.time():
+                    hand_features = analyzer.extract_comprehensive_features(hand1, hand2)
+                    rows.append(pipeline.raw_vector(hand_features))
+                valid_indices.append(i)
+            except (KeyError, ValueError, IndexError) as e:
+                logger.error(f"Feature extraction failed for deal {i}: {e}")
+                results[i] = {'error': str(e)}
+    
+    if not valid_indices:
+        return results
+    
+    raw_features = np.array(rows)
+    with BATCH_TRANSFORM_STAGE.time(), span('transform', deals=len(rows)):
+        scaled_features = pipeline.transform(raw_features)
+    with BATCH_PREDICT_STAGE.time():
+        with span('rf_suit.predict_proba', deals=len(rows)):
+            suit_proba = artifacts.flat_suit.predict_proba(scaled_features)
+        with span('rf_category.predict_proba', deals=len(rows)):
+            category_proba = artifacts.flat_category.predict_proba(scaled_features)
+    
+    for j, i in enumerate(valid_indices):
+        hand1, hand2 = deals[i]
+        try:
+            results[i] = _build_prediction(
+                hand1, hand2, artifacts, raw_features[j], suit_proba[j], category_proba[j]
+            )
+        except Exception as e:
+            logger.error(f"Prediction failed for deal {i}: {e}")
+            results[i] = {'error': str(e)}
+    
+    return results
+
+def _build_prediction(hand1, hand2, artifacts, raw_features, suit_proba, category_proba):
+    """
+    Susun hasil prediksi (early prediction, HCP, distribusi, kontrak optimal) untuk satu deal.
+    
+    raw_features adalah vektor fitur mentah (urutan selected_features); probabilitas
+    Random Forest yang sama dipakai ulang oleh optimizer tanpa transform atau predict lagi.
+    """
+    rf_suit = artifacts.flat_suit
+    rf_category = artifacts.flat_category
+    
+    # Hitung HCP dan distribusi suit
+    hand1_hcp = calculate_hcp(hand1)
+    hand2_hcp = calculate_hcp(hand2)
+    total_hcp = hand1_hcp + hand2_hcp
+    hcp_strength = "moderate" if total_hcp < 25 else "strong"
+    suit_dist = get_suit_distribution(hand1, hand2)
+    
+    logger.info(f"hand1_hcp: {hand1_hcp}")
+    logger.info(f"hand2_hcp: {hand2_hcp}")
+    logger.info(f"total_hcp: {total_hcp} HCP, {hcp_strength} strength")
+    logger.info(f"suit_dist: {suit_dist}")
+    
+    # Early prediction dari Random Forest
+    suit_names = {0: 'Spades', 1: 'Hearts', 2: 'Diamonds', 3: 'Clubs', 4: 'No Trump'}
+    suit_abbr = {0: 'S', 1: 'H', 2: 'D', 3: 'C', 4: 'NT'}
+    early_suit = rf_suit.classes_[np.argmax(suit_proba)]
+    early_category = rf_category.classes_[np.argmax(category_proba)]
+    early_level = map_category_to_level(early_category)
+    early_suit_prob = suit_proba[early_suit]
+    early_category_prob = category_proba[early_category]
+    early_confidence = early_suit_prob * early_category_prob * 100
+    early_contract = f"{early_level}{suit_names[early_suit]}"
+    early_contract_abbr = f"{early_level}{suit_abbr[early_suit]}"
+    logger.info(f"Early predicted contract: {early_contract}, confidence: {early_confidence:.1f}%")
+    
     # Optimasi kontrak
     try:
-        best_contract, confidence = optimize_contract(rf_suit, rf_category, selected_hand_features, scaler, selected_features)
+        with OPTIMIZER_STAGE.time(), span('optimizer'):
+            best_contract, confidence = optimize_contract(
+                rf_suit, rf_category, raw_features, artifacts.scaler, artifacts.selected_features,
+                suit_proba=suit_proba, category_proba=category_proba
+            )
         suit, level = int(best_contract[0]), int(best_contract[1])
         logger.info(f"Optimal contract: {level}{suit_names[suit]}")
         
@@ -6,14 +6,89 @@ from sklearn.preprocessing import StandardScaler
 import os
 import joblib
 import logging
-from features.extractor import BridgeHandAnalyzer
+from features.batch_extractor import FEATURE_NAMES, encode_deals, extract_features_batch
 from utils.helpers import parse_contract, map_level_to_category
+from utils.dataset_stream import iter_board_chunks
+from utils.processed_io import save_features, create_features_memmap, warn_stale_csv
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def preprocess_data(json_path, processed_dir, selected_features):
+def parse_boards(boards, offset=0):
+    """
+    Validasi board dan parse kontrak menjadi label suit dan kategori.
+    
+    Args:
+        boards (list): Board dengan kunci 'hand1', 'hand2', dan 'contract'.
+        offset (int): Index board pertama, untuk pesan error saat diproses per chunk.
+    
+    Returns:
+        deals, suits, categories
+    """
+    deals = []
+    suits = []
+    categories = []
+    
+    for i, board in enumerate(boards, start=offset):
+        try:
+            hand1, hand2 = board['hand1'], board['hand2']
+            contract = board['contract']
+            
+            # Validasi ukuran tangan
+            if len(hand1) != 13 or len(hand2) != 13:
+                raise ValueError(f"Invalid hand size in board {i}: {board}")
+            
+            deals.append((hand1, hand2))
+            suit, level = parse_contract(contract)
+            category = map_level_to_category(level, suit)
+            suits.append(suit)
+            categories.append(category)
+            
+        except KeyError as e:
+            logger.error(f"Missing key in board {i}: {e}")
+            raise
+        except ValueError as e:
+            logger.error(f"Invalid data in board {i}: {e}")
+            raise
+    
+    return deals, suits, categories
+
+def extract_selected_features(deals, selected_features, boards, offset=0):
+    """Ekstrak fitur semua deal sekaligus dan kembalikan DataFrame fitur terpilih."""
+    # Ekstrak fitur semua board sekaligus dari array (n, 2, 52). Satu deal harus berisi 26
+    # kartu berbeda: kartu dobel di dalam satu tangan maupun kartu yang ada di kedua tangan ditolak
+    encoded = encode_deals(deals)
+    duplicate_in_hand = encoded.sum(axis=2).min(axis=1) != 13
+    shared_between_hands = np.any(encoded[:, 0] & encoded[:, 1], axis=1)
+    duplicate_boards = np.flatnonzero(duplicate_in_hand | shared_between_hands)
+    if len(duplicate_boards):
+        first = duplicate_boards[0]
+        logger.error(f"Duplicate cards in boards: {(duplicate_boards[:10] + offset).tolist()}")
+        raise ValueError(f"Duplicate cards in board {first + offset}: {boards[first]}")
+    batch_features = extract_features_batch(encoded)
+    
+    # Pilih hanya fitur utama, dengan urutan kolom mengikuti FEATURE_NAMES
+    return pd.DataFrame({f: batch_features[f] for f in FEATURE_NAMES if f in selected_features})
+
+def check_selected_features(selected_features):
+    """Pastikan semua fitur terpilih bisa dihasilkan oleh extractor."""
+    missing_features = set(selected_features) - set(FEATURE_NAMES)
+    if missing_features:
+        logger.error(f"Missing features: {missing_features}")
+        raise KeyError(f"Missing features: {missing_features}")
+
+def save_labels_and_scaler(processed_dir, y_suit_train, y_suit_test, y_category_train, y_category_test, scaler, selected_features):
+    """Simpan label, scaler, dan daftar fitur terpilih ke processed_dir."""
+    np.save(os.path.join(processed_dir, 'y_suit_train.npy'), y_suit_train)
+    np.save(os.path.join(processed_dir, 'y_suit_test.npy'), y_suit_test)
+    np.save(os.path.join(processed_dir, 'y_category_train.npy'), y_category_train)
+    np.save(os.path.join(processed_dir, 'y_category_test.npy'), y_category_test)
+    joblib.dump(scaler, os.path.join(processed_dir, 'scaler.pkl'))
+    with open(os.path.join(processed_dir, 'selected_features.json'), 'w') as f:
+        json.dump(selected_features, f)
+
+def preprocess_data(json_path, processed_dir, selected_features, write_csv=False):
     """
     Preprocess dataset JSON, ekstrak fitur, normalisasi, dan simpan hasilnya.
     
@@ -21,6 +96,7 @@ def preprocess_data(json_path, processed_dir, selected_features):
         json_path (str): Path ke file JSON dataset.
         processed_dir (str): Direktori untuk menyimpan hasil preprocessing.
         selected_features (list): Daftar 10 fitur utama yang akan digunakan.
+        write_csv (bool): Tulis juga X_train.csv/X_test.csv selain file .npy.
     
     Returns:
         X_train, X_test, y_suit_train, y_suit_test, y_category_train, y_category_test, scaler
@@ -33,8 +109,6 @@ def preprocess_data(json_path, processed_dir, selected_features):
     """
     logger.info(f"Starting preprocessing with json_path: {json_path}")
     
-    analyzer = BridgeHandAnalyzer()
-    
     # Baca dataset
     try:
         with open(json_path, 'r') as f:
@@ -47,46 +121,12 @@ def preprocess_data(json_path, processed_dir, selected_features):
         logger.error(f"Invalid JSON format in {json_path}")
         raise
     
-    features = []
-    suits = []
-    categories = []
-    
-    for i, board in enumerate(data):
-        try:
-            hand1, hand2 = board['hand1'], board['hand2']
-            contract = board['contract']
-            
-            # Validasi ukuran tangan
-            if len(hand1) != 13 or len(hand2) != 13:
-                raise ValueError(f"Invalid hand size in board {i}: {board}")
-            
-            # Ekstrak semua fitur
-            hand_features = analyzer.extract_comprehensive_features(hand1, hand2)
-            
-            # Validasi fitur
-            missing_features = set(selected_features) - set(hand_features.keys())
-            if missing_features:
-                raise KeyError(f"Missing features in board {i}: {missing_features}")
-            
-            # Pilih hanya 10 fitur utama
-            selected_hand_features = {k: v for k, v in hand_features.items() if k in selected_features}
-            features.append(selected_hand_features)
-            
-            suit, level = parse_contract(contract)
-            category = map_level_to_category(level, suit)
-            suits.append(suit)
-            categories.append(category)
-            
-        except KeyError as e:
-            logger.error(f"Missing key in board {i}: {e}")
-            raise
-        except ValueError as e:
-            logger.error(f"Invalid data in board {i}: {e}")
-            raise
-    
-    logger.info(f"Extracted features for {len(features)} boards")
+    # Validasi missing feature sekali untuk seluruh dataset
+    check_selected_features(selected_features)
     
-    X = pd.DataFrame(features)
+    deals, suits, categories = parse_boards(data)
+    X = extract_selected_features(deals, selected_features, data)
+    logger.info(f"Extracted features for {len(deals)} boards")
     y_suit = np.array(suits)
     y_category = np.array(categories)
     
@@ -110,15 +150,15 @@ def preprocess_data(json_path, processed_dir, selected_features):
     # Simpan hasil preprocessing
     try:
         os.makedirs(processed_dir, exist_ok=True)
-        X_train.to_csv(os.path.join(processed_dir, 'X_train.csv'), index=False)
-        X_test.to_csv(os.path.join(processed_dir, 'X_test.csv'), index=False)
-        np.save(os.path.join(processed_dir, 'y_suit_train.npy'), y_suit_train)
-        np.save(os.path.join(processed_dir, 'y_suit_test.npy'), y_suit_test)
-        np.save(os.path.join(processed_dir, 'y_category_train.npy'), y_category_train)
-        np.save(os.path.join(processed_dir, 'y_category_test.npy'), y_category_test)
-        joblib.dump(scaler, os.path.join(processed_dir, 'scaler.pkl'))
-        with open(os.path.join(processed_dir, 'selected_features.json'), 'w') as f:
-            json.dump(selected_features, f)
+        save_features(processed_dir, 'X_train', X_train)
+        save_features(processed_dir, 'X_test', X_test)
+        if write_csv:
+            X_train.to_csv(os.path.join(processed_dir, 'X_train.csv'), index=False)
+            X_test.to_csv(os.path.join(processed_dir, 'X_test.csv'), index=False)
+        else:
+            warn_stale_csv(processed_dir, 'X_train')
+            warn_stale_csv(processed_dir, 'X_test')
+        save_labels_and_scaler(processed_dir, y_suit_train, y_suit_test, y_category_train, y_category_test, scaler, selected_features)
         logger.info(f"Preprocessing results saved to {processed_dir}")
     except PermissionError:
         logger.error(f"Cannot write to directory {processed_dir}")
@@ -126,6 +166,113 @@ def preprocess_data(json_path, processed_dir, selected_features):
     
     return X_train, X_test, y_suit_train, y_suit_test, y_category_train, y_category_test, scaler
 
+def preprocess_data_streaming(json_path, processed_dir, selected_features, chunk_size=50000, write_csv=False):
+    """
+    Versi streaming dari preprocess_data untuk dataset besar.
+    
+    Board dibaca per chunk (utils.dataset_stream), fitur diekstrak per chunk dan
+    ditulis ke file biner sementara, sementara scaler dilatih dengan partial_fit.
+    Setelah itu data dibagi dengan split yang sama seperti preprocess_data dan
+    X_train/X_test ditulis per chunk ke file .npy. Memori fitur dibatasi oleh chunk_size; yang
+    tumbuh dengan jumlah board hanya vektor label dan index split.
+    
+    Args:
+        json_path (str): Path ke dataset (.json berisi array, atau .jsonl satu board per baris).
+        processed_dir (str): Direktori untuk menyimpan hasil preprocessing.
+        selected_features (list): Daftar fitur yang akan digunakan.
+        chunk_size (int): Jumlah board per chunk.
+        write_csv (bool): Tulis juga X_train.csv/X_test.csv selain file .npy.
+    
+    Returns:
+        n_train, n_test, scaler
+    
+    Raises:
+        FileNotFoundError: Jika file dataset tidak ditemukan.
+        ValueError: Jika format JSON salah atau ukuran tangan tidak valid.
+        KeyError: Jika fitur yang dipilih tidak ada.
+        PermissionError: Jika tidak dapat menulis ke direktori.
+    """
+    logger.info(f"Starting streaming preprocessing with json_path: {json_path}, chunk_size: {chunk_size}")
+    check_selected_features(selected_features)
+    os.makedirs(processed_dir, exist_ok=True)
+    
+    scaler = StandardScaler()
+    columns = None
+    suit_chunks = []
+    category_chunks = []
+    n_boards = 0
+    raw_path = os.path.join(processed_dir, 'features_raw.tmp')
+    
+    try:
+        # Tahap 1: ekstrak fitur per chunk, simpan fitur mentah ke disk, dan latih scaler
+        with open(raw_path, 'wb') as raw_file:
+            for chunk in iter_board_chunks(json_path, chunk_size):
+                deals, suits, categories = parse_boards(chunk, offset=n_boards)
+                X_chunk = extract_selected_features(deals, selected_features, chunk, offset=n_boards)
+                if X_chunk.isna().any().any():
+                    logger.error("NaN values found in features")
+                    raise ValueError("NaN values found in features")
+                
+                columns = list(X_chunk.columns)
+                scaler.partial_fit(X_chunk)
+                np.ascontiguousarray(X_chunk.to_numpy(dtype=np.float64)).tofile(raw_file)
+                suit_chunks.append(np.array(suits, dtype=np.int8))
+                category_chunks.append(np.array(categories, dtype=np.int8))
+                n_boards += len(chunk)
+                logger.info(f"Processed {n_boards} boards")
+        
+        if n_boards == 0:
+            raise ValueError(f"No boards found in {json_path}")
+        
+        y_suit = np.concatenate(suit_chunks).astype(np.int64)
+        y_category = np.concatenate(category_chunks).astype(np.int64)
+        del suit_chunks, category_chunks
+        logger.info(f"Extracted features for {n_boards} boards")
+        
+        # Tahap 2: split index (sama dengan split pada preprocess_data) lalu tulis per chunk
+        train_idx, test_idx = train_test_split(
+            np.arange(n_boards), test_size=0.2, random_state=42, stratify=y_category
+        )
+        logger.info(f"Data split: {len(train_idx)} training, {len(test_idx)} testing")
+        
+        raw = np.memmap(raw_path, dtype=np.float64, mode='r', shape=(n_boards, len(columns)))
+        for name, indices in (('X_train', train_idx), ('X_test', test_idx)):
+            out = create_features_memmap(processed_dir, name, len(indices), columns)
+            csv_path = os.path.join(processed_dir, f'{name}.csv')
+            for start in range(0, len(indices), chunk_size):
+                rows = raw[indices[start:start + chunk_size]]
+                scaled = scaler.transform(pd.DataFrame(rows, columns=columns))
+                out[start:start + len(rows)] = scaled
+                if write_csv:
+                    pd.DataFrame(scaled, columns=columns).to_csv(
+                        csv_path, mode='w' if start == 0 else 'a', header=start == 0, index=False
+                    )
+            out.flush()
+            del out
+            if not write_csv:
+                warn_stale_csv(processed_dir, name)
+        del raw
+        
+        save_labels_and_scaler(
+            processed_dir, y_suit[train_idx], y_suit[test_idx],
+            y_category[train_idx], y_category[test_idx], scaler, selected_features
+        )
+        logger.info(f"Preprocessing results saved to {processed_dir}")
+    except FileNotFoundError:
+        logger.error(f"Dataset not found at {json_path}")
+        raise
+    except json.JSONDecodeError:
+        logger.error(f"Invalid JSON format in {json_path}")
+        raise
+    except PermissionError:
+        logger.error(f"Cannot write to directory {processed_dir}")
+        raise
+    finally:
+        if os.path.exists(raw_path):
+            os.remove(raw_path)
+    
+    return len(train_idx), len(test_idx), scaler
+
 if __name__ == "__main__":
     # Konfigurasi untuk pengujian langsung
     base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -137,7 +284,8 @@ if __name__ == "__main__":
     ]
     
     try:
-        preprocess_data(json_path, processed_dir, selected_features)
+        # Dataset dibaca per chunk agar memori tidak tumbuh dengan ukuran file
+        preprocess_data_streaming(json_path, processed_dir, selected_features)
     except Exception as e:
         logger.error(f"Preprocessing failed: {e}")
         raise
\ No newline at end of file
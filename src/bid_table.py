@@ -0,0 +1,161 @@
+# bid_snapper_backend/src/bid_table.py
+
+# Tabel lookup lengkap jawaban bidding: untuk tiap strategi, kode bid per (HCP 0..37,
+# bentuk tangan). Ada 560 bentuk [S, H, D, C] dengan jumlah 13, sehingga satu strategi
+# cukup 38 x 560 byte. Tabel dibangun sekali dari aturan (python -m src.bid_table build),
+# disimpan ke BID_TABLE_PATH, lalu dipasang ke Strategy saat import; /analisis menjawab
+# dengan satu index lookup.
+#
+#   python -m src.bid_table build    # enumerasi semua (HCP, shape) dan simpan tabel
+#   python -m src.bid_table check    # bandingkan tabel tersimpan dengan fungsi aturan
+
+import os
+import sys
+import hashlib
+import logging
+import itertools
+import numpy as np
+from src.rule_engine import MAX_HCP
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BID_TABLE_PATH = os.path.join(BASE_DIR, 'data/bid_tables.npz')
+
+N_HCP = MAX_HCP + 1
+SHAPES = [shape for shape in itertools.product(range(14), repeat=4) if sum(shape) == 13]
+N_SHAPES = len(SHAPES)
+
+# Index bentuk dari (S, H, D): panjang club sudah pasti 13 - S - H - D
+SHAPE_INDEX = [-1] * (14 * 14 * 14)
+for _index, (_s, _h, _d, _c) in enumerate(SHAPES):
+    SHAPE_INDEX[_s * 196 + _h * 14 + _d] = _index
+
+
+def shape_index(shdc):
+    """Index 0..559 untuk panjang [S, H, D, C] berjumlah 13."""
+    return SHAPE_INDEX[shdc[0] * 196 + shdc[1] * 14 + shdc[2]]
+
+
+def strategy_fingerprint(strategy):
+    """Hash deskripsi aturan strategi; tabel dengan fingerprint berbeda dianggap basi."""
+    return hashlib.sha256(strategy.describe().encode('utf-8')).hexdigest()[:16]
+
+
+def build_table(strategy):
+    """Enumerasi semua (HCP, shape) menjadi array kode bid (N_HCP, N_SHAPES) uint8."""
+    table = np.empty((N_HCP, N_SHAPES), dtype=np.uint8)
+    for total_hcp in range(N_HCP):
+        for index, shape in enumerate(SHAPES):
+            table[total_hcp, index] = strategy.evaluate(total_hcp, shape)
+    return table
+
+
+def build_tables(strategies, path=BID_TABLE_PATH):
+    """Bangun tabel semua strategi dan simpan ke satu file .npz beserta fingerprint-nya."""
+    arrays = {}
+    for name, strategy in strategies.items():
+        arrays[name] = build_table(strategy)
+        arrays[f'{name}__fingerprint'] = np.array(strategy_fingerprint(strategy))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez_compressed(path, **arrays)
+    logger.info(f"Built bid tables for {len(strategies)} strategies into {path}")
+    return {name: arrays[name] for name in strategies}
+
+
+def make_lookup(table):
+    """Fungsi lookup(total_hcp, shdc) di atas tabel, memakai bytes agar index cepat."""
+    flat = table.astype(np.uint8).tobytes()
+    index = SHAPE_INDEX
+
+    def lookup(total_hcp, shdc):
+        return flat[total_hcp * N_SHAPES + index[shdc[0] * 196 + shdc[1] * 14 + shdc[2]]]
+    return lookup
+
+
+def read_tables(path=BID_TABLE_PATH):
+    """
+    Baca semua tabel tersimpan beserta fingerprint-nya.
+
+    Returns:
+        dict: Nama strategi -> (fingerprint, tabel); kosong jika file belum dibangun.
+    """
+    if not os.path.exists(path):
+        logger.warning(f"Bid table {path} not found, using rule evaluation")
+        return {}
+    tables = {}
+    with np.load(path, allow_pickle=False) as data:
+        for key in data.files:
+            if key.endswith('__fingerprint'):
+                continue
+            fingerprint_key = f'{key}__fingerprint'
+            if fingerprint_key in data.files:
+                tables[key] = (str(data[fingerprint_key]), data[key])
+    return tables
+
+
+def install_table(name, strategy, tables):
+    """Pasang tabel dari read_tables ke strategi jika fingerprint cocok; True jika terpasang."""
+    if name not in tables:
+        return False
+    fingerprint, table = tables[name]
+    if fingerprint != strategy_fingerprint(strategy):
+        logger.warning(f"Bid table for {name} is stale, using rule evaluation")
+        return False
+    if table.shape != (N_HCP, N_SHAPES):
+        return False
+    strategy.attach_table(make_lookup(table))
+    return True
+
+
+def install_tables(strategies, path=BID_TABLE_PATH):
+    """
+    Pasang tabel tersimpan ke setiap strategi yang fingerprint-nya cocok.
+
+    Strategi tanpa tabel (file belum dibangun, strategi baru, atau aturan berubah)
+    tetap dijawab oleh aturan + memo.
+
+    Returns:
+        list: Nama strategi yang memakai tabel.
+    """
+    tables = read_tables(path)
+    return [name for name, strategy in strategies.items() if install_table(name, strategy, tables)]
+
+
+def check_tables(strategies, path=BID_TABLE_PATH):
+    """
+    Bandingkan tabel tersimpan dengan evaluasi aturan langsung untuk semua (HCP, shape).
+
+    Returns:
+        list: (strategi, HCP, shape, kode tabel, kode aturan) untuk setiap perbedaan.
+    """
+    mismatches = []
+    with np.load(path, allow_pickle=False) as data:
+        for name, strategy in strategies.items():
+            if name not in data:
+                mismatches.append((name, None, None, None, None))
+                continue
+            table = data[name]
+            for total_hcp in range(N_HCP):
+                for index, shape in enumerate(SHAPES):
+                    expected = strategy.evaluate(total_hcp, shape)
+                    if table[total_hcp, index] != expected:
+                        mismatches.append((name, total_hcp, shape, int(table[total_hcp, index]), expected))
+    return mismatches
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    from src.biding_strategies import BIDING_STRATEGIES
+
+    command = sys.argv[1] if len(sys.argv) > 1 else 'check'
+    if command == 'build':
+        build_tables(BIDING_STRATEGIES)
+    elif command == 'check':
+        mismatches = check_tables(BIDING_STRATEGIES)
+        if mismatches:
+            raise SystemExit(f"Bid tables disagree with the rules on {len(mismatches)} entries: {mismatches[:10]}")
+        print(f"Bid tables match the rules for {len(BIDING_STRATEGIES)} strategies "
+              f"x {N_HCP} HCP x {N_SHAPES} shapes")
+    else:
+        raise SystemExit(f"Unknown command '{command}', expected 'build' or 'check'")
@@ -1,32 +1,110 @@
 # bid_snapper_backend/src/biding_strategies.py
 
-from src.prec.opening import prec_opening
-from src.prec.respon_1c import prec_respon_1c
-from src.prec.respon_1d import prec_respon_1d
-from src.prec.respon_1h import prec_respon_1h
-from src.prec.respon_1s import prec_respon_1s
-from src.prec.respon_1nt import prec_respon_1nt
-from src.prec.respon_2c import prec_respon_2c
-from src.prec.respon_2d import prec_respon_2d
-from src.prec.respon_2h import prec_respon_2h
-from src.prec.respon_2s import prec_respon_2s
-
-BIDING_STRATEGIES = {
+import importlib
+import threading
+from collections.abc import Mapping
+from src.rule_engine import Strategy, analyze_hand
+
+
+class LazyStrategies(Mapping):
+    """
+    Daftar strategi yang modulnya baru diimpor saat strategi itu pertama dipakai.
+
+    sources memetakan nama strategi ke 'modul:atribut'. Nama strategi (iterasi, 'in', len)
+    tersedia tanpa mengimpor apa pun; saat strategi dimuat, tabel lookup-nya
+    (src.bid_table) ikut dipasang jika cocok.
+    """
+
+    def __init__(self, sources):
+        self._sources = dict(sources)
+        self._loaded = {}
+        self._tables = None
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name):
+        strategy = self._loaded.get(name)
+        if strategy is None:
+            if name not in self._sources:
+                raise KeyError(name)
+            with self._lock:
+                strategy = self._loaded.get(name)
+                if strategy is None:
+                    strategy = self._load(name)
+        return strategy
+
+    def _load(self, name):
+        from src.bid_table import read_tables, install_table
+        module_name, attr = self._sources[name].split(':')
+        strategy = getattr(importlib.import_module(module_name), attr)
+        # Jawaban per (HCP, shape) dari tabel lookup; strategi tanpa tabel yang cocok memakai aturan
+        if self._tables is None:
+            self._tables = read_tables()
+        install_table(name, strategy, self._tables)
+        self._loaded[name] = strategy
+        return strategy
+
+    def __contains__(self, name):
+        return name in self._sources
+
+    def __iter__(self):
+        return iter(self._sources)
+
+    def __len__(self):
+        return len(self._sources)
+
+    def loaded(self):
+        """Nama strategi yang sudah dimuat."""
+        return list(self._loaded)
+
+
+# Setiap strategi adalah src.rule_engine.Strategy: tabel aturan yang dikompilasi saat modulnya
+# diimpor dan bisa dipanggil dengan daftar kartu. Skema baru cukup ditulis sebagai tabel aturan
+# (lihat src/prec/*.py), didaftarkan di sini sebagai 'modul:atribut', lalu tabel lookup dibangun
+# ulang dengan python -m src.bid_table build.
+BIDING_STRATEGIES = LazyStrategies({
     # Precision
-    "prec_opening": prec_opening,
-    "prec_respon_1c": prec_respon_1c,
-    "prec_respon_1d": prec_respon_1d,
-    "prec_respon_1h": prec_respon_1h,
-    "prec_respon_1s": prec_respon_1s,
-    "prec_respon_1nt": prec_respon_1nt,
-    "prec_respon_2c": prec_respon_2c,
-    "prec_respon_2d": prec_respon_2d,
-    "prec_respon_2h": prec_respon_2h,
-    "prec_respon_2s": prec_respon_2s,
-    
+    "prec_opening": "src.prec.opening:prec_opening",
+    "prec_respon_1c": "src.prec.respon_1c:prec_respon_1c",
+    "prec_respon_1d": "src.prec.respon_1d:prec_respon_1d",
+    "prec_respon_1h": "src.prec.respon_1h:prec_respon_1h",
+    "prec_respon_1s": "src.prec.respon_1s:prec_respon_1s",
+    "prec_respon_1nt": "src.prec.respon_1nt:prec_respon_1nt",
+    "prec_respon_2c": "src.prec.respon_2c:prec_respon_2c",
+    "prec_respon_2d": "src.prec.respon_2d:prec_respon_2d",
+    "prec_respon_2h": "src.prec.respon_2h:prec_respon_2h",
+    "prec_respon_2s": "src.prec.respon_2s:prec_respon_2s",
+
     # SAYC
-    # "sayc_opening": sayc_opening,
-    # "sayc_respon_1c": sayc_respon_1c,
+    # "sayc_opening": "src.sayc.opening:sayc_opening",
+    # "sayc_respon_1c": "src.sayc.respon_1c:sayc_respon_1c",
 
     # Tambah skema lain di sini
-}
\ No newline at end of file
+})
+
+
+def evaluate_strategies(hand, names=None):
+    """
+    Jawaban beberapa strategi untuk satu tangan; HCP dan distribusi dihitung sekali.
+
+    Args:
+        hand (list): 13 kartu, misal ['AS', 'KH', ...].
+        names (list): Nama strategi di BIDING_STRATEGIES; None berarti semua.
+
+    Returns:
+        dict: {'hcp', 'distribusi', 'results': {nama strategi: teks bid}}.
+    """
+    names = list(BIDING_STRATEGIES) if names is None else names
+    total_hcp, shdc = analyze_hand(hand)
+    results = {}
+    for name in names:
+        strategy = BIDING_STRATEGIES[name]
+        if isinstance(strategy, Strategy):
+            results[name] = strategy.bid(total_hcp, shdc)
+        else:
+            # Fungsi strategi biasa (belum ditulis sebagai tabel aturan)
+            results[name] = strategy(hand)['result']
+    return {
+        'hcp': total_hcp,
+        'distribusi': ''.join(map(str, shdc)),
+        'results': results,
+    }
@@ -1,18 +1,8 @@
-from utils.bridge_analyzer import BridgeHandAnalyzer
+from src.rule_engine import Strategy, Rule, When, FirstOf, Otherwise, hcp, length, length_is, balanced, five_card_major
 
-def prec_opening(hand):
-    analyzer = BridgeHandAnalyzer()
-    analysis = analyzer.calculate_hcp_and_distribution(hand)
-    
-    total_hcp = analysis['total_hcp']
-    suit_counts = analysis['suit_counts']
-    dist = analysis['dist']
-    shdc = analysis['shdc']
-    distribusi = analysis['distribusi']
-
-    possibleBids = []
-
-    bid_meanings = {
+prec_opening = Strategy(
+    'prec_opening',
+    meanings={
         1: "Opening 1C",
         2: "Opening 1D",
         3: "Opening 1H",
@@ -28,47 +18,38 @@ def prec_opening(hand):
         13: "Opening 3H",
         14: "Opening 3S",
         0: "Pass"
-    }
-
-    # Implementasi logika bidding opening
-    if 15 <= total_hcp <= 17 and analyzer.is_balanced_distribution(dist) and not analyzer.has_five_card_major(suit_counts):
-        possibleBids.append(5)
-    if total_hcp >= 16:
-        if 22 <= total_hcp <= 23 and analyzer.is_balanced_distribution(dist):
-            possibleBids.append(7)
-        else:
-            possibleBids.append(1)
-    if 11 <= total_hcp <= 15:
-        if suit_counts["S"] >= 5:
-            possibleBids.append(4)
-        elif suit_counts["H"] >= 5:
-            possibleBids.append(3)
-        elif suit_counts["C"] >= 6 or (suit_counts["C"] == 5 and (suit_counts["S"] == 4 or suit_counts["H"] == 4)):
-            possibleBids.append(6)
-        else:
-            possibleBids.append(2)
-    if 6 <= total_hcp <= 10:
-        if suit_counts["S"] == 6 or suit_counts["H"] == 6:
-            possibleBids.append(7)
-        elif suit_counts["H"] >= 5 and (suit_counts["D"] >= 5 or suit_counts["C"] >= 5):
-            possibleBids.append(8)
-        elif suit_counts["S"] >= 5 and (suit_counts["H"] >= 5 or suit_counts["D"] >= 5 or suit_counts["C"] >= 5):
-            possibleBids.append(9)
-        elif suit_counts["D"] >= 5 and suit_counts["C"] >= 5:
-            possibleBids.append(10)
-        elif suit_counts["C"] >= 7:
-            possibleBids.append(11)
-        elif suit_counts["D"] >= 7:
-            possibleBids.append(12)
-        elif suit_counts["H"] >= 7:
-            possibleBids.append(13)
-        elif suit_counts["S"] >= 7:
-            possibleBids.append(14)
-
-    output = bid_meanings[max(possibleBids)] if possibleBids else bid_meanings[0]
-
-    return {
-        'result': output,
-        'hcp': total_hcp,
-        'distribusi': distribusi,
-    }
\ No newline at end of file
+    },
+    rules=[
+        # 1NT
+        Rule(hcp(15, 17) & balanced() & ~five_card_major(), 5),
+        # 2D (22-23 balanced) atau 1C
+        When(hcp(16),
+            FirstOf(
+                Rule(hcp(22, 23) & balanced(), 7),
+                Otherwise(1),
+            ),
+        ),
+        # 1S, 1H, 2C, 1D
+        When(hcp(11, 15),
+            FirstOf(
+                Rule(length('S', 5), 4),
+                Rule(length('H', 5), 3),
+                Rule(length('C', 6) | (length_is('C', 5) & (length_is('S', 4) | length_is('H', 4))), 6),
+                Otherwise(2),
+            ),
+        ),
+        # Preempt dan two-suiter lemah
+        When(hcp(6, 10),
+            FirstOf(
+                Rule(length_is('S', 6) | length_is('H', 6), 7),
+                Rule(length('H', 5) & (length('D', 5) | length('C', 5)), 8),
+                Rule(length('S', 5) & (length('H', 5) | length('D', 5) | length('C', 5)), 9),
+                Rule(length('D', 5) & length('C', 5), 10),
+                Rule(length('C', 7), 11),
+                Rule(length('D', 7), 12),
+                Rule(length('H', 7), 13),
+                Rule(length('S', 7), 14),
+            ),
+        ),
+    ],
+)
@@ -1,60 +1,36 @@
-from utils.bridge_analyzer import BridgeHandAnalyzer
+from src.rule_engine import Strategy, Rule, When, IfNoBids, hcp, length
 
-def prec_respon_1d(hand):
-    analyzer = BridgeHandAnalyzer()
-    analysis = analyzer.calculate_hcp_and_distribution(hand)
-    
-    total_hcp = analysis['total_hcp']
-    suit_counts = analysis['suit_counts']
-    dist = analysis['dist']
-    shdc = analysis['shdc']
-    distribusi = analysis['distribusi']
-
-    possibleBids = []
-
-    bid_meanings = {
-        1:"Bid 1H",
-        2:"Bid 1S",
-        3:"Bid 1NT",
-        4:"Bid 2C",
-        5:"Bid 2D",
-        6:"Bid 2NT",
-        7:"Bid 3NT",
-        8:"Bid 4C",
-        0:"Pass"
-    }
-
-    # Determine the contract based on HCP and suit counts
-    # 1H
-    if suit_counts["H"] >= 4:
-        possibleBids.append(1)
-    if suit_counts["H"] >=4 and suit_counts["S"] >= 4:
-        possibleBids.append(1)
-    # 1S
-    if suit_counts["S"] >= 4:
-        possibleBids.append(2)
-    # 2C, 2D
-    if total_hcp >= 12 and (suit_counts["H"] < 4 or suit_counts["S"] < 4):
-        if suit_counts["C"] >= 5:
-            possibleBids.append(4)
-        if suit_counts["D"] >= 5:
-            possibleBids.append(5)
-    # Pass
-    if 0 <= total_hcp <=5 and (suit_counts["H"] < 4 or suit_counts["S"] < 4):
-        possibleBids.append(0)
-    # 1NT, 2NT, 3NT
-    if not possibleBids:
-        if 6 <= total_hcp <= 11:
-            possibleBids.append(3)
-        if 12 <= total_hcp <= 13:
-            possibleBids.append(6)
-        if 14 <= total_hcp <= 15:
-            possibleBids.append(7)
-
-    output = bid_meanings[max(possibleBids)] if possibleBids else bid_meanings[0]
-    
-    return {
-        'result': output,
-        'hcp': total_hcp,
-        'distribusi': distribusi,
-    }
\ No newline at end of file
+prec_respon_1d = Strategy(
+    'prec_respon_1d',
+    meanings={
+        1: "Bid 1H",
+        2: "Bid 1S",
+        3: "Bid 1NT",
+        4: "Bid 2C",
+        5: "Bid 2D",
+        6: "Bid 2NT",
+        7: "Bid 3NT",
+        8: "Bid 4C",
+        0: "Pass"
+    },
+    rules=[
+        # 1H
+        Rule(length('H', 4), 1),
+        Rule(length('H', 4) & length('S', 4), 1),
+        # 1S
+        Rule(length('S', 4), 2),
+        # 2C, 2D
+        When(hcp(12) & (length('H', high=3) | length('S', high=3)),
+            Rule(length('C', 5), 4),
+            Rule(length('D', 5), 5),
+        ),
+        # Pass; dicatat sebagai bid sehingga blok NT di bawah dilewati
+        Rule(hcp(0, 5) & (length('H', high=3) | length('S', high=3)), 0),
+        # 1NT, 2NT, 3NT
+        IfNoBids(
+            Rule(hcp(6, 11), 3),
+            Rule(hcp(12, 13), 6),
+            Rule(hcp(14, 15), 7),
+        ),
+    ],
+)
@@ -1,58 +1,37 @@
-from utils.bridge_analyzer import BridgeHandAnalyzer
+from src.rule_engine import Strategy, Rule, When, FirstOf, IfNoBids, Otherwise, hcp, length, length_is
 
-def prec_respon_2c(hand):
-    analyzer = BridgeHandAnalyzer()
-    analysis = analyzer.calculate_hcp_and_distribution(hand)
-    
-    total_hcp = analysis['total_hcp']
-    suit_counts = analysis['suit_counts']
-    dist = analysis['dist']
-    shdc = analysis['shdc']
-    distribusi = analysis['distribusi']
-
-    possibleBids = []
-
-    bid_meanings = {
-        1:"Bid 2D",
-        2:"Bid 2H",
-        3:"Bid 2S",
-        4:"Bid 2NT",
-        5:"Bid 3D",
-        6:"Bid 3NT",
-        7:"Bid 4NT",
-        0:"Pass"
-    }
-
-    # Determine the contract based on HCP and suit counts
-    #2D, 2H, 2S
-    if total_hcp >= 8:
-        if suit_counts["H"] == 4 or suit_counts["S"] == 4:
-            possibleBids.append(1)
-        elif suit_counts["H"] == 4 and suit_counts["S"] == 4:
-            possibleBids.append(1)
-        elif suit_counts["H"] >= 5:
-            possibleBids.append(2)
-        elif suit_counts["S"] >= 5:
-            possibleBids.append(3)
-    
-    #2NT, 3C, 3NT, 4NT
-    if (suit_counts["H"] <= 3 or suit_counts["S"] <= 3):
-        if total_hcp >=11 and suit_counts["D"] >= 6:
-            possibleBids.append(5)
-        elif 11 <= total_hcp <= 13:
-            possibleBids.append(4)
-        elif 14 <= total_hcp <= 15:
-            possibleBids.append(6)
-        elif total_hcp >= 16:
-            possibleBids.append(7)
-    #Pass
-    if not possibleBids:
-        possibleBids.append(0)
-
-    output = bid_meanings[max(possibleBids)] if possibleBids else bid_meanings[0]
-
-    return {
-        'result': output,
-        'hcp': total_hcp,
-        'distribusi': distribusi,
-    }
\ No newline at end of file
+prec_respon_2c = Strategy(
+    'prec_respon_2c',
+    meanings={
+        1: "Bid 2D",
+        2: "Bid 2H",
+        3: "Bid 2S",
+        4: "Bid 2NT",
+        5: "Bid 3D",
+        6: "Bid 3NT",
+        7: "Bid 4NT",
+        0: "Pass"
+    },
+    rules=[
+        # 2D, 2H, 2S
+        When(hcp(8),
+            FirstOf(
+                Rule(length_is('H', 4) | length_is('S', 4), 1),
+                Rule(length_is('H', 4) & length_is('S', 4), 1),
+                Rule(length('H', 5), 2),
+                Rule(length('S', 5), 3),
+            ),
+        ),
+        # 2NT, 3C, 3NT, 4NT
+        When(length('H', high=3) | length('S', high=3),
+            FirstOf(
+                Rule(hcp(11) & length('D', 6), 5),
+                Rule(hcp(11, 13), 4),
+                Rule(hcp(14, 15), 6),
+                Rule(hcp(16), 7),
+            ),
+        ),
+        # Pass
+        IfNoBids(Otherwise(0)),
+    ],
+)
@@ -0,0 +1,289 @@
+# bid_snapper_backend/src/rule_engine.py
+
+# Mesin aturan bidding deklaratif. Tiap strategi (misal prec_opening) ditulis sebagai
+# tabel aturan: kondisi atas HCP dan panjang suit S/H/D/C -> kode bid. Aturan dikompilasi
+# sekali saat import menjadi fungsi Python biasa, dan hasilnya di-memo per
+# (HCP, panjang S, H, D, C) sehingga tangan dengan bentuk yang sama tidak dievaluasi ulang.
+#
+# Semantik mengikuti fungsi if-chain lama: setiap Rule yang terpenuhi menambahkan kode bid
+# ke possibleBids, lalu hasilnya meanings[max(possibleBids)] atau meanings[default] jika kosong.
+
+import inspect
+import hashlib
+from utils.hand_encoding import encode_hand, hand_hcp, distribution
+
+SUIT_POSITION = {'S': 0, 'H': 1, 'D': 2, 'C': 3}
+BALANCED_SHAPES = {(4, 4, 3, 2), (4, 3, 3, 3), (5, 3, 3, 2)}
+
+# Memo hanya untuk bentuk tangan 13 kartu yang valid, agar ukurannya terbatas
+MAX_HCP = 37
+
+
+# ======= Predikat =======
+class Predicate:
+    """
+    Kondisi atas (hcp, shdc); bisa digabung dengan &, |, dan ~.
+
+    signature adalah description ditambah hash kode predikat custom, dan dipakai
+    describe() aturan sebagai fingerprint tabel lookup.
+    """
+
+    def __init__(self, fn, description, signature=None):
+        self.fn = fn
+        self.description = description
+        self.signature = description if signature is None else signature
+
+    def __call__(self, hcp, shdc):
+        return self.fn(hcp, shdc)
+
+    def __and__(self, other):
+        return Predicate(lambda hcp, shdc: self.fn(hcp, shdc) and other.fn(hcp, shdc),
+                         f"({self.description} and {other.description})",
+                         f"({self.signature} and {other.signature})")
+
+    def __or__(self, other):
+        return Predicate(lambda hcp, shdc: self.fn(hcp, shdc) or other.fn(hcp, shdc),
+                         f"({self.description} or {other.description})",
+                         f"({self.signature} or {other.signature})")
+
+    def __invert__(self):
+        return Predicate(lambda hcp, shdc: not self.fn(hcp, shdc), f"not {self.description}",
+                         f"not {self.signature}")
+
+    def __repr__(self):
+        return self.description
+
+
+ALWAYS = Predicate(lambda hcp, shdc: True, "always")
+
+
+def hcp(low=None, high=None):
+    """HCP dalam rentang [low, high] (inklusif); None berarti tanpa batas."""
+    low = float('-inf') if low is None else low
+    high = float('inf') if high is None else high
+    return Predicate(lambda total, shdc: low <= total <= high, f"{low} <= hcp <= {high}")
+
+
+def length(suit, low=None, high=None):
+    """Panjang suit dalam rentang [low, high] (inklusif)."""
+    i = SUIT_POSITION[suit]
+    low = float('-inf') if low is None else low
+    high = float('inf') if high is None else high
+    return Predicate(lambda total, shdc: low <= shdc[i] <= high, f"{low} <= {suit} <= {high}")
+
+
+def length_is(suit, n):
+    """Panjang suit tepat n."""
+    return length(suit, n, n)
+
+
+def shape_is(*shapes):
+    """Panjang [S, H, D, C] sama persis dengan salah satu shape."""
+    shapes = {tuple(shape) for shape in shapes}
+    return Predicate(lambda total, shdc: tuple(shdc) in shapes, f"shdc in {sorted(shapes)}")
+
+
+def balanced():
+    """Distribusi 4-4-3-2, 4-3-3-3, atau 5-3-3-2 (BridgeHandAnalyzer.is_balanced_distribution)."""
+    return Predicate(lambda total, shdc: tuple(sorted(shdc, reverse=True)) in BALANCED_SHAPES, "balanced")
+
+
+def five_card_major():
+    """Spade atau heart 5 kartu atau lebih (BridgeHandAnalyzer.has_five_card_major)."""
+    return Predicate(lambda total, shdc: shdc[0] >= 5 or shdc[1] >= 5, "five-card major")
+
+
+def code_digest(fn):
+    """
+    Hash teks sumber fungsi predikat custom beserta nilai closure-nya.
+
+    Teks sumber (bukan bytecode) dipakai agar digest sama di semua versi Python, sehingga
+    tabel lookup yang di-commit tidak dianggap basi di interpreter lain. Mengubah badan
+    fungsi (misal batas 15 menjadi 16) mengubah digest walau description tetap. Untuk lambda,
+    getsource mengembalikan seluruh baris tempat lambda ditulis, jadi perubahan lain di
+    baris itu juga membuat tabel basi.
+
+    Raises:
+        ValueError: Jika sumber fn tidak tersedia (misal dibuat lewat exec); beri version= ke custom().
+    """
+    try:
+        source = inspect.getsource(fn)
+    except (OSError, TypeError):
+        raise ValueError(f"Source of {fn!r} is not available; pass version= to custom()")
+    # Fungsi di closure di-hash menurut sumbernya; repr-nya memuat alamat memori yang berubah tiap proses
+    cells = [cell.cell_contents for cell in fn.__closure__ or ()]
+    identity = source + '|' + repr([code_digest(value) if callable(value) else value for value in cells])
+    return hashlib.sha256(identity.encode('utf-8')).hexdigest()[:12]
+
+
+def custom(fn, description, version=None):
+    """
+    Predikat bebas fn(hcp, shdc) untuk aturan yang tidak bisa ditulis dengan predikat di atas.
+
+    Fingerprint tabel lookup memakai teks sumber fn (code_digest). Jika version diberikan,
+    version dipakai sebagai gantinya; naikkan version setiap kali perilaku fn berubah,
+    termasuk lewat nilai global yang dibacanya.
+    """
+    identity = f"v{version}" if version is not None else code_digest(fn)
+    return Predicate(fn, description, f"{description}#{identity}")
+
+
+# ======= Aturan =======
+class Rule:
+    """Jika when terpenuhi, tambahkan bid ke possibleBids."""
+
+    def __init__(self, when, bid):
+        self.when = when
+        self.bid = bid
+
+    def describe(self):
+        return f"Rule({self.when.signature} -> {self.bid})"
+
+    def compile(self):
+        when, bid = self.when, self.bid
+
+        def run(total, shdc, bids):
+            if when(total, shdc):
+                bids.append(bid)
+        return when, run
+
+
+class When:
+    """Jika when terpenuhi, jalankan children berurutan (blok if bersarang)."""
+
+    def __init__(self, when, *children):
+        self.when = when
+        self.children = children
+
+    def describe(self):
+        return f"When({self.when.signature}: {', '.join(child.describe() for child in self.children)})"
+
+    def compile(self):
+        when = self.when
+        runs = [child.compile()[1] for child in self.children]
+
+        def run(total, shdc, bids):
+            if when(total, shdc):
+                for child in runs:
+                    child(total, shdc, bids)
+        return when, run
+
+
+class FirstOf:
+    """Rantai if/elif: hanya child pertama yang kondisinya terpenuhi yang dijalankan."""
+
+    def __init__(self, *children):
+        self.children = children
+
+    def describe(self):
+        return f"FirstOf({', '.join(child.describe() for child in self.children)})"
+
+    def compile(self):
+        compiled = [child.compile() for child in self.children]
+
+        def run(total, shdc, bids):
+            for when, child in compiled:
+                if when(total, shdc):
+                    child(total, shdc, bids)
+                    return
+        return ALWAYS, run
+
+
+class IfNoBids:
+    """Jalankan children hanya jika belum ada bid sama sekali (blok 'if not possibleBids')."""
+
+    def __init__(self, *children):
+        self.children = children
+
+    def describe(self):
+        return f"IfNoBids({', '.join(child.describe() for child in self.children)})"
+
+    def compile(self):
+        runs = [child.compile()[1] for child in self.children]
+
+        def run(total, shdc, bids):
+            if not bids:
+                for child in runs:
+                    child(total, shdc, bids)
+        return ALWAYS, run
+
+
+def Otherwise(bid):
+    """Rule tanpa syarat, biasanya sebagai cabang terakhir FirstOf."""
+    return Rule(ALWAYS, bid)
+
+
+# ======= Strategi =======
+def analyze_hand(hand):
+    """HCP dan panjang [S, H, D, C] dari daftar kartu."""
+    masks = encode_hand(hand)
+    return hand_hcp(masks), tuple(distribution(masks))
+
+
+class Strategy:
+    """
+    Strategi bidding yang dikompilasi dari tabel aturan.
+
+    Args:
+        name (str): Nama strategi, misal 'prec_opening'.
+        meanings (dict): Kode bid -> teks hasil.
+        rules (list): Rule/When/FirstOf/IfNoBids, dijalankan berurutan.
+        default (int): Kode bid jika tidak ada aturan yang terpenuhi.
+
+    Instance bisa dipanggil langsung dengan daftar kartu, sama seperti fungsi strategi lama.
+    Jika tabel lookup (src.bid_table) terpasang, tangan 13 kartu dijawab langsung dari tabel.
+    """
+
+    def __init__(self, name, meanings, rules, default=0):
+        self.name = name
+        self.meanings = dict(meanings)
+        self.rules = list(rules)
+        self.default = default
+        self._runs = [rule.compile()[1] for rule in self.rules]
+        self._memo = {}
+        self._table = None
+
+    def describe(self):
+        """Deskripsi teks seluruh aturan dan arti bid, dipakai sebagai fingerprint tabel lookup."""
+        meanings = ', '.join(f"{code}={text}" for code, text in sorted(self.meanings.items()))
+        rules = '; '.join(rule.describe() for rule in self.rules)
+        return f"{self.name}[default={self.default}; {meanings}] {rules}"
+
+    def evaluate(self, total_hcp, shdc):
+        """Jalankan aturan langsung, tanpa memo maupun tabel lookup."""
+        bids = []
+        for run in self._runs:
+            run(total_hcp, shdc, bids)
+        return max(bids) if bids else self.default
+
+    def attach_table(self, lookup):
+        """Pasang fungsi lookup(total_hcp, shdc) -> kode bid, atau None untuk melepasnya."""
+        self._table = lookup
+
+    def bid_code(self, total_hcp, shdc):
+        """Kode bid untuk HCP dan panjang [S, H, D, C]."""
+        valid = 0 <= total_hcp <= MAX_HCP and sum(shdc) == 13
+        if valid and self._table is not None:
+            return self._table(total_hcp, shdc)
+        key = (total_hcp,) + tuple(shdc)
+        code = self._memo.get(key)
+        if code is None:
+            code = self.evaluate(total_hcp, shdc)
+            if valid:
+                self._memo[key] = code
+        return code
+
+    def bid(self, total_hcp, shdc):
+        """Teks hasil bid untuk HCP dan panjang [S, H, D, C]."""
+        return self.meanings[self.bid_code(total_hcp, shdc)]
+
+    def __call__(self, hand):
+        total_hcp, shdc = analyze_hand(hand)
+        return {
+            'result': self.bid(total_hcp, shdc),
+            'hcp': total_hcp,
+            'distribusi': ''.join(map(str, shdc)),
+        }
+
+    def __repr__(self):
+        return f"Strategy({self.name!r}, {len(self.rules)} rules)"
@@ -0,0 +1,8 @@
+# bid_snapper_backend/tests/conftest.py
+#
+# Root repo ditambahkan ke sys.path agar `pytest` bisa dijalankan dari direktori mana pun.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,113 @@
+# bid_snapper_backend/tests/test_bid_table.py
+#
+# Tabel lookup bid (src.bid_table) harus menjawab sama dengan evaluasi aturan langsung,
+# keduanya harus sama dengan fungsi if-chain lama, dan tabel harus dianggap basi begitu
+# predikat custom berubah.
+#
+# tests/data/baseline_bids.json berisi 2000 tangan (seed tetap, condong ke HCP tinggi dan
+# distribusi tidak rata agar semua cabang tersentuh) beserta hasil fungsi if-chain
+# src/prec/*.py dari commit baseline, sebelum strategi ditulis ulang sebagai tabel aturan.
+
+import os
+import json
+import pytest
+from src.bid_table import (
+    BID_TABLE_PATH, build_tables, install_tables, make_lookup, read_tables, strategy_fingerprint,
+)
+from src.biding_strategies import BIDING_STRATEGIES
+from src.rule_engine import Strategy, Rule, FirstOf, Otherwise, analyze_hand, custom
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/baseline_bids.json')
+
+
+@pytest.fixture(scope='module')
+def baseline():
+    with open(BASELINE_PATH, 'r') as f:
+        data = json.load(f)
+    data['hands'] = [hand.split() for hand in data['hands']]
+    return data
+
+
+@pytest.fixture(scope='module')
+def committed_tables():
+    tables = read_tables(BID_TABLE_PATH)
+    assert set(tables) == set(BIDING_STRATEGIES), "data/bid_tables.npz is missing strategies"
+    return tables
+
+
+@pytest.mark.parametrize('name', list(BIDING_STRATEGIES))
+def test_committed_table_is_fresh(name, committed_tables):
+    fingerprint, _ = committed_tables[name]
+    assert fingerprint == strategy_fingerprint(BIDING_STRATEGIES[name])
+
+
+@pytest.mark.parametrize('name', list(BIDING_STRATEGIES))
+def test_table_lookup_matches_rule_evaluation(name, committed_tables, baseline):
+    strategy = BIDING_STRATEGIES[name]
+    lookup = make_lookup(committed_tables[name][1])
+    for hand in baseline['hands']:
+        total_hcp, shdc = analyze_hand(hand)
+        assert lookup(total_hcp, shdc) == strategy.evaluate(total_hcp, shdc), (name, hand)
+
+
+@pytest.mark.parametrize('use_table', [True, False], ids=['table', 'rules'])
+@pytest.mark.parametrize('name', list(BIDING_STRATEGIES))
+def test_strategy_matches_baseline_if_chain(name, use_table, committed_tables, baseline):
+    strategy = BIDING_STRATEGIES[name]
+    expected = baseline['results'][name]
+    strategy.attach_table(make_lookup(committed_tables[name][1]) if use_table else None)
+    try:
+        for i, hand in enumerate(baseline['hands']):
+            assert strategy(hand) == {
+                'result': expected['texts'][expected['index'][i]],
+                'hcp': baseline['hcp'][i],
+                'distribusi': baseline['distribusi'][i],
+            }, (name, hand)
+    finally:
+        strategy.attach_table(make_lookup(committed_tables[name][1]))
+
+
+def _strategy(predicate):
+    return Strategy('test_strategy', meanings={0: "Pass", 1: "Bid 2NT"},
+                    rules=[FirstOf(Rule(predicate, 1), Otherwise(0))])
+
+
+def _rule_of_seventeen():
+    def rule(total, shdc):
+        return total + shdc[0] >= 17
+    return rule
+
+
+def _rule_of_seventeen_copy():
+    def rule(total, shdc):
+        return total + shdc[0] >= 17
+    return rule
+
+
+def _rule_of_sixteen():
+    def rule(total, shdc):
+        return total + shdc[0] >= 16
+    return rule
+
+
+def test_changed_custom_predicate_invalidates_table(tmp_path):
+    path = str(tmp_path / 'bid_tables.npz')
+    build_tables({'test_strategy': _strategy(custom(_rule_of_seventeen(), "hcp + S >= 17"))}, path)
+
+    same_body = _strategy(custom(_rule_of_seventeen_copy(), "hcp + S >= 17"))
+    assert install_tables({'test_strategy': same_body}, path) == ['test_strategy']
+
+    # Badan fungsi berubah, description tetap
+    changed = _strategy(custom(_rule_of_sixteen(), "hcp + S >= 17"))
+    assert install_tables({'test_strategy': changed}, path) == []
+    assert changed.bid(12, (4, 3, 3, 3)) == "Bid 2NT"
+
+
+def test_custom_version_overrides_source(tmp_path):
+    path = str(tmp_path / 'bid_tables.npz')
+    build_tables({'test_strategy': _strategy(custom(lambda total, shdc: total >= 15, "strong", version=1))}, path)
+
+    assert install_tables({'test_strategy': _strategy(custom(lambda total, shdc: total >= 15, "strong", version=1))},
+                          path) == ['test_strategy']
+    assert install_tables({'test_strategy': _strategy(custom(lambda total, shdc: total >= 15, "strong", version=2))},
+                          path) == []
@@ -0,0 +1,83 @@
+# bid_snapper_backend/tests/test_optimizer.py
+#
+# Mode optimizer 'exhaustive' harus mengembalikan Pareto front yang sebenarnya dan
+# kontrak pilihan yang sama dengan NSGA-II, pada probabilitas RF sintetis dengan seed tetap.
+
+import logging
+import numpy as np
+import pytest
+from models.nsga2_optimizer import BridgeContractProblem, enumerate_contracts, optimize_contract, solve_exhaustive
+
+SELECTED_FEATURES = ['total_hcp', 'longest_suit']
+# (total_hcp, longest_suit) mentah: mencakup cabang penalti slam, suit pendek/panjang, dan bonus NT
+HANDS = [(12, 7), (24, 8), (27, 9), (31, 10), (34, 8), (37, 13)]
+
+
+def synthetic_cases(n_per_hand=2, seed=7):
+    rng = np.random.default_rng(seed)
+    for total_hcp, longest_suit in HANDS:
+        for _ in range(n_per_hand):
+            yield (np.array([total_hcp, longest_suit], dtype=np.float64),
+                   rng.dirichlet(np.ones(5)), rng.dirichlet(np.ones(4)))
+
+
+CASES = list(synthetic_cases())
+
+
+def make_problem(hand_features, suit_proba, category_proba):
+    return BridgeContractProblem(None, None, hand_features, None, SELECTED_FEATURES,
+                                 suit_proba=suit_proba, category_proba=category_proba)
+
+
+def brute_force_front(problem):
+    """Pareto front dengan perbandingan pasangan satu per satu, independen dari pareto_front_mask."""
+    X = enumerate_contracts()
+    out = {}
+    problem._evaluate(X, out)
+    F = out['F']
+    front = set()
+    for i in range(len(X)):
+        dominated = any(
+            np.all(F[j] <= F[i]) and np.any(F[j] < F[i]) for j in range(len(X)) if j != i
+        )
+        if not dominated:
+            front.add((int(X[i, 0]), int(X[i, 1])))
+    return front
+
+
+@pytest.fixture(autouse=True)
+def quiet_optimizer_logs():
+    logging.disable(logging.INFO)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+@pytest.mark.parametrize('hand_features,suit_proba,category_proba', CASES)
+def test_exhaustive_returns_true_pareto_front(hand_features, suit_proba, category_proba):
+    problem = make_problem(hand_features, suit_proba, category_proba)
+    X, F = solve_exhaustive(problem)
+    assert {(int(suit), int(level)) for suit, level in X} == brute_force_front(problem)
+    out = {}
+    problem._evaluate(X, out)
+    np.testing.assert_array_equal(F, out['F'])
+
+
+@pytest.mark.parametrize('hand_features,suit_proba,category_proba', CASES)
+def test_exhaustive_and_nsga2_pick_the_same_contract(hand_features, suit_proba, category_proba):
+    pytest.importorskip('pymoo')
+    picks = {}
+    for method in ('exhaustive', 'nsga2'):
+        best_contract, confidence = optimize_contract(
+            None, None, hand_features, None, SELECTED_FEATURES, method=method,
+            suit_proba=suit_proba, category_proba=category_proba
+        )
+        picks[method] = ((int(best_contract[0]), int(best_contract[1])), confidence)
+    (exhaustive_contract, exhaustive_confidence), (nsga2_contract, nsga2_confidence) = picks['exhaustive'], picks['nsga2']
+    if exhaustive_contract == nsga2_contract:
+        assert exhaustive_confidence == pytest.approx(nsga2_confidence)
+    else:
+        # Hanya boleh berbeda jika kedua kontrak punya objektif identik (tie)
+        out = {}
+        make_problem(hand_features, suit_proba, category_proba)._evaluate(
+            np.array([exhaustive_contract, nsga2_contract]), out)
+        np.testing.assert_array_equal(out['F'][0], out['F'][1])
@@ -1,11 +1,10 @@
 # bid_snapper_backend/utils/bridge_analyzer.py
 
 from collections import Counter
+from utils.hand_encoding import encode_hand, hand_hcp, distribution
 
 class BridgeHandAnalyzer:
     def __init__(self):
-        self.hcp_values = {"A": 4, "K": 3, "Q": 2, "J": 1}
-
         self.balance_patterns = [
             [4, 4, 3, 2],
             [4, 3, 3, 3],
@@ -20,20 +19,11 @@ class BridgeHandAnalyzer:
         return False
 
     def calculate_hcp_and_distribution(self, hand):
-        total_hcp = 0
-        suit_counts = {"S": 0, "H": 0, "D": 0, "C": 0}
-
-        for card in hand:
-            if len(card) == 2:
-                rank, suit = card[0], card[1]
-            else:
-                rank, suit = card[:2], card[2]
-
-            hcp = self.hcp_values.get(rank, 0)
-            total_hcp += hcp
-
-            if suit in suit_counts:
-                suit_counts[suit] += 1
+        # Parse sekali ke bitmask per suit, lalu HCP dan panjang suit dari operasi bit
+        masks = encode_hand(hand)
+        total_hcp = hand_hcp(masks)
+        lengths = distribution(masks)
+        suit_counts = {"S": lengths[0], "H": lengths[1], "D": lengths[2], "C": lengths[3]}
 
         shdc = [suit_counts["S"], suit_counts["H"], suit_counts["D"], suit_counts["C"]]
         dist = sorted(shdc, reverse=True)
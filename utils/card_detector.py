@@ -0,0 +1,179 @@
+# bid_snapper_backend/utils/card_detector.py
+
+import time
+import random
+import hashlib
+import threading
+import numpy as np
+from utils.metrics import stage
+from utils.tracing import span
+
+# Daftar kelas sesuai model playingCards.pt
+CLASS_NAMES = ["10C", "10D", "10H", "10S",
+               "2C", "2D", "2H", "2S",
+               "3C", "3D", "3H", "3S",
+               "4C", "4D", "4H", "4S",
+               "5C", "5D", "5H", "5S",
+               "6C", "6D", "6H", "6S",
+               "7C", "7D", "7H", "7S",
+               "8C", "8D", "8H", "8S",
+               "9C", "9D", "9H", "9S",
+               "AC", "AD", "AH", "AS",
+               "JC", "JD", "JH", "JS",
+               "KC", "KD", "KH", "KS",
+               "QC", "QD", "QH", "QS"]
+
+# Prioritas Suit (urutan SHDC)
+SUIT_ORDER = {'S': 0, 'H': 1, 'D': 2, 'C': 3}
+
+# Prioritas Rank untuk hasil biding (A, 2, ..., K) seperti biding.py
+BIDING_RANK_ORDER = {
+    'A': 0, '2': 1, '3': 2, '4': 3, '5': 4, '6': 5, '7': 6,
+    '8': 7, '9': 8, '10': 9, 'J': 10, 'Q': 11, 'K': 12
+}
+
+# Prioritas Rank untuk hasil kontrak (A, K, ..., 2) seperti kontrak.py
+KONTRAK_RANK_ORDER = {
+    'A': 0, 'K': 1, 'Q': 2, 'J': 3, '10': 4, '9': 5, '8': 6,
+    '7': 7, '6': 8, '5': 9, '4': 10, '3': 11, '2': 12
+}
+
+DEFAULT_WEIGHTS_PATH = '../yolo-weights/playingCards.pt'
+
+# Histogram latensi per tahap deteksi (lihat /metrics)
+DECODE_STAGE = stage('image_decode')
+INFERENCE_STAGE = stage('yolo_inference')
+
+
+def sort_cards(cards, rank_order):
+    """Urutkan kartu berdasarkan aturan SHDC dan rank; format tak dikenal dibiarkan apa adanya."""
+    try:
+        return sorted(cards, key=lambda card: (SUIT_ORDER[card[-1]], rank_order[card[:-1]]))
+    except KeyError as e:
+        print("⚠️ Ada format kartu tidak dikenal:", e)
+        return list(cards)
+
+
+class CardDetector:
+    """
+    Detektor kartu YOLO yang dimuat sekali per proses worker dan dipanggil
+    langsung (in-process), menggantikan subprocess biding.py / kontrak.py.
+    """
+
+    def __init__(self, weights_path=DEFAULT_WEIGHTS_PATH):
+        self.weights_path = weights_path
+        self._model = None
+        self._load_lock = threading.Lock()
+        # Predictor ultralytics tidak thread-safe, jadi inferensi diserialkan per model
+        self._infer_lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._model is not None
+
+    def load(self):
+        """Muat model YOLO jika belum dimuat."""
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    from ultralytics import YOLO
+                    self._model = YOLO(self.weights_path)
+        return self._model
+
+    def detect_image(self, img):
+        """
+        Deteksi kartu pada gambar yang sudah dibaca (array BGR dari cv2).
+
+        Returns:
+            list: Nama kelas unik yang terdeteksi (belum diurutkan).
+        """
+        model = self.load()
+        with self._infer_lock:
+            with INFERENCE_STAGE.time(), span('yolo_inference'):
+                results = model(img)
+
+        detected_classes = []
+        for r in results:
+            for box in r.boxes:
+                detected_classes.append(CLASS_NAMES[int(box.cls[0])])
+
+        # Hapus duplikasi
+        return list(set(detected_classes))
+
+    def detect_file(self, img_path, rank_order=BIDING_RANK_ORDER):
+        """
+        Baca gambar dari path lalu deteksi kartu.
+
+        Returns:
+            list: Kartu terdeteksi, diurutkan dengan rank_order.
+
+        Raises:
+            FileNotFoundError: Jika gambar tidak ditemukan atau tidak bisa dibaca.
+        """
+        import cv2
+
+        img = cv2.imread(str(img_path))
+        if img is None:
+            raise FileNotFoundError(f"Gambar tidak ditemukan: {img_path}")
+        return sort_cards(self.detect_image(img), rank_order)
+
+    def detect_bytes(self, data, rank_order=BIDING_RANK_ORDER):
+        """
+        Decode gambar langsung dari bytes (cv2.imdecode) lalu deteksi kartu,
+        tanpa menulis file sementara.
+
+        Returns:
+            list: Kartu terdeteksi, diurutkan dengan rank_order.
+
+        Raises:
+            ValueError: Jika bytes bukan gambar yang bisa di-decode.
+        """
+        import cv2
+
+        with DECODE_STAGE.time(), span('image_decode', size=len(data)):
+            img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if img is None:
+            raise ValueError("Gambar tidak valid atau tidak bisa di-decode")
+        return sort_cards(self.detect_image(img), rank_order)
+
+
+class StubCardDetector(CardDetector):
+    """
+    Pengganti YOLO untuk load test dan pengembangan offline: gambar tetap di-decode
+    seperti biasa, tetapi 13 kartu dipilih deterministik dari hash piksel gambar, dengan
+    jeda inferensi buatan (inference_delay detik) untuk meniru biaya model.
+    """
+
+    def __init__(self, weights_path=None, inference_delay=0.0):
+        super().__init__(weights_path)
+        self.inference_delay = inference_delay
+
+    @property
+    def loaded(self):
+        return True
+
+    def load(self):
+        return None
+
+    def detect_image(self, img):
+        with self._infer_lock:
+            with INFERENCE_STAGE.time(), span('yolo_inference', stub=True):
+                if self.inference_delay:
+                    time.sleep(self.inference_delay)
+                seed = int.from_bytes(hashlib.sha256(img.tobytes()).digest()[:8], 'big')
+                return random.Random(seed).sample(CLASS_NAMES, 13)
+
+
+DETECTORS = {
+    'yolo': CardDetector,
+    'stub': StubCardDetector,
+}
+
+
+def create_detector(kind='yolo', weights_path=DEFAULT_WEIGHTS_PATH, inference_delay=0.0):
+    """Buat detektor berdasarkan nama ('yolo' atau 'stub')."""
+    if kind not in DETECTORS:
+        raise ValueError(f"Unknown detector '{kind}', expected one of {sorted(DETECTORS)}")
+    if kind == 'stub':
+        return StubCardDetector(weights_path, inference_delay=inference_delay)
+    return CardDetector(weights_path)
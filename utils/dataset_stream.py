@@ -0,0 +1,107 @@
+# bid_snapper_backend/utils/dataset_stream.py
+
+import json
+
+try:
+    import ijson
+except ImportError:  # ijson opsional; fallback ke parser inkremental bawaan
+    ijson = None
+
+READ_BLOCK_SIZE = 1 << 20
+
+
+def _iter_json_lines(f):
+    for line_number, line in enumerate(f, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise json.JSONDecodeError(f"Invalid JSON on line {line_number}: {e.msg}", e.doc, e.pos)
+
+
+def _iter_json_array(f, block_size=READ_BLOCK_SIZE):
+    """Parse array JSON tingkat atas secara inkremental: baca per blok, decode per elemen."""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+    started = False
+
+    def fill():
+        nonlocal buffer, pos, eof
+        block = f.read(block_size)
+        if not block:
+            eof = True
+        buffer = buffer[pos:] + block
+        pos = 0
+
+    while True:
+        # Lewati spasi, '[' pembuka, dan koma pemisah
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+                pos += 1
+            if pos < len(buffer):
+                break
+            if eof:
+                raise json.JSONDecodeError("Unexpected end of JSON array", buffer, pos)
+            fill()
+
+        char = buffer[pos]
+        if not started:
+            if char != '[':
+                raise json.JSONDecodeError("Expected top-level JSON array", buffer, pos)
+            started = True
+            pos += 1
+            continue
+        if char == ']':
+            return
+        if char == ',':
+            pos += 1
+            continue
+
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # Elemen mungkin terpotong di batas blok; baca blok berikutnya dan coba lagi
+            if eof:
+                raise
+            fill()
+            continue
+        # Angka di ujung buffer bisa terpotong (misal "12" dari "123"), pastikan ada penutupnya
+        if end == len(buffer) and not eof:
+            fill()
+            continue
+        pos = end
+        yield item
+
+
+def iter_boards(path):
+    """
+    Baca board satu per satu tanpa memuat seluruh file ke memori.
+
+    File .jsonl/.ndjson dibaca per baris. File .json harus berisi satu array board;
+    jika ijson terpasang, ijson dipakai, selain itu parser inkremental bawaan.
+    """
+    if path.endswith(('.jsonl', '.ndjson')):
+        with open(path, 'r') as f:
+            yield from _iter_json_lines(f)
+    elif ijson is not None:
+        with open(path, 'rb') as f:
+            yield from ijson.items(f, 'item')
+    else:
+        with open(path, 'r') as f:
+            yield from _iter_json_array(f)
+
+
+def iter_board_chunks(path, chunk_size=50000):
+    """Kelompokkan board dari iter_boards menjadi list berukuran maksimal chunk_size."""
+    chunk = []
+    for board in iter_boards(path):
+        chunk.append(board)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
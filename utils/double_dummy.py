@@ -0,0 +1,311 @@
+# bid_snapper_backend/utils/double_dummy.py
+
+# Tabel double-dummy (jumlah trik per denominasi x declarer) untuk deal lengkap 4 tangan,
+# dengan solver yang bisa ditukar dan cache biner berukuran tetap per deal.
+#
+# Deal disimpan sebagai seat (0..3 = N, E, S, W) untuk tiap kartu 0..51 (suit * 13 + posisi
+# rank, urutan suit S, H, D, C, posisi 0 = kartu 2), dipadatkan 2 bit per kartu = 13 byte.
+# Tabel trik berbentuk (5, 4): denominasi S, H, D, C, NT (sama dengan kelas suit model)
+# x declarer N, E, S, W.
+
+import os
+import logging
+from abc import ABC, abstractmethod
+import numpy as np
+from utils.hand_encoding import SUITS, RANK_BITS, SUIT_INDEX
+from utils.helpers import estimate_score_corrected
+
+logger = logging.getLogger(__name__)
+
+SEATS = ('N', 'E', 'S', 'W')
+DENOMINATIONS = ('S', 'H', 'D', 'C', 'N')
+RANK_CHARS = '23456789TJQKA'
+
+# Satu record cache: deal terpadatkan (13 byte) + tabel trik (20 byte)
+RECORD_DTYPE = np.dtype([('deal', np.uint8, 13), ('tricks', np.uint8, (5, 4))])
+
+
+# ======= Encoding deal =======
+def card_index(card):
+    """Index kartu 0..51 (suit * 13 + posisi rank)."""
+    try:
+        return SUIT_INDEX[card[-1]] * 13 + RANK_BITS[card[:-1]]
+    except (KeyError, IndexError):
+        raise ValueError(f"Kartu tidak dikenali: {card}")
+
+
+def hands_to_seats(hands):
+    """
+    Ubah empat tangan [N, E, S, W] menjadi array seat (52,) uint8.
+
+    Raises:
+        ValueError: Jika bukan 4 x 13 kartu berbeda.
+    """
+    if len(hands) != 4 or any(len(hand) != 13 for hand in hands):
+        raise ValueError("A full deal needs four hands of 13 cards")
+    seats = np.full(52, 255, dtype=np.uint8)
+    for seat, hand in enumerate(hands):
+        for card in hand:
+            index = card_index(card)
+            if seats[index] != 255:
+                raise ValueError(f"Duplicate card in deal: {card}")
+            seats[index] = seat
+    return seats
+
+
+def seats_to_hands(seats):
+    """Kebalikan hands_to_seats: list 4 tangan [N, E, S, W] dengan rank 'T' untuk sepuluh."""
+    hands = [[], [], [], []]
+    # Urutkan per suit (S, H, D, C) dari As ke 2
+    for suit in range(4):
+        for rank in range(12, -1, -1):
+            hands[seats[suit * 13 + rank]].append(RANK_CHARS[rank] + SUITS[suit])
+    return hands
+
+
+def seats_to_pbn(seats):
+    """Format PBN 'N:S.H.D.C E S W' untuk solver."""
+    hands = []
+    for seat in range(4):
+        holdings = []
+        for suit in range(4):
+            ranks = seats[suit * 13:(suit + 1) * 13]
+            holdings.append(''.join(RANK_CHARS[rank] for rank in range(12, -1, -1) if ranks[rank] == seat))
+        hands.append('.'.join(holdings))
+    return 'N:' + ' '.join(hands)
+
+
+def pack_seats(seats):
+    """Padatkan array seat (n, 52) menjadi (n, 13) byte, 4 kartu per byte."""
+    seats = np.asarray(seats, dtype=np.uint8).reshape(-1, 13, 4)
+    return seats[..., 0] | (seats[..., 1] << 2) | (seats[..., 2] << 4) | (seats[..., 3] << 6)
+
+
+def unpack_seats(packed):
+    """Kebalikan pack_seats: (n, 13) byte menjadi array seat (n, 52)."""
+    packed = np.asarray(packed, dtype=np.uint8)
+    return np.stack([(packed >> shift) & 3 for shift in (0, 2, 4, 6)], axis=-1).reshape(len(packed), 52)
+
+
+def random_seats(n, seed=42, start=0):
+    """
+    n deal lengkap acak sebagai array seat (n, 52). Deal ke-i hanya bergantung pada
+    (seed, start + i), sehingga hasilnya sama berapa pun ukuran chunk-nya.
+    """
+    base = np.repeat(np.arange(4, dtype=np.uint8), 13)
+    seats = np.empty((n, 52), dtype=np.uint8)
+    for i in range(n):
+        seats[i] = np.random.default_rng([seed, start + i]).permutation(base)
+    return seats
+
+
+def board_to_seats(board, rng):
+    """
+    Deal lengkap untuk satu board dataset.
+
+    Board dengan kunci 'deal' (string PBN) dipakai apa adanya. Board dataset biasa hanya
+    berisi 'hand1' (N) dan 'hand2' (S); 26 kartu lawan dibagi acak ke E/W dengan rng.
+    """
+    if 'deal' in board:
+        return pbn_to_seats(board['deal'])
+    seats = np.full(52, 255, dtype=np.uint8)
+    for seat, key in ((0, 'hand1'), (2, 'hand2')):
+        hand = board[key]
+        if len(hand) != 13:
+            raise ValueError(f"Invalid hand size for {key}: {len(hand)}")
+        for card in hand:
+            index = card_index(card)
+            if seats[index] != 255:
+                raise ValueError(f"Duplicate card in board: {card}")
+            seats[index] = seat
+    remaining = np.flatnonzero(seats == 255)
+    seats[rng.permutation(remaining)[:13]] = 1
+    seats[seats == 255] = 3
+    return seats
+
+
+def pbn_to_seats(pbn):
+    """Parse string PBN ('N:...' dengan 4 tangan dipisah spasi) menjadi array seat (52,)."""
+    first, _, body = pbn.partition(':')
+    start = SEATS.index(first.strip().upper())
+    hands = [None] * 4
+    for offset, hand in enumerate(body.split()):
+        cards = []
+        for suit, holding in zip(SUITS, hand.split('.')):
+            cards.extend(rank + suit for rank in holding.upper())
+        hands[(start + offset) % 4] = cards
+    return hands_to_seats(hands)
+
+
+# ======= Solver =======
+class DDSolver(ABC):
+    """
+    Antarmuka solver double-dummy. solve_batch menerima array seat (n, 52) dan
+    mengembalikan tabel trik (n, 5, 4) uint8. Instance harus bisa di-pickle agar
+    bisa dikirim ke worker process.
+
+    Subclass yang belum mengimplementasikan solve_batch gagal saat dibuat (TypeError),
+    bukan di tengah run batch multi-proses.
+    """
+
+    name = 'base'
+
+    @abstractmethod
+    def solve_batch(self, seats):
+        """Tabel trik (n, 5, 4) uint8 untuk array seat (n, 52)."""
+
+
+class EndplaySolver(DDSolver):
+    """Solver DDS (Bo Haglund) lewat paket endplay, dimuat saat pertama dipakai."""
+
+    name = 'endplay'
+    # DDS membatasi jumlah tabel per panggilan CalcAllTables
+    max_tables_per_call = 32
+
+    def solve_batch(self, seats):
+        try:
+            from endplay.types import Deal, Denom, Player
+            from endplay.dds import calc_all_tables
+        except ImportError as e:
+            raise ImportError("The 'endplay' solver needs the endplay package (pip install endplay)") from e
+
+        denoms = (Denom.spades, Denom.hearts, Denom.diamonds, Denom.clubs, Denom.nt)
+        players = (Player.north, Player.east, Player.south, Player.west)
+        tricks = np.zeros((len(seats), 5, 4), dtype=np.uint8)
+        for start in range(0, len(seats), self.max_tables_per_call):
+            deals = [Deal(seats_to_pbn(row)) for row in seats[start:start + self.max_tables_per_call]]
+            for i, table in enumerate(calc_all_tables(deals), start=start):
+                for d, denom in enumerate(denoms):
+                    for p, player in enumerate(players):
+                        tricks[i, d, p] = table[denom, player]
+        return tricks
+
+
+class StubSolver(DDSolver):
+    """
+    Estimasi trik deterministik tanpa dependensi, untuk test dan pengembangan lokal.
+
+    Trik partnership = 6 + (HCP partnership - 20) / 3 + (panjang trump - 8), dibulatkan
+    dan dibatasi 0..13; partnership lawan mendapat sisanya. Bukan hasil double-dummy.
+    """
+
+    name = 'stub'
+    hcp_by_rank = np.array([0] * 9 + [1, 2, 3, 4])
+
+    def solve_batch(self, seats):
+        seats = np.asarray(seats).reshape(len(seats), 4, 13)
+        hcp = np.zeros((len(seats), 4))
+        lengths = np.zeros((len(seats), 4, 5))
+        for seat in range(4):
+            held = seats == seat
+            hcp[:, seat] = (held * self.hcp_by_rank).sum(axis=(1, 2))
+            lengths[:, seat, :4] = held.sum(axis=2)
+        # Partnership N/S = seat 0 dan 2, E/W = seat 1 dan 3
+        pair_hcp = hcp[:, [0, 1]] + hcp[:, [2, 3]]
+        pair_lengths = lengths[:, [0, 1]] + lengths[:, [2, 3]]
+        pair_lengths[..., 4] = 8
+        ns = np.clip(np.rint(6 + (pair_hcp[:, 0, None] - 20) / 3 + (pair_lengths[:, 0] - 8)), 0, 13)
+        ew = np.clip(np.rint(6 + (pair_hcp[:, 1, None] - 20) / 3 + (pair_lengths[:, 1] - 8)), 0, 13)
+        # Jumlah trik kedua sisi harus 13: sisi dengan estimasi lebih kuat didahulukan
+        ns = np.where(ns >= ew, ns, 13 - ew)
+        tricks = np.empty((len(seats), 5, 4), dtype=np.uint8)
+        tricks[:, :, 0] = tricks[:, :, 2] = ns
+        tricks[:, :, 1] = tricks[:, :, 3] = 13 - ns
+        return tricks
+
+
+SOLVERS = {
+    'endplay': EndplaySolver,
+    'stub': StubSolver,
+}
+
+
+def get_solver(name):
+    """
+    Ambil solver berdasarkan nama.
+
+    Raises:
+        ValueError: Jika nama solver tidak dikenal.
+    """
+    try:
+        return SOLVERS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown solver '{name}', expected one of {sorted(SOLVERS)}")
+
+
+# ======= Kontrak optimal =======
+def optimal_contract(tricks, declarers=(0, 2)):
+    """
+    Kontrak dengan skor tertinggi yang dibuat oleh partnership declarers.
+
+    Untuk tiap denominasi dipakai jumlah trik terbaik dari kedua declarer; kontrak di
+    level (trik - 6) dinilai dengan estimate_score_corrected. Jika tidak ada denominasi
+    dengan 7 trik atau lebih, dipakai level 1 di denominasi dengan trik terbanyak.
+
+    Returns:
+        str: Kontrak seperti '4S' atau '3N', format yang sama dengan kolom 'contract' dataset.
+    """
+    best_tricks = np.asarray(tricks)[:, list(declarers)].max(axis=1)
+    best = None
+    for denomination, count in enumerate(best_tricks):
+        level = int(count) - 6
+        if level < 1:
+            continue
+        score = estimate_score_corrected(denomination, level)
+        if best is None or score > best[0]:
+            best = (score, level, denomination)
+    if best is None:
+        return f"1{DENOMINATIONS[int(np.argmax(best_tricks))]}"
+    return f"{best[1]}{DENOMINATIONS[best[2]]}"
+
+
+# ======= Cache biner =======
+class DDTableCache:
+    """
+    Cache tabel double-dummy di satu file biner berisi record RECORD_DTYPE (33 byte/deal).
+
+    File hanya ditambah di akhir sehingga proses yang terhenti bisa dilanjutkan; deal
+    yang sudah ada di cache tidak dihitung ulang.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._keys = set()
+        if os.path.exists(path):
+            size = os.path.getsize(path)
+            if size % RECORD_DTYPE.itemsize:
+                raise ValueError(f"Corrupt double-dummy cache {path}: size {size} is not a multiple "
+                                 f"of {RECORD_DTYPE.itemsize}")
+            self._keys = {bytes(record) for record in self.read()['deal']}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, packed_deal):
+        return bytes(packed_deal) in self._keys
+
+    def missing(self, seats):
+        """Mask deal (array seat (n, 52)) yang belum ada di cache, termasuk duplikat dalam batch."""
+        seen = set(self._keys)
+        mask = np.zeros(len(seats), dtype=bool)
+        for i, packed in enumerate(pack_seats(seats)):
+            key = bytes(packed)
+            if key not in seen:
+                seen.add(key)
+                mask[i] = True
+        return mask
+
+    def append(self, seats, tricks):
+        """Tambahkan deal (array seat (n, 52)) beserta tabel trik (n, 5, 4) ke cache."""
+        records = np.empty(len(seats), dtype=RECORD_DTYPE)
+        records['deal'] = pack_seats(seats)
+        records['tricks'] = tricks
+        with open(self.path, 'ab') as f:
+            records.tofile(f)
+        self._keys.update(bytes(packed) for packed in records['deal'])
+
+    def read(self):
+        """Seluruh isi cache sebagai array record (memory-mapped, tanpa salinan)."""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return np.memmap(self.path, dtype=RECORD_DTYPE, mode='r')
@@ -0,0 +1,96 @@
+# bid_snapper_backend/utils/hand_encoding.py
+
+# Representasi kompak satu tangan bridge: empat bitmask 13-bit (urutan S, H, D, C),
+# bit 0 = kartu 2 sampai bit 12 = As. Tangan cukup di-parse sekali, lalu semua
+# metrik (HCP, distribusi, honor, kontrol, quick tricks) dihitung dengan operasi bit.
+
+SUITS = ('S', 'H', 'D', 'C')
+SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS)}
+
+# Posisi bit per rank; '10' dan 'T' sama-sama dipakai oleh sumber data yang berbeda
+RANK_BITS = {
+    '2': 0, '3': 1, '4': 2, '5': 3, '6': 4, '7': 5, '8': 6, '9': 7,
+    'T': 8, '10': 8, 'J': 9, 'Q': 10, 'K': 11, 'A': 12,
+}
+
+ACE = 1 << 12
+KING = 1 << 11
+QUEEN = 1 << 10
+JACK = 1 << 9
+
+# Bobot honor per kombinasi (A, K, Q) dalam satu suit, diindeks dengan (mask >> 10) & 0b111
+# (bit 2 = A, bit 1 = K, bit 0 = Q): -, Q, K, KQ, A, AQ, AK, AKQ
+HONOR_WEIGHTS = (0.0, 0.25, 0.5, 1.0, 1.0, 1.5, 2.0, 3.0)
+QUICK_TRICKS = (0.0, 0.0, 0.5, 1.0, 1.0, 1.0, 2.0, 2.0)
+
+
+def encode_hand(hand):
+    """
+    Parse daftar kartu (misal 'AS', 'TD', '10H') menjadi list 4 bitmask [S, H, D, C].
+
+    Raises:
+        ValueError: Jika rank atau suit kartu tidak dikenali.
+    """
+    masks = [0, 0, 0, 0]
+    for card in hand:
+        try:
+            masks[SUIT_INDEX[card[-1]]] |= 1 << RANK_BITS[card[:-1]]
+        except (KeyError, IndexError):
+            raise ValueError(f"Kartu tidak dikenali: {card}")
+    return masks
+
+
+def suit_length(mask):
+    return bin(mask).count('1')
+
+
+def suit_hcp(mask):
+    return 4 * ((mask >> 12) & 1) + 3 * ((mask >> 11) & 1) + 2 * ((mask >> 10) & 1) + ((mask >> 9) & 1)
+
+
+def suit_honor_weight(mask):
+    return HONOR_WEIGHTS[(mask >> 10) & 0b111]
+
+
+def suit_quick_tricks(mask):
+    return QUICK_TRICKS[(mask >> 10) & 0b111]
+
+
+def suit_controls(mask):
+    return 2 * ((mask >> 12) & 1) + ((mask >> 11) & 1)
+
+
+# Tabel lookup 8192 entri per metrik suit, diindeks langsung dengan bitmask 13-bit suit.
+# Dibangun sekali saat import dari fungsi suit_* di atas.
+SUIT_MASKS = range(1 << 13)
+SUIT_LENGTH_TABLE = tuple(suit_length(mask) for mask in SUIT_MASKS)
+SUIT_HCP_TABLE = tuple(suit_hcp(mask) for mask in SUIT_MASKS)
+SUIT_HONOR_WEIGHT_TABLE = tuple(suit_honor_weight(mask) for mask in SUIT_MASKS)
+SUIT_QUICK_TRICKS_TABLE = tuple(suit_quick_tricks(mask) for mask in SUIT_MASKS)
+SUIT_CONTROLS_TABLE = tuple(suit_controls(mask) for mask in SUIT_MASKS)
+SUIT_ACES_TABLE = tuple((mask >> 12) & 1 for mask in SUIT_MASKS)
+
+
+def distribution(masks):
+    """Panjang tiap suit [S, H, D, C]."""
+    s, h, d, c = masks
+    return [SUIT_LENGTH_TABLE[s], SUIT_LENGTH_TABLE[h], SUIT_LENGTH_TABLE[d], SUIT_LENGTH_TABLE[c]]
+
+
+def hand_hcp(masks):
+    s, h, d, c = masks
+    return SUIT_HCP_TABLE[s] + SUIT_HCP_TABLE[h] + SUIT_HCP_TABLE[d] + SUIT_HCP_TABLE[c]
+
+
+def hand_controls(masks):
+    """Return (total_controls, aces_count); As = 2 kontrol, King = 1 kontrol."""
+    s, h, d, c = masks
+    controls = SUIT_CONTROLS_TABLE[s] + SUIT_CONTROLS_TABLE[h] + SUIT_CONTROLS_TABLE[d] + SUIT_CONTROLS_TABLE[c]
+    aces = SUIT_ACES_TABLE[s] + SUIT_ACES_TABLE[h] + SUIT_ACES_TABLE[d] + SUIT_ACES_TABLE[c]
+    return controls, aces
+
+
+def hand_quick_tricks(masks):
+    s, h, d, c = masks
+    return (SUIT_QUICK_TRICKS_TABLE[s] + SUIT_QUICK_TRICKS_TABLE[h]
+            + SUIT_QUICK_TRICKS_TABLE[d] + SUIT_QUICK_TRICKS_TABLE[c])
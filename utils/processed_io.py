@@ -0,0 +1,102 @@
+# bid_snapper_backend/utils/processed_io.py
+
+import os
+import json
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Nama kolom fitur disimpan terpisah karena .npy hanya menyimpan array
+FEATURE_COLUMNS_FILE = 'feature_columns.json'
+LABEL_FILES = ('y_suit_train', 'y_suit_test', 'y_category_train', 'y_category_test')
+
+
+def _write_columns(processed_dir, columns):
+    with open(os.path.join(processed_dir, FEATURE_COLUMNS_FILE), 'w') as f:
+        json.dump(list(columns), f)
+
+
+def warn_stale_csv(processed_dir, name):
+    """
+    Peringatkan jika {name}.csv dari run sebelumnya masih ada saat hanya {name}.npy yang ditulis.
+
+    CSV lama dibiarkan agar layout lama tetap bisa dibaca; load_features selalu
+    mengutamakan .npy, jadi CSV tersebut hanya basi bagi pembaca CSV langsung.
+    """
+    csv_path = os.path.join(processed_dir, f'{name}.csv')
+    if os.path.exists(csv_path):
+        logger.warning(f"{csv_path} is from an earlier run and no longer matches {name}.npy; "
+                       "load_features reads the .npy, rerun with write_csv=True to refresh the CSV")
+
+
+def save_features(processed_dir, name, X, columns=None):
+    """
+    Simpan matriks fitur sebagai {name}.npy (float64) beserta daftar kolomnya.
+
+    Args:
+        processed_dir (str): Direktori hasil preprocessing.
+        name (str): Nama split, misal 'X_train'.
+        X: DataFrame atau array 2D.
+        columns (list, optional): Nama kolom jika X berupa array.
+    """
+    if columns is None:
+        columns = list(X.columns)
+    np.save(os.path.join(processed_dir, f'{name}.npy'), np.ascontiguousarray(np.asarray(X, dtype=np.float64)))
+    _write_columns(processed_dir, columns)
+
+
+def create_features_memmap(processed_dir, name, n_rows, columns):
+    """
+    Buat file {name}.npy kosong yang bisa diisi per chunk (untuk preprocessing streaming).
+
+    Returns:
+        np.memmap berukuran (n_rows, len(columns)) dalam mode tulis.
+    """
+    _write_columns(processed_dir, columns)
+    return np.lib.format.open_memmap(
+        os.path.join(processed_dir, f'{name}.npy'), mode='w+', dtype=np.float64, shape=(n_rows, len(columns))
+    )
+
+
+def load_features(processed_dir, name, mmap=True):
+    """
+    Muat matriks fitur {name}. File .npy selalu diutamakan dan di-memory-map tanpa
+    menyalin data; {name}.csv dari layout lama hanya dibaca jika .npy belum ada.
+    Format yang dibaca dicatat di log.
+
+    Returns:
+        X, columns: Array 2D (np.memmap jika mmap=True) dan daftar nama kolom.
+
+    Raises:
+        FileNotFoundError: Jika .npy maupun .csv tidak ditemukan.
+    """
+    npy_path = os.path.join(processed_dir, f'{name}.npy')
+    columns_path = os.path.join(processed_dir, FEATURE_COLUMNS_FILE)
+    if os.path.exists(npy_path) and os.path.exists(columns_path):
+        with open(columns_path, 'r') as f:
+            columns = json.load(f)
+        logger.info(f"Loading {name} from {npy_path}")
+        return np.load(npy_path, mmap_mode='r' if mmap else None), columns
+
+    csv_path = os.path.join(processed_dir, f'{name}.csv')
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"Neither {npy_path} nor {csv_path} found")
+    logger.info(f"Loading {name} from {csv_path} (legacy CSV layout, no .npy found)")
+    frame = pd.read_csv(csv_path)
+    return frame.to_numpy(dtype=np.float64), list(frame.columns)
+
+
+def load_features_frame(processed_dir, name, mmap=True):
+    """Seperti load_features, tetapi dibungkus DataFrame tanpa menyalin array."""
+    X, columns = load_features(processed_dir, name, mmap=mmap)
+    return pd.DataFrame(X, columns=columns, copy=False)
+
+
+def load_labels(processed_dir, mmap=True):
+    """Muat keempat array label sebagai dict {nama: array}."""
+    return {
+        name: np.load(os.path.join(processed_dir, f'{name}.npy'), mmap_mode='r' if mmap else None)
+        for name in LABEL_FILES
+    }
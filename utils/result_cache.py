@@ -0,0 +1,119 @@
+# bid_snapper_backend/utils/result_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from utils.hand_encoding import encode_hand
+
+
+def hand_key(hand):
+    """Encode satu tangan menjadi integer 52-bit (13 bit per suit, urutan S, H, D, C)."""
+    s, h, d, c = encode_hand(hand)
+    return (s << 39) | (h << 26) | (d << 13) | c
+
+
+def deal_key(hand1, hand2):
+    """
+    Key kanonik untuk pasangan tangan: urutan kartu dan penulisan rank ('T'/'10')
+    tidak berpengaruh. Urutan hand1/hand2 tetap dibedakan karena fitur model
+    (balance_score1/balance_score2) dan output (hand1_hcp/hand2_hcp) bergantung posisi.
+    """
+    return hand_key(hand1), hand_key(hand2)
+
+
+class DealCache:
+    """
+    LRU cache hasil rekomendasi per deal dengan TTL dan penghitung hit/miss.
+
+    Setiap akses membawa versi model; jika versi berbeda dengan versi isi cache,
+    seluruh isi cache dibuang sehingga hasil dari model lama tidak pernah dipakai.
+
+    Jika current_version (callable, misal lambda: registry.version) diberikan, versi isi
+    cache selalu mengikuti versi model aktif: akses dari request lambat yang masih memegang
+    snapshot lama setelah reload dianggap miss (get) atau dibuang (put), tanpa mengosongkan
+    cache versi baru.
+    """
+
+    def __init__(self, maxsize=4096, ttl=600.0, current_version=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.current_version = current_version
+        self.version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.stale_puts = 0
+
+    def _check_version(self, version):
+        """Selaraskan versi isi cache; False jika version lebih lama dari model aktif."""
+        current = self.current_version() if self.current_version is not None else version
+        if current != self.version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self.version = current
+        return version == current
+
+    def get(self, key, version):
+        """Ambil hasil untuk key, atau None jika tidak ada, kedaluwarsa, atau versi model berubah."""
+        if self.maxsize <= 0:
+            return None
+        with self._lock:
+            if not self._check_version(version):
+                self.misses += 1
+                return None
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, value = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, version):
+        """
+        Simpan hasil untuk key; entri paling lama tidak dipakai dibuang jika cache penuh.
+        Hasil dari versi model yang sudah diganti tidak disimpan.
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if not self._check_version(version):
+                self.stale_puts += 1
+                return
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'version': self.version,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'stale_puts': self.stale_puts,
+            }
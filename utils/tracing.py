@@ -0,0 +1,307 @@
+# bid_snapper_backend/utils/tracing.py
+
+# Tracing span per request dengan sampling. Sebagian request (sample_rate) direkam
+# lengkap: setiap span (konstruksi analyzer, ekstraksi fitur, panggilan RF, generasi
+# NSGA-II, decode/inferensi deteksi, baca upload, tunggu antrian) dicatat dengan waktu
+# mulai/selesai dari time.perf_counter. Hanya N trace paling lambat yang disimpan (ring
+# buffer berbasis heap), dan bisa diekspor sebagai JSON Chrome trace (chrome://tracing,
+# Perfetto) untuk dilihat sebagai flame chart.
+#
+# Trace aktif disimpan di contextvars, sehingga span di thread worker pool ikut masuk
+# ke trace request asalnya (BoundedWorkerPool menjalankan pekerjaan dalam salinan context).
+# Request yang tidak di-sampling hanya membayar satu ContextVar.get per span.
+
+import os
+import json
+import time
+import heapq
+import random
+import itertools
+import threading
+import contextvars
+from datetime import datetime
+
+_current_trace = contextvars.ContextVar('current_trace', default=None)
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+
+class Trace:
+    """Satu request yang di-sampling: nama, atribut, dan daftar span yang sudah selesai."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, name, attrs=None):
+        self.id = next(self._ids)
+        self.name = name
+        self.attrs = dict(attrs or {})
+        self.started_at = datetime.now().isoformat(timespec='milliseconds')
+        self.start = time.perf_counter()
+        self.end = None
+        self.spans = []
+        self._span_ids = itertools.count(1)
+
+    @property
+    def duration(self):
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def add_span(self, name, start, end, parent=None, attrs=None, tid=None):
+        """Catat span yang sudah selesai (start/end dari time.perf_counter)."""
+        span_id = next(self._span_ids)
+        self.spans.append({
+            'id': span_id,
+            'parent': parent,
+            'name': name,
+            'start': start,
+            'end': end,
+            'tid': tid if tid is not None else threading.get_ident(),
+            'attrs': attrs or {},
+        })
+        return span_id
+
+    def to_dict(self):
+        return {
+            'trace_id': self.id,
+            'name': self.name,
+            'started_at': self.started_at,
+            'duration_ms': self.duration * 1000,
+            'attrs': self.attrs,
+            'spans': [
+                {
+                    'id': span['id'],
+                    'parent': span['parent'],
+                    'name': span['name'],
+                    'offset_ms': (span['start'] - self.start) * 1000,
+                    'duration_ms': (span['end'] - span['start']) * 1000,
+                    'attrs': span['attrs'],
+                }
+                for span in sorted(self.spans, key=lambda span: span['start'])
+            ],
+        }
+
+    def chrome_events(self, pid=None):
+        """Event 'complete' (ph='X') format Chrome trace; ts dan dur dalam mikrodetik."""
+        pid = pid if pid is not None else os.getpid()
+        events = [{
+            'name': self.name, 'cat': 'request', 'ph': 'X', 'pid': pid, 'tid': f'trace-{self.id}',
+            'ts': self.start * 1e6, 'dur': self.duration * 1e6, 'args': dict(self.attrs, trace_id=self.id),
+        }]
+        for span in self.spans:
+            events.append({
+                'name': span['name'], 'cat': self.name, 'ph': 'X', 'pid': pid, 'tid': span['tid'],
+                'ts': span['start'] * 1e6, 'dur': (span['end'] - span['start']) * 1e6,
+                'args': dict(span['attrs'], trace_id=self.id),
+            })
+        return events
+
+
+class _Span:
+    """Context manager untuk satu span di trace aktif."""
+
+    __slots__ = ('trace', 'name', 'attrs', 'start', 'parent', '_token')
+
+    def __init__(self, trace, name, attrs):
+        self.trace = trace
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        # Parent dicatat dengan nama span yang sedang terbuka di context ini
+        self.parent = _current_span.get()
+        self._token = _current_span.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        _current_span.reset(self._token)
+        attrs = self.attrs
+        if exc_type is not None:
+            attrs = dict(attrs, error=exc_type.__name__)
+        self.trace.add_span(self.name, self.start, end, parent=self.parent and self.parent.name, attrs=attrs)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class _TraceScope:
+    """Context manager yang mengaktifkan trace selama request lalu menyerahkannya ke tracer."""
+
+    __slots__ = ('tracer', 'trace', '_token')
+
+    def __init__(self, tracer, trace):
+        self.tracer = tracer
+        self.trace = trace
+
+    def __enter__(self):
+        self._token = _current_trace.set(self.trace)
+        return self.trace
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_trace.reset(self._token)
+        self.trace.end = time.perf_counter()
+        if exc_type is not None:
+            self.trace.attrs['error'] = exc_type.__name__
+        self.tracer.record(self.trace)
+        return False
+
+
+class Tracer:
+    """
+    Sampling trace per request dan penyimpanan N trace paling lambat.
+
+    Args:
+        sample_rate (float): Fraksi request yang direkam (0 = mati, 1 = semua).
+        keep_slowest (int): Jumlah trace paling lambat yang disimpan.
+    """
+
+    def __init__(self, sample_rate=0.0, keep_slowest=20, seed=None):
+        self.sample_rate = sample_rate
+        self.keep_slowest = keep_slowest
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._heap = []  # (durasi, id, trace); elemen terkecil dibuang saat penuh
+        self._sampled = 0
+        self._started = 0
+
+    def configure(self, sample_rate=None, keep_slowest=None):
+        with self._lock:
+            if sample_rate is not None:
+                self.sample_rate = sample_rate
+            if keep_slowest is not None:
+                self.keep_slowest = keep_slowest
+                while len(self._heap) > keep_slowest:
+                    heapq.heappop(self._heap)
+
+    def trace(self, name, force=False, **attrs):
+        """
+        with tracer.trace('POST /recommend'): ... merekam request ini jika terpilih sampling
+        (atau force=True); jika tidak, span di dalamnya menjadi no-op.
+        """
+        self._started += 1
+        if not force and (self.sample_rate <= 0 or self._rng.random() >= self.sample_rate):
+            return NOOP_SPAN
+        self._sampled += 1
+        return _TraceScope(self, Trace(name, attrs))
+
+    def record(self, trace):
+        with self._lock:
+            item = (trace.duration, trace.id, trace)
+            if len(self._heap) < self.keep_slowest:
+                heapq.heappush(self._heap, item)
+            elif self._heap and item[0] > self._heap[0][0]:
+                heapq.heapreplace(self._heap, item)
+
+    def slowest(self):
+        """Trace tersimpan, dari yang paling lambat."""
+        with self._lock:
+            items = sorted(self._heap, key=lambda item: -item[0])
+        return [trace for _, _, trace in items]
+
+    def get(self, trace_id):
+        for trace in self.slowest():
+            if trace.id == trace_id:
+                return trace
+        return None
+
+    def clear(self):
+        with self._lock:
+            self._heap = []
+
+    def stats(self):
+        return {
+            'sample_rate': self.sample_rate,
+            'keep_slowest': self.keep_slowest,
+            'requests_seen': self._started,
+            'requests_sampled': self._sampled,
+            'traces_kept': len(self._heap),
+        }
+
+    def chrome_trace(self, traces=None):
+        """Dict JSON Chrome trace ({'traceEvents': [...]}) untuk trace tersimpan atau yang diberikan."""
+        traces = self.slowest() if traces is None else traces
+        events = []
+        for trace in traces:
+            events.extend(trace.chrome_events())
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome(self, path, traces=None):
+        """Tulis JSON Chrome trace ke file, misal untuk dilampirkan ke laporan performa."""
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(traces), f)
+        return path
+
+
+# Tracer bersama untuk API; main.py mengatur sample_rate dari config
+tracer = Tracer()
+
+
+def current_trace():
+    """Trace aktif di context ini, atau None jika request tidak di-sampling."""
+    return _current_trace.get()
+
+
+def span(name, **attrs):
+    """with span('feature_extraction'): ... mencatat span jika ada trace aktif; selain itu no-op."""
+    trace = _current_trace.get()
+    if trace is None:
+        return NOOP_SPAN
+    return _Span(trace, name, attrs)
+
+
+def add_span(name, start, end, **attrs):
+    """Catat span yang waktunya sudah diukur sendiri (misal tunggu antrian) ke trace aktif."""
+    trace = _current_trace.get()
+    if trace is not None:
+        parent = _current_span.get()
+        trace.add_span(name, start, end, parent=parent and parent.name, attrs=attrs)
+
+
+class TracingMiddleware:
+    """
+    Middleware ASGI yang membuka satu trace per request HTTP (jika terpilih sampling).
+
+    Nama trace memakai method dan template path route; status respons disimpan di atribut.
+    Jika allow_force=True, request dengan header X-Trace: 1 selalu direkam; default mati
+    agar klien luar tidak bisa memaksa tracing (dan mengisi buffer trace) sesuka hati.
+    """
+
+    def __init__(self, app, tracer=tracer, exclude=('/metrics', '/debug/traces'), allow_force=False):
+        self.app = app
+        self.tracer = tracer
+        self.exclude = tuple(exclude)
+        self.allow_force = allow_force
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'].startswith(self.exclude):
+            await self.app(scope, receive, send)
+            return
+
+        force = self.allow_force and (b'x-trace', b'1') in scope.get('headers', ())
+        scope_cm = self.tracer.trace(f"{scope['method']} {scope['path']}", force=force)
+        if scope_cm is NOOP_SPAN:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                trace.attrs['status'] = message['status']
+            await send(message)
+
+        with scope_cm as trace:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = scope.get('route')
+                if getattr(route, 'path', None):
+                    trace.name = f"{scope['method']} {route.path}"
@@ -0,0 +1,128 @@
+# bid_snapper_backend/utils/worker_pool.py
+
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils.metrics import stage
+from utils.tracing import add_span
+
+
+class PoolFullError(Exception):
+    """Dilempar saat antrian pool sudah penuh dan request harus ditolak."""
+
+
+class BoundedWorkerPool:
+    """
+    Thread pool berukuran tetap dengan batas antrian untuk pekerjaan CPU-bound
+    (inferensi model, deteksi YOLO) yang dipanggil dari handler async.
+
+    Pekerjaan dijalankan di luar event loop. Jika jumlah pekerjaan yang berjalan
+    ditambah yang menunggu sudah mencapai max_workers + max_queue, pekerjaan baru
+    langsung ditolak dengan PoolFullError supaya handler bisa membalas 503.
+    Thread dipakai (bukan proses) karena model dibagi dalam satu proses dan
+    numpy/scikit-learn/torch melepas GIL di bagian yang berat.
+    """
+
+    def __init__(self, name, max_workers=4, max_queue=16):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-worker")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._submitted = 0
+        self._rejected = 0
+        self._completed = 0
+        self._failed = 0
+        self._cancelled = 0
+        self._started = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        # Waktu tunggu antrian juga dicatat sebagai tahap '<name>_queue_wait' di /metrics
+        self._wait_stage = stage(f"{name}_queue_wait")
+
+    @property
+    def capacity(self):
+        return self.max_workers + self.max_queue
+
+    def _try_reserve(self):
+        with self._lock:
+            if self._pending >= self.capacity:
+                self._rejected += 1
+                return False
+            self._pending += 1
+            self._submitted += 1
+            return True
+
+    def _run_task(self, enqueued_at, fn, args, kwargs):
+        wait = time.perf_counter() - enqueued_at
+        with self._lock:
+            self._running += 1
+            self._started += 1
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+        self._wait_stage.observe(wait)
+        add_span(f"{self.name}.queue_wait", enqueued_at, enqueued_at + wait)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        Jalankan fn(*args, **kwargs) di worker pool dan tunggu hasilnya.
+
+        Raises:
+            PoolFullError: Jika antrian sudah penuh.
+        """
+        if not self._try_reserve():
+            raise PoolFullError(f"Antrian {self.name} penuh ({self.capacity} pekerjaan)")
+
+        enqueued_at = time.perf_counter()
+        # Salin context agar trace request (utils.tracing) ikut ke thread worker
+        context = contextvars.copy_context()
+        try:
+            future = self._executor.submit(context.run, self._run_task, enqueued_at, fn, args, kwargs)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        # Slot dilepas saat pekerjaan itu sendiri selesai (atau batal sebelum mulai), bukan saat
+        # request yang menunggu dibatalkan, agar batas kapasitas tetap berlaku
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future):
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled():
+                self._cancelled += 1
+            elif future.exception() is not None:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+    def stats(self):
+        """Ringkasan status pool: ukuran, antrian, penolakan, dan waktu tunggu antrian."""
+        with self._lock:
+            started = self._started
+            return {
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'running': self._running,
+                'queued': self._pending - self._running,
+                'submitted': self._submitted,
+                'completed': self._completed,
+                'failed': self._failed,
+                'cancelled': self._cancelled,
+                'rejected': self._rejected,
+                'queue_wait_avg_ms': round(self._wait_total / started * 1000, 3) if started else 0.0,
+                'queue_wait_max_ms': round(self._wait_max * 1000, 3),
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)